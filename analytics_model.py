@@ -0,0 +1,215 @@
+# Incremental analytics model for the Tweet Sentiment Analyzer app
+# Holds every count the Tk tabs and charts display (sentiments, hashtags,
+# words, hashtags per sentiment, best/worst tweets) in one place.
+#
+# The model is filled once from the pre-aggregated summary collection
+# (load(), cost grows with the number of keyword/hour buckets) and then kept
+# current by ingest(), which only touches the new tweets. Every view reads
+# from the model instead of querying or re-tokenizing the corpus itself.
+
+# Import required libraries
+import threading
+from collections import Counter
+from text_preprocessing import extract_words
+
+# Sentiments shown by the app, in display order
+SENTIMENTS = ("positive", "neutral", "negative")
+
+
+class AnalyticsModel:
+    """
+    Counters behind the app's statistics, analytics tab and graphs.
+
+    Example:
+        model = AnalyticsModel()
+        model.ensure_loaded()        # Counts for what is already stored (read once)
+        model.ingest(new_tweets)     # O(len(new_tweets))
+        model.top_words(15)
+    """
+
+    def __init__(self, examples_per_sentiment=5):
+        """
+        Args:
+            examples_per_sentiment (int): Best/worst tweets kept for the analytics tab (0: none, and
+                load() reads nothing but the summary)
+        """
+        self.examples_per_sentiment = examples_per_sentiment
+        self._lock = threading.Lock()  # Guards the counters for readers
+        # Serializes load(), ingest() and reset() and guards `loaded`, so a load never
+        # overlaps an ingest (counting tweets twice, or dropping them when it resets)
+        self._load_lock = threading.RLock()
+        self.loaded = False  # Whether the counts include what was stored before this process
+        self.reset()
+
+    def reset(self, loaded=False):
+        """
+        Forget all counts.
+
+        Args:
+            loaded (bool): The database was emptied too, so the empty counts are
+                current and ensure_loaded() has nothing to read
+        """
+        with self._load_lock, self._lock:
+            self.loaded = loaded
+            self.sentiments = Counter()
+            self.hashtags = Counter()
+            self.words = Counter()
+            self.hashtags_by_sentiment = {sentiment: Counter() for sentiment in SENTIMENTS}
+            self.examples = {sentiment: [] for sentiment in SENTIMENTS}
+            # What each ingested tweet contributed, so a re-ingested tweet replaces it
+            self._contributions = {}
+            # Bumped on every change (reset included), so views can skip redundant redraws
+            self.version = getattr(self, "version", -1) + 1
+
+    def load(self, keyword=None):
+        """
+        Replace the counts with those of the stored tweets.
+
+        Reads the per-keyword/hour summary collection, not the tweets
+        themselves, plus a few example tweets per sentiment.
+
+        Args:
+            keyword (str): Only count this keyword (default: all)
+        """
+        with self._load_lock:
+            self._load(keyword)
+
+    def ensure_loaded(self, keyword=None):
+        """
+        load() unless the counts are already loaded; concurrent callers wait for one load.
+
+        Returns:
+            bool: True if this call loaded the counts
+        """
+        with self._load_lock:
+            if self.loaded:
+                return False
+            self._load(keyword)
+            return True
+
+    def _load(self, keyword):
+        # Caller holds _load_lock: ingest() waits until the counts are replaced
+        # Imported here so the model can be used without a database (ingest only)
+        from mongodb_handler import get_summary, stream_tweets
+        summary = get_summary(keyword=keyword)
+        examples = {sentiment: [] for sentiment in SENTIMENTS}
+        if self.examples_per_sentiment > 0:  # stream_tweets reads limit=0 as "no limit"
+            for sentiment in SENTIMENTS:
+                query = {"sentiment": sentiment}
+                if keyword is not None:
+                    query["keyword"] = keyword
+                examples[sentiment] = [
+                    tweet.get("clean_text", "")
+                    for tweet in stream_tweets(query, fields=["clean_text"], limit=self.examples_per_sentiment)
+                ]
+
+        self.reset(loaded=True)
+        with self._lock:
+            totals = summary["totals"]
+            self.sentiments = Counter({sentiment: totals[sentiment] for sentiment in SENTIMENTS})
+            self.sentiments["total"] = totals["total"]
+            self.hashtags = summary["hashtags"]
+            self.words = summary["words"]
+            for sentiment in SENTIMENTS:
+                self.hashtags_by_sentiment[sentiment] = summary["hashtags_by_sentiment"].get(sentiment, Counter())
+            self.examples = examples
+            self.version += 1
+
+    def ingest(self, tweets):
+        """
+        Add tweets to the counts.
+
+        A tweet ingested again (same tweet_key, e.g. re-scraped with a new
+        sentiment) replaces its earlier contribution instead of being counted
+        twice. Tweets already stored when load() ran are only known through
+        their counts, so re-ingesting one of those counts it again until the
+        next load(). Waits while a load() is running, so its tweets are added
+        to the loaded counts rather than wiped by them.
+
+        Args:
+            tweets (iterable): Tweet dicts with sentiment, hashtags and tokens (or clean_text)
+
+        Returns:
+            int: Number of tweets ingested
+        """
+        count = 0
+        with self._load_lock, self._lock:
+            for tweet in tweets:
+                sentiment = tweet.get("sentiment")
+                hashtags = tuple(tweet.get("hashtags") or ())
+                tokens = tweet.get("tokens")
+                if tokens is None:
+                    tokens = extract_words(tweet.get("clean_text"))
+                contribution = (sentiment, hashtags, tuple(tokens))
+
+                key = tweet.get("tweet_key")
+                if key is not None:
+                    previous = self._contributions.get(key)
+                    if previous == contribution:
+                        continue
+                    if previous is not None:
+                        self._apply(previous, -1)
+                    self._contributions[key] = contribution
+                self._apply(contribution, 1)
+
+                examples = self.examples.get(sentiment)
+                if examples is not None and len(examples) < self.examples_per_sentiment:
+                    examples.append(tweet.get("clean_text", ""))
+                count += 1
+            if count:
+                self.version += 1
+        return count
+
+    def _apply(self, contribution, sign):
+        sentiment, hashtags, tokens = contribution
+        self.sentiments["total"] += sign
+        self.sentiments[sentiment] += sign
+        for hashtag in hashtags:
+            self.hashtags[hashtag] += sign
+            if sentiment in self.hashtags_by_sentiment:
+                self.hashtags_by_sentiment[sentiment][hashtag] += sign
+        for word in tokens:
+            self.words[word] += sign
+
+    # ----- Read side, used by the tabs and charts -----
+
+    def sentiment_counts(self):
+        """
+        Returns:
+            dict: {"total": n, "positive": n, "neutral": n, "negative": n}
+        """
+        with self._lock:
+            counts = {"total": self.sentiments["total"]}
+            counts.update({sentiment: self.sentiments[sentiment] for sentiment in SENTIMENTS})
+            return counts
+
+    def top_hashtags(self, limit=10):
+        """(hashtag, count) pairs, most used first."""
+        with self._lock:
+            return [(h, c) for h, c in self.hashtags.most_common(limit) if c > 0]
+
+    def top_words(self, limit=15):
+        """(word, count) pairs, most frequent first."""
+        with self._lock:
+            return [(w, c) for w, c in self.words.most_common(limit) if c > 0]
+
+    def top_hashtags_by_sentiment(self, limit=5):
+        """{"positive": [(hashtag, count), ...], "neutral": [...], "negative": [...]}"""
+        with self._lock:
+            return {
+                sentiment: [(h, c) for h, c in counts.most_common(limit) if c > 0]
+                for sentiment, counts in self.hashtags_by_sentiment.items()
+            }
+
+    def hashtag_counts_by_sentiment(self, hashtags):
+        """{"positive": {hashtag: count}, ...} for the given hashtags."""
+        with self._lock:
+            return {
+                sentiment: {hashtag: counts[hashtag] for hashtag in hashtags}
+                for sentiment, counts in self.hashtags_by_sentiment.items()
+            }
+
+    def example_tweets(self, sentiment):
+        """Clean text of up to examples_per_sentiment tweets with this sentiment."""
+        with self._lock:
+            return list(self.examples.get(sentiment, []))
@@ -1,14 +1,22 @@
+import time
+import queue
 import threading
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
-from twitter_scraper import scrape_tweets
-from mongodb_handler import insert_or_update_tweet, clear_tweets, get_all_tweets
-from llama_sentiment import classify_sentiment
-from collections import Counter
-import re
-import matplotlib.pyplot as plt
+from twitter_scraper import scrape_tweets, get_driver_pool
+from mongodb_handler import insert_or_update_tweet, clear_tweets
+from analytics_model import AnalyticsModel
+from ui_tasks import TaskExecutor
+from tweet_list_view import TweetListView
+from sentiment_backends import classify_sentiment
+from charts import create_charts, update_charts
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
+
+# Live updates while scraping: stored tweets are drawn in batches once per frame
+FRAME_MS = 100                 # How often pending tweets are drawn
+MAX_TWEETS_PER_FRAME = 200     # Upper bound on tweets ingested per frame, so the UI stays responsive
+ANALYTICS_REFRESH_SECONDS = 1.0  # Analytics tab refresh interval during a scrape
+GRAPHS_REFRESH_SECONDS = 2.0     # Graph refresh interval during a scrape (only if the graphs tab is open)
 
 class TweetAnalyzerApp:
     def __init__(self, root):
@@ -16,6 +24,24 @@ class TweetAnalyzerApp:
         self.root.title("Tweet Sentiment Analyzer")
         self.root.geometry("900x700")
         
+        # Shared counts behind the stats bar, analytics tab and graphs
+        self.analytics = AnalyticsModel()
+        
+        # Slow work (scraping, database queries) runs here; results come back on the Tk thread
+        self.tasks = TaskExecutor(root, max_workers=3)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Tweets stored by the scraping pipeline, waiting to be drawn (filled from pipeline threads)
+        self.pending_tweets = queue.SimpleQueue()
+        self.scraping = False
+        self.graphs_shown = False
+        self.charts = None           # Built on first use by build_graphs()
+        self.chart_canvases = []
+        self.graphs_version = -1     # AnalyticsModel.version the charts were last drawn for
+        self.scrape_append = True    # Mode of the current/last scrape (the checkbox may change meanwhile)
+        self.last_analytics_refresh = 0.0
+        self.last_graphs_refresh = 0.0
+        
         # Keyword input frame
         input_frame = tk.Frame(root)
         input_frame.pack(pady=10)
@@ -41,6 +67,11 @@ class TweetAnalyzerApp:
         self.graph_button = tk.Button(btn_frame, text="Show Graphs", command=self.show_graphs)
         self.graph_button.pack(side=tk.LEFT, padx=5)
         
+        # Append mode keeps stored tweets and only scrapes newer ones; off wipes the database first
+        self.append_mode = tk.BooleanVar(value=True)
+        self.append_check = tk.Checkbutton(btn_frame, text="Append (only new tweets)", variable=self.append_mode)
+        self.append_check.pack(side=tk.LEFT, padx=5)
+        
         # Status area
         tk.Label(root, text="Status:").pack(anchor=tk.W, padx=10)
         self.status_text = scrolledtext.ScrolledText(root, height=3)
@@ -54,8 +85,9 @@ class TweetAnalyzerApp:
         self.tweets_tab = tk.Frame(self.notebook)
         self.notebook.add(self.tweets_tab, text="Tweets")
         
-        self.results_text = scrolledtext.ScrolledText(self.tweets_tab, height=20)
-        self.results_text.pack(fill=tk.BOTH, expand=True)
+        # Paged list: only a bounded window of rows is ever loaded
+        self.tweet_list = TweetListView(self.tweets_tab, self.tasks)
+        self.tweet_list.pack(fill=tk.BOTH, expand=True)
         
         # Tab 2: Analytics
         self.analytics_tab = tk.Frame(self.notebook)
@@ -83,6 +115,10 @@ class TweetAnalyzerApp:
         tk.Label(stats_frame, textvariable=self.positive_count, fg="green").pack(side=tk.LEFT, padx=10)
         tk.Label(stats_frame, textvariable=self.neutral_count, fg="blue").pack(side=tk.LEFT, padx=10)
         tk.Label(stats_frame, textvariable=self.negative_count, fg="red").pack(side=tk.LEFT, padx=10)
+        
+        # Start and log in a browser now, so the first scrape does not wait for it
+        self.tasks.submit(get_driver_pool().warm, 1,
+                          on_error=lambda e: self.log_status(f"Could not start browser in advance: {e}"))
     
     def create_analytics_frames(self):
         # Create a frame for the analytics tab with a grid layout
@@ -124,39 +160,94 @@ class TweetAnalyzerApp:
         analytics_container.grid_rowconfigure(1, weight=1)
         
     def log_status(self, message):
+        # Widgets belong to the Tk thread; calls from workers are forwarded to it
+        if threading.current_thread() is not threading.main_thread():
+            self.tasks.call_soon(self.log_status, message)
+            return
         self.status_text.insert(tk.END, f"{message}\n")
         self.status_text.see(tk.END)
+    
+    def on_close(self):
+        self.tasks.shutdown()
+        self.root.destroy()
         
-    def worker(self, keyword):
+    def worker(self, keyword, append):
+        # Runs on the task pool: no widget access here except through log_status
         self.log_status(f"Scraping tweets for keyword: '{keyword}'...")
         
-        try:
+        if append:
+            # Keep what is stored; counts start from it and new tweets are added on top
+            self.ensure_analytics_loaded()
+            self.log_status("Appending: only tweets newer than the last scrape of this keyword.")
+        else:
             # Clear existing tweets before scraping new ones
             clear_tweets()
+            self.analytics.reset(loaded=True)
             self.log_status("Cleared existing tweets from database.")
-            
-            # Scrape tweets with the keyword
-            tweets = scrape_tweets(keyword)
-            
-            if not tweets:
-                self.log_status("No tweets found. Try a different keyword.")
-                return
-                
-            self.log_status(f"Found {len(tweets)} tweets. Processing sentiment...")
-            
-            for tweet in tweets:
-                # The sentiment is already analyzed in the scraper
-                self.log_status(f"Tweet: '{tweet['clean_text'][:30]}...' - {tweet['sentiment']}")
-            
-            self.log_status("Scraping and analysis complete.")
+        
+        # Scrape tweets with the keyword; each newly stored tweet is queued for the live view.
+        # The returned list also holds re-upserted tweets, so the new ones are counted here
+        inserted = []
+        def on_tweet(tweet):
+            inserted.append(1)
+            self.pending_tweets.put(tweet)
+        tweets = scrape_tweets(keyword, on_tweet=on_tweet, incremental=append)
+        return tweets, len(inserted)
+    
+    def draw_pending_tweets(self):
+        # Runs on the Tk thread every FRAME_MS while scraping: one batched update per frame
+        batch = []
+        while len(batch) < MAX_TWEETS_PER_FRAME:
+            try:
+                batch.append(self.pending_tweets.get_nowait())
+            except queue.Empty:
+                break
+        
+        if batch:
+            self.analytics.ingest(batch)  # Only the new tweets are counted
+            self.tweet_list.refresh_tail()  # Newly stored rows, if the list is scrolled to the end
             self.update_stats()
-            self.update_analytics()
-            
-            # Switch to the analytics tab to show results
-            self.notebook.select(1)  # Index 1 is the analytics tab
             
-        except Exception as e:
-            self.log_status(f"Error during scraping: {str(e)}")
+            # Heavier views refresh at a lower rate
+            now = time.monotonic()
+            if now - self.last_analytics_refresh >= ANALYTICS_REFRESH_SECONDS:
+                self.last_analytics_refresh = now
+                self.update_analytics()
+            if (self.graphs_shown and self.notebook.index(self.notebook.select()) == 2
+                    and now - self.last_graphs_refresh >= GRAPHS_REFRESH_SECONDS):
+                self.last_graphs_refresh = now
+                self.render_graphs(select=False)
+        
+        if self.scraping or batch:
+            self.root.after(FRAME_MS, self.draw_pending_tweets)
+    
+    def scrape_finished(self, result):
+        # Back on the Tk thread; every new tweet has already been queued for the live view
+        self.scraping = False
+        self.start_button.config(state=tk.NORMAL)
+        tweets, inserted = result
+        
+        if not (inserted if self.scrape_append else tweets):
+            if self.scrape_append:
+                self.log_status("No new tweets since the last scrape.")
+            else:
+                self.log_status("No tweets found. Try a different keyword.")
+            return
+        
+        if self.scrape_append:
+            self.log_status(f"Found {inserted} new tweets.")
+        else:
+            self.log_status(f"Found {len(tweets)} tweets.")
+        self.log_status("Scraping and analysis complete.")
+        self.update_analytics()
+        
+        # Switch to the analytics tab to show results
+        self.notebook.select(1)  # Index 1 is the analytics tab
+    
+    def scrape_failed(self, error):
+        self.scraping = False
+        self.start_button.config(state=tk.NORMAL)
+        self.log_status(f"Error during scraping: {str(error)}")
     
     def start_thread(self):
         keyword = self.keyword_entry.get()
@@ -167,450 +258,183 @@ class TweetAnalyzerApp:
         # Disable the button while processing
         self.start_button.config(state=tk.DISABLED)
         
-        # Start the worker in a separate thread
-        thread = threading.Thread(target=self.worker, args=(keyword,), daemon=True)
-        thread.start()
+        # The list fills up live as tweets are stored: empty when replacing, current rows when appending
+        append = self.scrape_append = self.append_mode.get()
+        self.tasks.cancel("results")
+        if append:
+            self.tweet_list.reload()
+        else:
+            self.tweet_list.clear()
+        self.notebook.select(0)  # Index 0 is the tweets tab
+        self.scraping = True
+        self.root.after(FRAME_MS, self.draw_pending_tweets)
         
-        # Check if the thread is still running
-        def check_thread():
-            if thread.is_alive():
-                self.root.after(100, check_thread)
-            else:
-                self.start_button.config(state=tk.NORMAL)
-                
-        self.root.after(100, check_thread)
+        # Scrape on the task pool; the callbacks run on the Tk thread
+        self.tasks.submit(self.worker, keyword, append, on_done=self.scrape_finished,
+                          on_error=self.scrape_failed, key="scrape")
     
     def view_results(self):
-        tweets = get_all_tweets()
-        
-        self.results_text.delete(1.0, tk.END)
-        
-        if not tweets:
-            self.results_text.insert(tk.END, "No tweets found in the database.")
-            return
-            
-        for i, tweet in enumerate(tweets, 1):
-            sentiment = tweet.get('sentiment', 'unknown')
-            sentiment_color = {
-                'positive': 'green',
-                'neutral': 'blue',
-                'negative': 'red'
-            }.get(sentiment, 'black')
-            
-            self.results_text.insert(tk.END, f"{i}. [{sentiment.upper()}] {tweet['clean_text']}\n\n")
-            
-            # Need to get the line number positions to apply the tag
-            last_line_start = f"{i}.0"
-            last_line_end = f"{i}.{len(sentiment) + 2}" # +2 for [ ]
-            
-            # Create a tag for this sentiment if it doesn't exist
-            tag_name = f"sentiment_{sentiment}"
-            if tag_name not in self.results_text.tag_names():
-                self.results_text.tag_configure(tag_name, foreground=sentiment_color)
-                
-            # Apply the tag to the sentiment part
-            self.results_text.tag_add(tag_name, last_line_start, last_line_end)
-        
-        self.update_stats()
-        self.update_analytics()
+        # The list pages itself in from the database; counts may need a first load
+        self.tweet_list.reload()
+        self.tasks.submit(self.ensure_analytics_loaded, on_done=self.show_results,
+                          on_error=self.task_failed, key="results")
         
         # Switch to the tweets tab
         self.notebook.select(0)  # Index 0 is the tweets tab
     
+    def task_failed(self, error):
+        self.log_status(f"Error: {str(error)}")
+    
+    def show_results(self, _=None):
+        self.update_stats()
+        self.update_analytics()
+    
     def clear_database(self):
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all tweets from the database?"):
-            clear_tweets()
-            self.log_status("Database cleared.")
-            self.results_text.delete(1.0, tk.END)
-            
-            # Clear analytics as well
-            self.hashtags_text.delete(1.0, tk.END)
-            self.words_text.delete(1.0, tk.END)
-            self.best_text.delete(1.0, tk.END)
-            self.worst_text.delete(1.0, tk.END)
+            # Results or graphs still loading would show deleted tweets
+            self.tasks.cancel("results")
+            self.tasks.cancel("graphs")
+            self.tasks.submit(self.clear_all, on_done=self.database_cleared,
+                              on_error=self.task_failed, key="clear")
+    
+    def clear_all(self):
+        # Runs on the task pool
+        clear_tweets()
+        self.analytics.reset(loaded=True)
+    
+    def database_cleared(self, _):
+        self.log_status("Database cleared.")
+        self.tweet_list.clear()
+        
+        # Clear analytics as well
+        self.hashtags_text.delete(1.0, tk.END)
+        self.words_text.delete(1.0, tk.END)
+        self.best_text.delete(1.0, tk.END)
+        self.worst_text.delete(1.0, tk.END)
+        
+        # Empty the graphs in place (they show their "no data" state)
+        if self.charts is not None:
+            self.render_graphs(select=False)
             
-            # Clear any graphs
-            for widget in self.graphs_container.winfo_children():
-                widget.destroy()
-                
-            self.update_stats()
+        self.update_stats()
+    
+    def ensure_analytics_loaded(self):
+        # Counts for tweets stored before this session, read once from the summary collection
+        self.analytics.ensure_loaded()
     
     def update_stats(self):
-        tweets = get_all_tweets()
+        # All views read the shared analytics model; nothing is recounted here
+        stats = self.analytics.sentiment_counts()
         
-        positive = sum(1 for t in tweets if t.get('sentiment') == 'positive')
-        neutral = sum(1 for t in tweets if t.get('sentiment') == 'neutral')
-        negative = sum(1 for t in tweets if t.get('sentiment') == 'negative')
-        
-        self.positive_count.set(f"Positive: {positive}")
-        self.neutral_count.set(f"Neutral: {neutral}")
-        self.negative_count.set(f"Negative: {negative}")
+        self.positive_count.set(f"Positive: {stats['positive']}")
+        self.neutral_count.set(f"Neutral: {stats['neutral']}")
+        self.negative_count.set(f"Negative: {stats['negative']}")
     
     def update_analytics(self):
-        tweets = get_all_tweets()
-        
-        if not tweets:
+        if self.analytics.sentiment_counts()["total"] == 0:
             return
-            
+        
         # Process hashtags
-        self.analyze_hashtags(tweets)
+        self.analyze_hashtags(self.analytics.top_hashtags(10))
         
         # Process frequent words
-        self.analyze_frequent_words(tweets)
+        self.analyze_frequent_words(self.analytics.top_words(15))
         
-        # Process best/worst tweets
-        self.analyze_best_worst_tweets(tweets)
+        # Process best/worst tweets (only the first 5 of each are shown)
+        self.analyze_best_worst_tweets(
+            self.analytics.example_tweets("positive"),
+            self.analytics.example_tweets("negative")
+        )
     
-    def analyze_hashtags(self, tweets):
-        # Extract all hashtags from all tweets
-        all_hashtags = []
-        for tweet in tweets:
-            all_hashtags.extend(tweet.get('hashtags', []))
-        
-        # Count hashtags
-        hashtag_counts = Counter(all_hashtags)
-        
+    def analyze_hashtags(self, top_hashtags):
+        # top_hashtags: (hashtag, count) pairs, most used first
         # Display top hashtags
         self.hashtags_text.delete(1.0, tk.END)
         
-        if not hashtag_counts:
+        if not top_hashtags:
             self.hashtags_text.insert(tk.END, "No hashtags found")
             return
             
-        # Show top 10 hashtags with counts
+        # Show top hashtags with counts
         self.hashtags_text.insert(tk.END, "Top hashtags:\n\n")
-        for hashtag, count in hashtag_counts.most_common(10):
+        for hashtag, count in top_hashtags:
             self.hashtags_text.insert(tk.END, f"{hashtag}: {count}\n")
     
-    def analyze_frequent_words(self, tweets):
-        # Combine all cleaned tweet text
-        all_text = " ".join([tweet.get('clean_text', '') for tweet in tweets])
-        
-        # Convert to lowercase and split into words
-        words = re.findall(r'\b\w+\b', all_text.lower())
-        
-        # Filter out common words (stopwords)
-        stopwords = {"a", "an", "the", "and", "or", "but", "is", "are", "was", "were", 
-                     "be", "been", "being", "in", "on", "at", "to", "for", "with", 
-                     "by", "about", "against", "between", "into", "through", "during",
-                     "before", "after", "above", "below", "from", "up", "down", "of", 
-                     "off", "over", "under", "again", "further", "then", "once", "here",
-                     "there", "when", "where", "why", "how", "all", "any", "both", "each",
-                     "few", "more", "most", "other", "some", "such", "no", "nor", "not",
-                     "only", "own", "same", "so", "than", "too", "very", "s", "t", "can",
-                     "will", "just", "don", "should", "now", "i", "me", "my", "myself",
-                     "we", "our", "ours", "ourselves", "you", "your", "yours", "yourself",
-                     "yourselves", "he", "him", "his", "himself", "she", "her", "hers",
-                     "herself", "it", "its", "itself", "they", "them", "their", "theirs",
-                     "themselves", "what", "which", "who", "whom", "this", "that", "these",
-                     "those", "am", "is", "are", "was", "were", "be", "been", "being", "have",
-                     "has", "had", "having", "do", "does", "did", "doing", "would", "should",
-                     "could", "ought", "i'm", "you're", "he's", "she's", "it's", "we're",
-                     "they're", "i've", "you've", "we've", "they've", "i'd", "you'd", "he'd",
-                     "she'd", "we'd", "they'd", "i'll", "you'll", "he'll", "she'll", "we'll",
-                     "they'll", "isn't", "aren't", "wasn't", "weren't", "hasn't", "haven't",
-                     "hadn't", "doesn't", "don't", "didn't", "won't", "wouldn't", "shan't",
-                     "shouldn't", "can't", "cannot", "couldn't", "mustn't", "let's", "that's",
-                     "who's", "what's", "here's", "there's", "when's", "where's", "why's",
-                     "how's", "yeah", "u", "ur", "r", "n", "im", "m", "rt"}
-        
-        filtered_words = [word for word in words if word not in stopwords and len(word) > 1]
-        
-        # Count words
-        word_counts = Counter(filtered_words)
-        
+    def analyze_frequent_words(self, top_words):
+        # top_words: (word, count) pairs, most frequent first (stopwords already removed)
         # Display top words
         self.words_text.delete(1.0, tk.END)
         
-        if not word_counts:
+        if not top_words:
             self.words_text.insert(tk.END, "No significant words found")
             return
             
-        # Show top 15 words with counts
+        # Show top words with counts
         self.words_text.insert(tk.END, "Most frequent words:\n\n")
-        for word, count in word_counts.most_common(15):
+        for word, count in top_words:
             self.words_text.insert(tk.END, f"{word}: {count}\n")
     
-    def analyze_best_worst_tweets(self, tweets):
+    def analyze_best_worst_tweets(self, positive_tweets, negative_tweets):
+        # positive_tweets / negative_tweets: clean text of example tweets
         # Clear existing text
         self.best_text.delete(1.0, tk.END)
         self.worst_text.delete(1.0, tk.END)
         
-        # Find positive tweets
-        positive_tweets = [t for t in tweets if t.get('sentiment') == 'positive']
-        # Find negative tweets
-        negative_tweets = [t for t in tweets if t.get('sentiment') == 'negative']
-        
         # Display best tweets (up to 5)
         if positive_tweets:
-            for i, tweet in enumerate(positive_tweets[:5], 1):
-                self.best_text.insert(tk.END, f"{i}. {tweet['clean_text'][:100]}...\n\n")
+            for i, text in enumerate(positive_tweets[:5], 1):
+                self.best_text.insert(tk.END, f"{i}. {text[:100]}...\n\n")
         else:
             self.best_text.insert(tk.END, "No positive tweets found")
         
         # Display worst tweets (up to 5)
         if negative_tweets:
-            for i, tweet in enumerate(negative_tweets[:5], 1):
-                self.worst_text.insert(tk.END, f"{i}. {tweet['clean_text'][:100]}...\n\n")
+            for i, text in enumerate(negative_tweets[:5], 1):
+                self.worst_text.insert(tk.END, f"{i}. {text[:100]}...\n\n")
         else:
             self.worst_text.insert(tk.END, "No negative tweets found")
     
     def show_graphs(self):
-        tweets = get_all_tweets()
-        
-        if not tweets:
-            messagebox.showinfo("No Data", "There are no tweets to visualize. Please scrape some tweets first.")
-            return
-        
-        # Clear any existing graphs
-        for widget in self.graphs_container.winfo_children():
-            widget.destroy()
-        
-        # Create a notebook for different graph types
+        # The first call may read the summary collection; do it off the Tk thread
+        self.tasks.submit(self.ensure_analytics_loaded, on_done=self.render_graphs,
+                          on_error=self.task_failed, key="graphs")
+    
+    def build_graphs(self):
+        # Figures and canvases are created once; later refreshes only update their artists
         graph_notebook = ttk.Notebook(self.graphs_container)
         graph_notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Create tabs for different graph types
-        self.create_sentiment_distribution_chart(graph_notebook, tweets)
-        # Removed the hashtags chart because the counts are all 1
-        self.create_top_words_chart(graph_notebook, tweets)
-        self.create_sentiment_trend_chart(graph_notebook, tweets)
-        
-        # Switch to the graphs tab
-        self.notebook.select(2)  # Index 2 is the graphs tab
-    
-    def create_sentiment_distribution_chart(self, parent, tweets):
-        frame = ttk.Frame(parent)
-        parent.add(frame, text="Sentiment Distribution")
-        
-        # Count sentiments
-        positive = sum(1 for t in tweets if t.get('sentiment') == 'positive')
-        neutral = sum(1 for t in tweets if t.get('sentiment') == 'neutral')
-        negative = sum(1 for t in tweets if t.get('sentiment') == 'negative')
-        
-        # Create figure and axis
-        fig, ax = plt.subplots(figsize=(6, 4), tight_layout=True)
-        
-        # Create pie chart
-        labels = ['Positive', 'Neutral', 'Negative']
-        sizes = [positive, neutral, negative]
-        colors = ['green', 'blue', 'red']
-        explode = (0.1, 0, 0)  # explode the 1st slice (Positive)
-        
-        ax.pie(sizes, explode=explode, labels=labels, colors=colors, 
-               autopct='%1.1f%%', shadow=True, startangle=90)
-        ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        ax.set_title('Tweet Sentiment Distribution')
-        
-        # Embed the chart in the frame
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.charts = create_charts()
+        self.chart_canvases = []
+        for name, title in (("distribution", "Sentiment Distribution"), ("words", "Top Words"),
+                            ("hashtags_by_sentiment", "Hashtags by Sentiment")):
+            frame = ttk.Frame(graph_notebook)
+            graph_notebook.add(frame, text=title)
+            canvas = FigureCanvasTkAgg(self.charts[name].figure, master=frame)
+            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self.chart_canvases.append(canvas)
     
-    # The create_top_hashtags_chart method is still present in the code but no longer called
-    def create_top_hashtags_chart(self, parent, tweets):
-        # Extract all hashtags
-        all_hashtags = []
-        for tweet in tweets:
-            all_hashtags.extend(tweet.get('hashtags', []))
-        
-        # Count hashtags
-        hashtag_counts = Counter(all_hashtags)
-        
-        if not hashtag_counts:
-            # Skip creating this chart if no hashtags
-            return
-        
-        frame = ttk.Frame(parent)
-        parent.add(frame, text="Top Hashtags")
-        
-        # Get top 10 hashtags
-        top_hashtags = hashtag_counts.most_common(10)
-        
-        # Create figure and axis
-        fig, ax = plt.subplots(figsize=(6, 4), tight_layout=True)
+    def render_graphs(self, _=None, select=True):
+        stats = self.analytics.sentiment_counts()
         
-        # Create horizontal bar chart
-        hashtags = [h[0] for h in top_hashtags]
-        counts = [h[1] for h in top_hashtags]
-        
-        # Reverse lists to have highest value at the top
-        hashtags.reverse()
-        counts.reverse()
-        
-        ax.barh(hashtags, counts, color='skyblue')
-        ax.set_xlabel('Count')
-        ax.set_ylabel('Hashtag')
-        ax.set_title('Top Hashtags')
-        
-        # Add count labels to the bars
-        for i, v in enumerate(counts):
-            ax.text(v + 0.1, i, str(v), va='center')
-        
-        # Embed the chart in the frame
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
-    def create_top_words_chart(self, parent, tweets):
-        # Combine all cleaned tweet text
-        all_text = " ".join([tweet.get('clean_text', '') for tweet in tweets])
-        
-        # Convert to lowercase and split into words
-        words = re.findall(r'\b\w+\b', all_text.lower())
-        
-        # Filter out common words (stopwords)
-        stopwords = {"a", "an", "the", "and", "or", "but", "is", "are", "was", "were", 
-                     "be", "been", "being", "in", "on", "at", "to", "for", "with", 
-                     "by", "about", "against", "between", "into", "through", "during",
-                     "before", "after", "above", "below", "from", "up", "down", "of", 
-                     "off", "over", "under", "again", "further", "then", "once", "here",
-                     "there", "when", "where", "why", "how", "all", "any", "both", "each",
-                     "few", "more", "most", "other", "some", "such", "no", "nor", "not",
-                     "only", "own", "same", "so", "than", "too", "very", "s", "t", "can",
-                     "will", "just", "don", "should", "now", "i", "me", "my", "myself",
-                     "we", "our", "ours", "ourselves", "you", "your", "yours", "yourself",
-                     "yourselves", "he", "him", "his", "himself", "she", "her", "hers",
-                     "herself", "it", "its", "itself", "they", "them", "their", "theirs",
-                     "themselves", "what", "which", "who", "whom", "this", "that", "these",
-                     "those", "am", "is", "are", "was", "were", "be", "been", "being", "have",
-                     "has", "had", "having", "do", "does", "did", "doing", "would", "should",
-                     "could", "ought", "i'm", "you're", "he's", "she's", "it's", "we're",
-                     "they're", "i've", "you've", "we've", "they've", "i'd", "you'd", "he'd",
-                     "she'd", "we'd", "they'd", "i'll", "you'll", "he'll", "she'll", "we'll",
-                     "they'll", "isn't", "aren't", "wasn't", "weren't", "hasn't", "haven't",
-                     "hadn't", "doesn't", "don't", "didn't", "won't", "wouldn't", "shan't",
-                     "shouldn't", "can't", "cannot", "couldn't", "mustn't", "let's", "that's",
-                     "who's", "what's", "here's", "there's", "when's", "where's", "why's",
-                     "how's", "yeah", "u", "ur", "r", "n", "im", "m", "rt"}
-        
-        filtered_words = [word for word in words if word not in stopwords and len(word) > 1]
-        
-        # Count words
-        word_counts = Counter(filtered_words)
-        
-        if not word_counts:
-            # Skip creating this chart if no significant words
+        if stats["total"] == 0 and select:
+            messagebox.showinfo("No Data", "There are no tweets to visualize. Please scrape some tweets first.")
             return
         
-        frame = ttk.Frame(parent)
-        parent.add(frame, text="Top Words")
+        if self.charts is None:
+            self.build_graphs()
         
-        # Get top 15 words
-        top_words = word_counts.most_common(15)
+        # Redraw only if the counts changed since the last render
+        if self.analytics.version != self.graphs_version:
+            self.graphs_version = self.analytics.version
+            update_charts(self.charts, self.analytics)
+            for canvas in self.chart_canvases:
+                canvas.draw_idle()
+        self.graphs_shown = True
         
-        # Create figure and axis
-        fig, ax = plt.subplots(figsize=(6, 4), tight_layout=True)
-        
-        # Create horizontal bar chart
-        words = [w[0] for w in top_words]
-        counts = [w[1] for w in top_words]
-        
-        # Reverse lists to have highest value at the top
-        words.reverse()
-        counts.reverse()
-        
-        ax.barh(words, counts, color='lightgreen')
-        ax.set_xlabel('Count')
-        ax.set_ylabel('Word')
-        ax.set_title('Most Frequent Words')
-        
-        # Add count labels to the bars
-        for i, v in enumerate(counts):
-            ax.text(v + 0.1, i, str(v), va='center')
-        
-        # Embed the chart in the frame
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
-    def create_sentiment_trend_chart(self, parent, tweets):
-        # This chart will show hashtags grouped by sentiment
-        frame = ttk.Frame(parent)
-        parent.add(frame, text="Hashtags by Sentiment")
-        
-        # Group hashtags by sentiment
-        positive_hashtags = []
-        neutral_hashtags = []
-        negative_hashtags = []
-        
-        for tweet in tweets:
-            sentiment = tweet.get('sentiment', 'unknown')
-            hashtags = tweet.get('hashtags', [])
-            
-            if sentiment == 'positive':
-                positive_hashtags.extend(hashtags)
-            elif sentiment == 'neutral':
-                neutral_hashtags.extend(hashtags)
-            elif sentiment == 'negative':
-                negative_hashtags.extend(hashtags)
-        
-        # Count hashtags by sentiment
-        positive_counts = Counter(positive_hashtags)
-        neutral_counts = Counter(neutral_hashtags)
-        negative_counts = Counter(negative_hashtags)
-        
-        # Get top hashtags from each sentiment
-        top_positive = positive_counts.most_common(5)
-        top_neutral = neutral_counts.most_common(5)
-        top_negative = negative_counts.most_common(5)
-        
-        # Skip if no significant data
-        if not (top_positive or top_neutral or top_negative):
-            lbl = tk.Label(frame, text="No hashtag data available")
-            lbl.pack(pady=50)
-            return
-        
-        # Create figure and axis
-        fig, ax = plt.subplots(figsize=(6, 5), tight_layout=True)
-        
-        # Prepare data for grouped bar chart
-        # Get all unique hashtags from top 5 of each sentiment
-        all_hashtags = set()
-        for h, _ in top_positive + top_neutral + top_negative:
-            all_hashtags.add(h)
-        
-        # For better visualization, limit to top 10 overall
-        if len(all_hashtags) > 10:
-            # Count total occurrences of each hashtag
-            total_counts = Counter()
-            for h, c in top_positive + top_neutral + top_negative:
-                total_counts[h] += c
-            
-            # Get top 10 hashtags
-            all_hashtags = set([h for h, _ in total_counts.most_common(10)])
-        
-        all_hashtags = list(all_hashtags)  # Convert to list for indexing
-        
-        # Prepare data for each sentiment
-        x = np.arange(len(all_hashtags))  # X-axis positions
-        width = 0.25  # Width of bars
-        
-        # Get counts for each hashtag by sentiment
-        pos_values = [positive_counts.get(h, 0) for h in all_hashtags]
-        neu_values = [neutral_counts.get(h, 0) for h in all_hashtags]
-        neg_values = [negative_counts.get(h, 0) for h in all_hashtags]
-        
-        # Create grouped bar chart
-        ax.bar(x - width, pos_values, width, label='Positive', color='green')
-        ax.bar(x, neu_values, width, label='Neutral', color='blue')
-        ax.bar(x + width, neg_values, width, label='Negative', color='red')
-        
-        # Set chart labels and title
-        ax.set_xlabel('Hashtags')
-        ax.set_ylabel('Count')
-        ax.set_title('Top Hashtags by Sentiment')
-        ax.set_xticks(x)
-        ax.set_xticklabels(all_hashtags, rotation=45, ha='right')
-        ax.legend()
-        
-        # Add some spacing at the bottom for rotated labels
-        plt.subplots_adjust(bottom=0.25)
-        
-        # Embed the chart in the frame
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Switch to the graphs tab
+        if select:
+            self.notebook.select(2)  # Index 2 is the graphs tab
 
 if __name__ == "__main__":
     root = tk.Tk()
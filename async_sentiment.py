@@ -0,0 +1,272 @@
+# Asynchronous Groq client for Twitter Sentiment Analysis Project
+# Classifies many texts concurrently over one pooled keep-alive connection
+# instead of sending requests strictly one after another.
+#
+# Synchronous code (the scraper, the Tkinter app) should call
+# classify_sentiment_concurrent(). It hands the work to one long-lived client
+# running on a background event loop, so the pooled connections stay open and
+# are reused across calls and pages.
+
+# Import required libraries
+import os
+import atexit
+import asyncio
+import threading
+import aiohttp
+import llama_sentiment  # Prompts, parsing and cache bookkeeping are shared with the sync client
+from llama_sentiment import (
+    DEFAULT_BATCH_SIZE,
+    BatchJob,
+    batch_max_tokens,
+    build_batch_prompt,
+    build_headers,
+    build_payload,
+    build_single_prompt,
+    normalize_label,
+    parse_batch_response,
+)
+from rate_limiter import MAX_ATTEMPTS, estimate_tokens, get_rate_limiter
+from sentiment_cache import get_cache, make_cache_key
+
+# Maximum number of API requests allowed in flight at the same time
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("GROQ_MAX_IN_FLIGHT", "8"))
+
+
+class AsyncSentimentClient:
+    """
+    Concurrent sentiment classifier backed by a single aiohttp session.
+
+    Use it as an async context manager so the connection pool is closed cleanly:
+
+        async with AsyncSentimentClient(max_in_flight=8) as client:
+            labels = await client.classify_many(texts)
+    """
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=None, url=None):
+        """
+        Args:
+            max_in_flight (int): Upper bound on concurrent requests (and pooled connections)
+            timeout (float): Per-request timeout in seconds (default: llama_sentiment.REQUEST_TIMEOUT)
+            url (str): Chat-completions endpoint (default: llama_sentiment.GROQ_API_URL)
+        """
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.timeout = timeout if timeout is not None else llama_sentiment.REQUEST_TIMEOUT
+        self.url = url or llama_sentiment.GROQ_API_URL
+        self._session = None
+        self._semaphore = None
+        self.loop = None  # Event loop the session belongs to, for shared clients
+
+    async def open(self):
+        """Create the pooled HTTP session. Called automatically by 'async with'."""
+        if self._session is None:
+            # One connection per allowed in-flight request, kept alive between calls
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=build_headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self
+
+    async def close(self):
+        """Close the pooled HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _post_chat(self, prompt, max_tokens):
+        """
+        Send one chat-completion request and return the reply text.
+
+        Waits for a free slot first, so at most max_in_flight requests are active,
+        and goes through the same process-wide rate limiter as the sync client.
+        """
+        limiter = get_rate_limiter()
+        tokens = estimate_tokens(prompt, max_tokens)
+
+        for attempt in range(MAX_ATTEMPTS):
+            # Reserve rate-limit budget before taking a connection slot
+            wait = limiter.reserve(tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            async with self._semaphore:
+                try:
+                    async with self._session.post(self.url, json=build_payload(prompt, max_tokens)) as response:
+                        delay = limiter.on_response(response.status, response.headers.get("Retry-After"), attempt)
+                        if delay is None or attempt == MAX_ATTEMPTS - 1:
+                            response.raise_for_status()
+                            data = await response.json()
+                            return data["choices"][0]["message"]["content"]
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == MAX_ATTEMPTS - 1:
+                        raise
+                    delay = limiter.on_error(attempt)
+
+            # Back off outside the semaphore so other requests can use the slot
+            print(f"[!] Groq API request failed, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def classify(self, text):
+        """
+        Classify a single text (async counterpart of classify_sentiment).
+
+        Returns:
+            str: 'positive', 'negative', or 'neutral'
+        """
+        cache = get_cache()
+        cache_key = make_cache_key(text, llama_sentiment.MODEL_NAME, llama_sentiment.PROMPT_VERSION)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            sentiment = normalize_label(await self._post_chat(build_single_prompt(text), max_tokens=10))
+            cache.set(cache_key, sentiment)
+            return sentiment
+        except Exception as e:
+            print(f"[!] Groq API error: {e!r}")
+            return "neutral"
+
+    async def _classify_chunk(self, chunk_texts):
+        # Send one batch prompt; any failure simply leaves every item unlabelled
+        try:
+            response_text = await self._post_chat(
+                build_batch_prompt(chunk_texts),
+                max_tokens=batch_max_tokens(len(chunk_texts))
+            )
+            return parse_batch_response(response_text, len(chunk_texts))
+        except Exception as e:
+            print(f"[!] Groq API error (batch of {len(chunk_texts)}): {e!r}")
+            return {}
+
+    async def classify_many(self, texts, batch_size=DEFAULT_BATCH_SIZE, max_retries=2):
+        """
+        Classify many texts, sending the batch prompts concurrently.
+
+        Behaves like llama_sentiment.classify_sentiment_batch (cache lookup,
+        duplicate collapsing, retry of missing items only), except that all
+        chunks of a round are in flight at once, up to max_in_flight.
+
+        Args:
+            texts (list): The input texts to analyze for sentiment
+            batch_size (int): Maximum number of texts per API call
+            max_retries (int): How many extra rounds to spend on failed items
+
+        Returns:
+            list: One of 'positive', 'negative' or 'neutral' per input, in input order
+        """
+        batch_size = max(1, int(batch_size))
+        job = BatchJob(list(texts))
+        pending = list(range(len(job.unique_texts)))
+
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+
+            chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+            all_labels = await asyncio.gather(*(
+                self._classify_chunk([job.unique_texts[i] for i in chunk]) for chunk in chunks
+            ))
+
+            failed = []
+            for chunk, labels in zip(chunks, all_labels):
+                failed.extend(job.record(chunk, labels))
+
+            if failed and attempt < max_retries:
+                print(f"[!] Retrying {len(failed)} unclassified tweet(s)...")
+            pending = failed
+
+        return job.finish(pending)
+
+
+# Long-lived clients for synchronous callers: one background event loop owns
+# them, keyed by (max_in_flight, timeout)
+_loop = None
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _background_loop():
+    # Start the event loop thread on first use
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        threading.Thread(target=_loop.run_forever, name="async-sentiment", daemon=True).start()
+    return _loop
+
+
+def get_shared_client(max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=None):
+    """
+    Return the open client that classify_sentiment_concurrent uses, creating it once.
+
+    Its session lives on a background event loop; run coroutines on it with
+    asyncio.run_coroutine_threadsafe(..., client.loop).
+
+    Args:
+        max_in_flight (int): Upper bound on concurrent requests
+        timeout (float): Per-request timeout in seconds
+
+    Returns:
+        AsyncSentimentClient: Shared by every caller asking for the same settings
+    """
+    key = (max(1, int(max_in_flight)), timeout)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            loop = _background_loop()
+            client = AsyncSentimentClient(max_in_flight=key[0], timeout=timeout)
+            asyncio.run_coroutine_threadsafe(client.open(), loop).result()
+            client.loop = loop
+            _clients[key] = client
+    return client
+
+
+@atexit.register
+def close_shared_clients():
+    """Close the shared clients' sessions and stop the background loop."""
+    global _loop
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        loop, _loop = _loop, None
+    if loop is None:
+        return
+    for client in clients:
+        try:
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+        except Exception as e:
+            print(f"[!] Could not close sentiment client: {e!r}")
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def classify_sentiment_concurrent(texts, batch_size=DEFAULT_BATCH_SIZE,
+                                  max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=None):
+    """
+    Synchronous wrapper around AsyncSentimentClient.classify_many.
+
+    Drop-in replacement for classify_sentiment_batch for code that is not
+    async itself. Every call shares one client (see get_shared_client), so
+    keep-alive connections are reused from call to call, and max_in_flight
+    bounds the requests of all calling threads together. Blocks the calling
+    thread until the texts are classified.
+
+    Args:
+        texts (list): The input texts to analyze for sentiment
+        batch_size (int): Maximum number of texts per API call
+        max_in_flight (int): Upper bound on concurrent requests
+        timeout (float): Per-request timeout in seconds
+
+    Returns:
+        list: One of 'positive', 'negative' or 'neutral' per input, in input order
+    """
+    client = get_shared_client(max_in_flight=max_in_flight, timeout=timeout)
+    future = asyncio.run_coroutine_threadsafe(client.classify_many(texts, batch_size=batch_size), client.loop)
+    return future.result()
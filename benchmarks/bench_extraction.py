@@ -0,0 +1,99 @@
+# Benchmark: per-element WebDriver extraction vs one execute_script per page
+# Loads a fixture search page (mock_twitter_server.py) with all tweets already
+# rendered, then reads them with twitter_scraper.extract_tweet (several
+# chromedriver round trips per tweet) and with extract_page_tweets (a single
+# execute_script returning JSON). Needs Chrome and chromedriver, but no
+# network access or account.
+#
+# Before measuring, it checks parse_count on engagement labels seen in the
+# wild (that check alone needs no browser: --check-only).
+#
+# Usage:
+#   python benchmarks/bench_extraction.py --tweets 100
+#   python benchmarks/bench_extraction.py --check-only
+
+# Import required libraries
+import os
+import sys
+import time
+import argparse
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_twitter_server import MockTwitterServer
+
+# Engagement labels and the counts parse_count must read from them
+PARSE_COUNT_CASES = [
+    ("1,234 Likes. Like", 1234),
+    ("1.2K", 1200),
+    ("3M", 3000000),
+    ("12k Reposts. Repost", 12000),
+    ("10 Mentions", 10),
+    ("7 Mutes", 7),
+    ("2 Kommentare", 2),
+    ("", 0),
+    (None, None),
+]
+
+
+def check_parse_count():
+    """Exit with an error listing every label parse_count gets wrong."""
+    from twitter_scraper import parse_count
+
+    wrong = [(label, expected, parse_count(label)) for label, expected in PARSE_COUNT_CASES
+             if parse_count(label) != expected]
+    for label, expected, got in wrong:
+        print(f"parse_count({label!r}) = {got}, expected {expected}")
+    if wrong:
+        sys.exit(1)
+    print(f"parse_count: {len(PARSE_COUNT_CASES)} labels OK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tweet extraction modes")
+    parser.add_argument("--tweets", type=int, default=100, help="Tweets rendered on the page")
+    parser.add_argument("--check-only", action="store_true", help="Only check parse_count, no browser")
+    args = parser.parse_args()
+
+    if args.check_only:
+        check_parse_count()
+        return
+
+    # Everything rendered at once, so only extraction is measured
+    server = MockTwitterServer(tweets_per_keyword=args.tweets, batch=args.tweets,
+                               initial_delay=0, scroll_delay=0).start()
+    # Read by twitter_scraper at import time
+    os.environ["TWITTER_BASE_URL"] = server.url
+    check_parse_count()
+
+    from selenium.webdriver.common.by import By
+    from twitter_scraper import create_driver, wait_for_tweets, extract_tweet, extract_page_tweets, TWEET_SELECTOR
+
+    driver = create_driver(headless=True)
+    try:
+        def open_page():
+            driver.get(f"{server.url}/search?q=bench&f=live")
+            wait_for_tweets(driver)
+
+        open_page()
+        start = time.monotonic()
+        elements = [extract_tweet(element, "bench") for element in driver.find_elements(By.CSS_SELECTOR, TWEET_SELECTOR)]
+        element_seconds = time.monotonic() - start
+
+        open_page()
+        start = time.monotonic()
+        scripted = extract_page_tweets(driver, "bench")
+        script_seconds = time.monotonic() - start
+
+        print(f"{args.tweets} tweets on the page")
+        print(f"elements      {element_seconds:7.3f}s  {len([t for t in elements if t])} tweets")
+        print(f"one script    {script_seconds:7.3f}s  {len(scripted)} tweets  "
+              f"({element_seconds / max(script_seconds, 1e-6):.0f}x faster)")
+    finally:
+        driver.quit()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Benchmark: throughput of the offline sentiment engine
+#
+# Usage:
+#   python benchmarks/bench_local_sentiment.py --tweets 100000
+
+# Import required libraries
+import os
+import sys
+import time
+import random
+import argparse
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_sentiment import LocalSentimentEngine
+
+# Building blocks for synthetic but tweet-like text
+OPENERS = ["just tried the new", "can't believe the", "honestly the", "day 3 with the", "anyone else think the"]
+SUBJECTS = ["iphone", "update", "airline", "game", "election debate", "coffee place", "bitcoin price"]
+VERDICTS = ["is amazing", "is not good at all", "really sucks", "was fine i guess", "is so slow today",
+            "made my day :)", "is the worst thing ever", "works great", "is whatever", "isn't bad"]
+
+
+def make_tweets(count, seed=42):
+    rng = random.Random(seed)
+    return [f"{rng.choice(OPENERS)} {rng.choice(SUBJECTS)} {rng.choice(VERDICTS)} {i}" for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local sentiment engine")
+    parser.add_argument("--tweets", type=int, default=100000)
+    parser.add_argument("--chunk", type=int, default=5000, help="Tweets per predict() call")
+    args = parser.parse_args()
+
+    tweets = make_tweets(args.tweets)
+
+    start = time.perf_counter()
+    engine = LocalSentimentEngine()
+    print(f"Engine construction: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    counts = {"positive": 0, "neutral": 0, "negative": 0}
+    for offset in range(0, len(tweets), args.chunk):
+        labels, _ = engine.predict(tweets[offset:offset + args.chunk])
+        for label in labels:
+            counts[label] += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {len(tweets)} tweets in {elapsed:.2f}s ({len(tweets) / elapsed:,.0f} tweets/s)")
+    print(f"Label distribution: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Benchmark: sequential stages vs the streaming pipeline
+# Each stage is simulated with a fixed per-item / per-batch delay, so the
+# numbers show scheduling behaviour, not Selenium or API speed.
+#
+# Usage:
+#   python benchmarks/bench_pipeline.py --tweets 100 --extract-ms 20 --classify-ms 200 --write-ms 5
+
+# Import required libraries
+import os
+import sys
+import time
+import argparse
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrape_pipeline import TweetPipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extract -> classify -> store pipeline")
+    parser.add_argument("--tweets", type=int, default=100)
+    parser.add_argument("--extract-ms", type=float, default=20, help="Per-tweet extraction time")
+    parser.add_argument("--classify-ms", type=float, default=200, help="Per-batch classification time")
+    parser.add_argument("--write-ms", type=float, default=5, help="Per-tweet write time")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    def source():
+        for i in range(args.tweets):
+            time.sleep(args.extract_ms / 1000)
+            yield {"clean_text": f"tweet {i}"}
+
+    def classify(texts):
+        time.sleep(args.classify_ms / 1000)
+        return ["neutral"] * len(texts)
+
+    def write(tweets):
+        time.sleep(args.write_ms / 1000 * len(tweets))
+
+    # Sequential baseline: extract all, then classify all in batches, then write all
+    start = time.perf_counter()
+    tweets = list(source())
+    for offset in range(0, len(tweets), args.batch_size):
+        classify([t["clean_text"] for t in tweets[offset:offset + args.batch_size]])
+    write(tweets)
+    sequential = time.perf_counter() - start
+
+    pipeline = TweetPipeline(classify_batch=classify, write_batch=write, classifier_workers=args.workers,
+                             classify_batch_size=args.batch_size, max_batch_wait=0.2)
+    stored = pipeline.run(source())
+    assert len(stored) == args.tweets
+
+    slowest = max(args.tweets * args.extract_ms,
+                  args.tweets / args.batch_size * args.classify_ms / args.workers,
+                  args.tweets * args.write_ms) / 1000
+    print(f"sequential stages: {sequential:6.2f}s")
+    print(f"pipeline:          {pipeline.wall_seconds:6.2f}s  (slowest stage alone ~{slowest:.2f}s)")
+    for stage in ("extract", "classify", "write"):
+        print(f"  {stage:<9} {pipeline.stats()[stage]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Benchmark: tweet preprocessing, inline vs process pool
+#
+# Usage:
+#   python benchmarks/bench_preprocessing.py --tweets 1000000 --workers 8
+
+# Import required libraries
+import os
+import sys
+import time
+import random
+import argparse
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_preprocessing import preprocess_batch
+
+# Building blocks for synthetic raw tweets
+SAMPLES = [
+    "Loving the new #iPhone 😍 @apple https://t.co/abc123",
+    "RT @news: Markets are down again today #stocks #bitcoin https://t.co/xyz",
+    "C'est une belle journée pour les vacances ☀️ #été",
+    "Das ist nicht gut, ich warte seit zwei Stunden @DB_Bahn",
+    "Привет всем! Отличная погода сегодня",
+    "this update is the worst thing ever lol 😂😂 @support fix it",
+]
+
+
+def make_tweets(count, seed=7):
+    rng = random.Random(seed)
+    return [f"{rng.choice(SAMPLES)} {i}" for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tweet preprocessing stage")
+    parser.add_argument("--tweets", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    tweets = make_tweets(args.tweets)
+    for name, workers in (("inline", 1), (f"process pool x{args.workers}", args.workers)):
+        start = time.perf_counter()
+        results = preprocess_batch(tweets, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        assert len(results) == len(tweets)
+        print(f"{name:<20} {elapsed:7.2f}s  {len(tweets) / elapsed:10,.0f} tweets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Benchmark: concurrent classification against a throttling provider
+# The mock server allows only --max-rps requests per rolling second and
+# randomly fails a share of requests with 503. Without client-side limiting
+# most requests bounce off with 429; with the shared RateLimiter throughput
+# holds at the ceiling and every tweet still gets a real label.
+#
+# Usage:
+#   python benchmarks/bench_rate_limiter.py --tweets 100 --max-rps 10
+
+# Import required libraries
+import os
+import sys
+import time
+import argparse
+
+# Memory-only cache, so earlier runs never turn later runs into cache hits on disk
+os.environ["SENTIMENT_CACHE_PATH"] = ""
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llama_sentiment
+import rate_limiter
+from async_sentiment import classify_sentiment_concurrent
+from mock_groq_server import MockGroqServer, fake_label
+
+
+def run(name, server, limiter, tweets, in_flight):
+    """Classify tweets through `limiter` and report throughput and failures."""
+    rate_limiter._shared_limiter = limiter
+    throttled_before = server.throttled_count
+    start = time.perf_counter()
+    labels = classify_sentiment_concurrent(tweets, batch_size=1, max_in_flight=in_flight)
+    elapsed = time.perf_counter() - start
+
+    wrong = sum(1 for tweet, label in zip(tweets, labels) if label != fake_label(tweet))
+    stats = limiter.stats()
+    print(f"{name:<22} {elapsed:7.2f}s  {len(tweets) / elapsed:6.1f} tweets/s  "
+          f"{server.throttled_count - throttled_before:4d} x 429  {wrong:3d} wrong labels  "
+          f"throttled {stats['throttled_seconds']:.1f}s  retries {stats['retries']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rate limiter against a throttling mock API")
+    parser.add_argument("--tweets", type=int, default=100)
+    parser.add_argument("--max-rps", type=float, default=10.0, help="Provider ceiling (requests/s)")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of random 503 responses")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--in-flight", type=int, default=16)
+    args = parser.parse_args()
+
+    server = MockGroqServer(latency=args.latency, max_rps=args.max_rps, error_rate=args.error_rate).start()
+    llama_sentiment.GROQ_API_URL = server.url
+    print(f"Mock server: {args.max_rps} req/s ceiling, {args.error_rate:.0%} random 503s\n")
+
+    words = ["good", "bad", "meh"]
+    try:
+        # Effectively unlimited client side: only Retry-After and backoff keep it going
+        run("no client-side limit", server,
+            rate_limiter.RateLimiter(requests_per_minute=1e9, tokens_per_minute=1e12),
+            [f"unlimited tweet {i} is {words[i % 3]}" for i in range(args.tweets)], args.in_flight)
+        time.sleep(1.0)  # Let the server's rolling window drain
+        # Token bucket set to the provider ceiling with one second of burst
+        run("token bucket at limit", server,
+            rate_limiter.RateLimiter(requests_per_minute=args.max_rps * 60, tokens_per_minute=1e12,
+                                     burst_seconds=1.0),
+            [f"limited tweet {i} is {words[i % 3]}" for i in range(args.tweets)], args.in_flight)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Benchmark: multi-keyword scraping with 1 vs N browser workers
+# Scrapes a local fixture of the live search page (mock_twitter_server.py)
+# with real headless Chrome, a stand-in classifier and in-memory storage, so
+# the numbers show browser and scheduling behaviour only. Needs Chrome and
+# chromedriver, but no network access, account or database.
+#
+# Usage:
+#   python benchmarks/bench_scheduler.py --keywords 6 --workers 3 --tweets 20 --searches-per-minute 120
+
+# Import required libraries
+import os
+import sys
+import time
+import argparse
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_twitter_server import MockTwitterServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-keyword scrape scheduler")
+    parser.add_argument("--keywords", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--tweets", type=int, default=20, help="Tweets per keyword per scrape")
+    parser.add_argument("--searches-per-minute", type=float, default=120)
+    parser.add_argument("--initial-delay", type=float, default=1.0, help="Fixture: seconds before tweets appear")
+    parser.add_argument("--scroll-delay", type=float, default=0.5, help="Fixture: seconds per scroll load")
+    args = parser.parse_args()
+
+    server = MockTwitterServer(batch=10, initial_delay=args.initial_delay, scroll_delay=args.scroll_delay).start()
+    # Read by twitter_scraper at import time
+    os.environ["TWITTER_BASE_URL"] = server.url
+
+    from driver_pool import DriverPool
+    from scrape_pipeline import TweetPipeline
+    from scrape_scheduler import ScrapeScheduler, KeywordJob
+    from twitter_scraper import start_session
+
+    keywords = [f"topic{i}" for i in range(args.keywords)]
+    print(f"Fixture: {server.url}, {len(keywords)} keywords, {args.tweets} tweets each, "
+          f"{args.searches_per_minute:.0f} searches/minute")
+
+    for workers in sorted({1, args.workers}):
+        # No cookie file: the fixture needs no login
+        with DriverPool(lambda: start_session(cookie_path="", headless=True), size=workers) as pool:
+            pool.warm()  # Browser start-up is not what is being compared
+            pipeline = TweetPipeline(classify_batch=lambda texts: ["neutral"] * len(texts),
+                                     write_batch=lambda tweets: {"inserted": len(tweets)})
+            jobs = [KeywordJob(keyword, priority=i % 3, max_tweets=args.tweets) for i, keyword in enumerate(keywords)]
+            scheduler = ScrapeScheduler(jobs, workers=workers, searches_per_minute=args.searches_per_minute,
+                                        pool=pool, pipeline=pipeline, incremental=False)
+
+            searches_before = len(server.searches)
+            start = time.monotonic()
+            stats = scheduler.run(rounds=1)
+            elapsed = time.monotonic() - start
+
+            loads = [t for t, _ in server.searches[searches_before:]]
+            gaps = [b - a for a, b in zip(loads, loads[1:])]
+            stored = sum(s["stored"] for s in stats["keywords"].values())
+            print(f"\n{workers} worker(s): {elapsed:6.2f}s, {stored} tweets stored, "
+                  f"min gap between searches {min(gaps) if gaps else 0:.2f}s")
+            for keyword, s in stats["keywords"].items():
+                print(f"  {keyword:<8} priority {s['priority']}  {s['extracted']:3d} tweets  "
+                      f"scrape {s['avg_scrape_seconds']:6.2f}s  first tweet {s['avg_first_tweet_seconds']:5.2f}s  "
+                      f"waited {s['avg_lateness_seconds']:5.2f}s")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
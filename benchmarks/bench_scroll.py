@@ -0,0 +1,81 @@
+# Benchmark: fixed sleeps vs readiness-based waits when scrolling the search page
+# Scrapes the local fixture (mock_twitter_server.py), whose tweets appear after
+# configurable delays, once with the old strategy (sleep 5s after loading, then
+# 5 scrolls with a 3s sleep each) and once with twitter_scraper.iter_tweets
+# (explicit wait for the first tweets, MutationObserver wait per scroll, stop
+# at max_tweets or when scrolling brings nothing new). Needs Chrome and
+# chromedriver, but no network access or account.
+#
+# Usage:
+#   python benchmarks/bench_scroll.py --max-tweets 40 --initial-delay 1.5 --scroll-delay 0.8
+
+# Import required libraries
+import os
+import sys
+import time
+import argparse
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_twitter_server import MockTwitterServer
+
+
+def fixed_sleep_scrape(driver, keyword, max_tweets, base_url):
+    """The previous strategy: fixed sleeps and exactly 5 scrolls, whatever the page does."""
+    from selenium.webdriver.common.by import By
+    from twitter_scraper import extract_tweet
+
+    driver.get(f"{base_url}/search?q={keyword}&src=typed_query&f=live")
+    time.sleep(5)
+    seen = set()
+    for scroll_count in range(6):
+        for element in driver.find_elements(By.XPATH, '//article[@data-testid="tweet"]'):
+            tweet = extract_tweet(element, keyword)
+            if tweet is not None:
+                seen.add(tweet["tweet_id"])
+                if len(seen) >= max_tweets:
+                    return len(seen)
+        if scroll_count == 5:
+            break
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(3)
+    return len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fixed sleeps vs event-driven waits while scrolling")
+    parser.add_argument("--max-tweets", type=int, default=40)
+    parser.add_argument("--timeline", type=int, default=100, help="Fixture: tweets available per keyword")
+    parser.add_argument("--batch", type=int, default=10, help="Fixture: tweets rendered per load")
+    parser.add_argument("--initial-delay", type=float, default=1.5, help="Fixture: seconds before tweets appear")
+    parser.add_argument("--scroll-delay", type=float, default=0.8, help="Fixture: seconds per scroll load")
+    args = parser.parse_args()
+
+    server = MockTwitterServer(tweets_per_keyword=args.timeline, batch=args.batch,
+                               initial_delay=args.initial_delay, scroll_delay=args.scroll_delay).start()
+    # Read by twitter_scraper at import time
+    os.environ["TWITTER_BASE_URL"] = server.url
+
+    from twitter_scraper import create_driver, iter_tweets
+
+    print(f"Fixture: {args.timeline} tweets per keyword, {args.batch} per load, "
+          f"first after {args.initial_delay}s, then {args.scroll_delay}s per scroll")
+    driver = create_driver(headless=True)
+    try:
+        for i, (name, scrape) in enumerate((
+            ("fixed sleeps", lambda keyword: fixed_sleep_scrape(driver, keyword, args.max_tweets, server.url)),
+            ("event-driven", lambda keyword: len(list(iter_tweets(driver, keyword, args.max_tweets)))),
+        )):
+            start = time.monotonic()
+            collected = scrape(f"bench{i}")
+            elapsed = time.monotonic() - start
+            print(f"{name:<13} {elapsed:6.2f}s  {collected:3d}/{args.max_tweets} tweets  "
+                  f"{collected / elapsed:6.2f} tweets/s")
+    finally:
+        driver.quit()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
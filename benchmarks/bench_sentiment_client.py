@@ -0,0 +1,75 @@
+# Benchmark: sequential vs batched vs concurrent sentiment classification
+# Runs every client against the local mock Groq server and reports wall time,
+# number of HTTP requests and number of TCP connections opened.
+#
+# Usage:
+#   python benchmarks/bench_sentiment_client.py --tweets 200 --latency 0.1
+
+# Import required libraries
+import os
+import sys
+import time
+import argparse
+
+# Memory-only cache, so earlier runs never turn later runs into cache hits on disk
+os.environ["SENTIMENT_CACHE_PATH"] = ""
+
+# Make the project modules importable when run from the benchmarks directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llama_sentiment
+from async_sentiment import classify_sentiment_concurrent
+from mock_groq_server import MockGroqServer
+
+
+def make_tweets(count, run_name):
+    """Unique tweets per run so the sentiment cache never short-circuits a client."""
+    words = ["good", "bad", "meh"]
+    return [f"{run_name} tweet {i} is {words[i % 3]}" for i in range(count)]
+
+
+def run(name, server, func, tweets):
+    """Time one client and print its request/connection footprint."""
+    requests_before = server.request_count
+    connections_before = server.connection_count
+    start = time.perf_counter()
+    labels = func(tweets)
+    elapsed = time.perf_counter() - start
+    assert len(labels) == len(tweets)
+    print(f"{name:<32} {elapsed:8.2f}s  {len(tweets) / elapsed:8.1f} tweets/s  "
+          f"{server.request_count - requests_before:5d} requests  "
+          f"{server.connection_count - connections_before:4d} connections")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sentiment clients against a mock Groq API")
+    parser.add_argument("--tweets", type=int, default=200, help="Tweets per client")
+    parser.add_argument("--latency", type=float, default=0.1, help="Mock server latency per request (s)")
+    parser.add_argument("--in-flight", type=int, default=8, help="Concurrency for the async client")
+    parser.add_argument("--batch-size", type=int, default=20, help="Tweets per batch prompt")
+    args = parser.parse_args()
+
+    server = MockGroqServer(latency=args.latency).start()
+    llama_sentiment.GROQ_API_URL = server.url
+    print(f"Mock server at {server.url}, latency {args.latency}s, {args.tweets} tweets per client\n")
+
+    try:
+        run("sequential classify_sentiment", server,
+            lambda tweets: [llama_sentiment.classify_sentiment(t) for t in tweets],
+            make_tweets(args.tweets, "seq"))
+        run("classify_sentiment_batch", server,
+            lambda tweets: llama_sentiment.classify_sentiment_batch(tweets, batch_size=args.batch_size),
+            make_tweets(args.tweets, "batch"))
+        run("concurrent, 1 tweet per call", server,
+            lambda tweets: classify_sentiment_concurrent(tweets, batch_size=1, max_in_flight=args.in_flight),
+            make_tweets(args.tweets, "async1"))
+        run("concurrent + batched", server,
+            lambda tweets: classify_sentiment_concurrent(tweets, batch_size=args.batch_size,
+                                                         max_in_flight=args.in_flight),
+            make_tweets(args.tweets, "asyncbatch"))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
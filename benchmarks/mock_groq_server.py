@@ -0,0 +1,165 @@
+# Local mock of the Groq /chat/completions endpoint
+# Used by the benchmarks so the sentiment clients can be measured without
+# network access, API keys or rate-limit quota.
+#
+# Usage:
+#   python benchmarks/mock_groq_server.py --port 8765 --latency 0.1
+#   export GROQ_API_URL="http://127.0.0.1:8765/openai/v1/chat/completions"
+
+# Import required libraries
+import re
+import socket
+import json
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Lines like "3. some tweet text" in a batch prompt
+NUMBERED_LINE = re.compile(r"^\s*(\d+)\. (.*)$", re.MULTILINE)
+
+
+def fake_label(text):
+    """Deterministic stand-in for the model: keyword-based sentiment."""
+    text = text.lower()
+    if "good" in text or "love" in text or "great" in text:
+        return "positive"
+    if "bad" in text or "hate" in text or "awful" in text:
+        return "negative"
+    return "neutral"
+
+
+def fake_reply(prompt):
+    """Answer a single-tweet prompt with one word and a batch prompt with a JSON array."""
+    numbered = NUMBERED_LINE.findall(prompt)
+    if numbered:
+        return json.dumps([{"id": int(n), "sentiment": fake_label(t)} for n, t in numbered])
+    return fake_label(prompt.rsplit("Tweet:", 1)[-1])
+
+
+class MockGroqServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP/1.1 server that mimics Groq's chat-completions API.
+
+    Counts requests and distinct TCP connections so benchmarks can show
+    whether a client actually reuses keep-alive connections. It can also
+    enforce a requests-per-second ceiling (answering 429 with Retry-After)
+    and inject random 503 errors, like a busy provider.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.1, max_rps=None, error_rate=0.0):
+        """
+        Args:
+            port (int): Port to listen on (0 picks a free port)
+            latency (float): Seconds each request sleeps to mimic model inference
+            max_rps (float): Requests allowed per rolling second, or None for no limit
+            error_rate (float): Probability (0-1) of answering 503 instead
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.max_rps = max_rps
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.connection_count = 0
+        self.throttled_count = 0
+        self.error_count = 0
+        self._recent = deque()  # Arrival times of accepted requests in the last second
+        self._lock = threading.Lock()
+
+    def admit(self):
+        """
+        Decide how to answer the next request.
+
+        Returns:
+            tuple: (status, retry_after) where status is 200, 429 or 503
+        """
+        with self._lock:
+            self.request_count += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if self.max_rps is not None and len(self._recent) >= self.max_rps:
+                self.throttled_count += 1
+                return 429, 1.0 - (now - self._recent[0])
+            if random.random() < self.error_rate:
+                self.error_count += 1
+                return 503, None
+            self._recent.append(now)
+            return 200, None
+
+    @property
+    def url(self):
+        """Full chat-completions URL to put in GROQ_API_URL."""
+        return f"http://127.0.0.1:{self.server_address[1]}/openai/v1/chat/completions"
+
+    def start(self):
+        """Serve in a background daemon thread and return self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; don't let Nagle delay the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server._lock:
+            self.server.connection_count += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        status, retry_after = self.server.admit()
+        if status == 429:
+            self._send_json(429, {"error": {"message": "Rate limit reached"}},
+                            {"Retry-After": f"{retry_after:.2f}"})
+            return
+        if status == 503:
+            self._send_json(503, {"error": {"message": "Service unavailable"}})
+            return
+
+        time.sleep(self.server.latency)
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        self._send_json(200, {
+            "choices": [{"message": {"role": "assistant", "content": fake_reply(prompt)}}],
+            "usage": {"total_tokens": len(prompt.split()) + 10}
+        })
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Groq chat-completions server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--max-rps", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockGroqServer(port=args.port, latency=args.latency,
+                            max_rps=args.max_rps, error_rate=args.error_rate)
+    print(f"Mock Groq API listening on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,206 @@
+# Local fixture of the x.com live search page
+# Serves pages with the same structure the scraper reads (tweet articles with
+# a [lang] text div, a User-Name block and a permalink around <time>), so
+# scraping can be exercised and measured without network access or an account.
+#
+# Like the real page, tweets are rendered by JavaScript: the first batch shows
+# up after --initial-delay, and each scroll to the bottom loads the next batch
+# after --scroll-delay. With --new-per-minute, fresh tweets keep appearing at
+# the top of each keyword's timeline, as on a live search.
+#
+# Usage:
+#   python benchmarks/mock_twitter_server.py --port 8766 --initial-delay 1.5 --scroll-delay 0.8
+#   export TWITTER_BASE_URL="http://127.0.0.1:8766"
+
+# Import required libraries
+import html
+import json
+import time
+import zlib
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Status IDs start here, so they look like real snowflake IDs
+BASE_TWEET_ID = 1800000000000000000
+
+# Building blocks for deterministic fake tweets
+OPENINGS = ["Really love", "Not impressed by", "Just tried", "Thinking about", "Can't stand", "Great news about"]
+CLOSINGS = ["today", "so far", "this week", "honestly", "at all", "again"]
+HASHTAGS = ["#tech", "#news", "#review", "#fail", "#win", "#update"]
+USERS = ["alice", "bob", "carol", "dave", "erin", "frank", "grace"]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<main id="timeline" aria-label="Timeline: Search timeline"></main>
+<script>
+const TWEETS = {tweets};
+const BATCH = {batch};
+const INITIAL_DELAY = {initial_delay};
+const SCROLL_DELAY = {scroll_delay};
+let shown = 0;
+let loading = false;
+const timeline = document.getElementById("timeline");
+
+function render(tweet) {{
+  const article = document.createElement("article");
+  article.setAttribute("data-testid", "tweet");
+  article.innerHTML =
+    '<div data-testid="User-Name"><span>' + tweet.name + '</span><br><span>@' + tweet.user + '</span></div>' +
+    '<a href="/' + tweet.user + '/status/' + tweet.id + '"><time datetime="' + tweet.time + '">' + tweet.time + '</time></a>' +
+    '<div lang="en" data-testid="tweetText"></div>' +
+    '<div role="group">' +
+    '<button data-testid="reply"><span>' + tweet.replies + '</span></button>' +
+    '<button data-testid="retweet"><span>' + tweet.retweets + '</span></button>' +
+    '<button data-testid="like"><span>' + tweet.likes + '</span></button>' +
+    '</div>';
+  article.querySelector("[lang]").textContent = tweet.text;
+  article.style.minHeight = "160px";
+  timeline.appendChild(article);
+}}
+
+function loadMore(delay) {{
+  if (loading || shown >= TWEETS.length) return;
+  loading = true;
+  setTimeout(function () {{
+    TWEETS.slice(shown, shown + BATCH).forEach(render);
+    shown = Math.min(TWEETS.length, shown + BATCH);
+    loading = false;
+  }}, delay);
+}}
+
+window.addEventListener("scroll", function () {{
+  if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) loadMore(SCROLL_DELAY);
+}});
+loadMore(INITIAL_DELAY);
+</script>
+</body></html>
+"""
+
+
+def fake_tweets(keyword, count, started_at):
+    """
+    The `count` tweets of a keyword's timeline, newest first.
+
+    Tweet i (0 = oldest) always has the same ID, text and metrics, so the
+    timeline only ever grows at the top.
+    """
+    seed = zlib.crc32(keyword.encode("utf-8"))
+    tweets = []
+    for i in range(count - 1, -1, -1):
+        n = seed + i
+        user = USERS[n % len(USERS)]
+        text = (f"{OPENINGS[n % len(OPENINGS)]} {keyword} {CLOSINGS[(n // 7) % len(CLOSINGS)]} "
+                f"{HASHTAGS[(n // 3) % len(HASHTAGS)]} (post {i})")
+        tweets.append({
+            "id": str(BASE_TWEET_ID + (seed % 1000000) * 100000 + i),
+            "user": user,
+            "name": user.title(),
+            "text": text,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(started_at - 60 * (count - i))),
+            "replies": n % 13,
+            "retweets": n % 29,
+            "likes": n % 97
+        })
+    return tweets
+
+
+class MockTwitterServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server for the home page and live search of a fake x.com.
+
+    Records every search page load (keyword and time) so callers can check
+    politeness limits and how often each keyword was scraped.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port=0, tweets_per_keyword=100, batch=10, initial_delay=1.0, scroll_delay=0.5,
+                 new_per_minute=0.0):
+        """
+        Args:
+            port (int): Port to listen on (0 picks a free port)
+            tweets_per_keyword (int): Timeline length per keyword at start-up
+            batch (int): Tweets rendered per load (first load and each scroll)
+            initial_delay (float): Seconds before the first tweets appear
+            scroll_delay (float): Seconds before a scroll's tweets appear
+            new_per_minute (float): New tweets added to every timeline per minute
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.tweets_per_keyword = tweets_per_keyword
+        self.batch = batch
+        self.initial_delay = initial_delay
+        self.scroll_delay = scroll_delay
+        self.new_per_minute = new_per_minute
+        self.started_at = time.time()
+        self.searches = []  # (monotonic time, keyword) per search page load
+        self._lock = threading.Lock()
+
+    def timeline(self, keyword):
+        """Current tweets of a keyword, newest first."""
+        grown = int((time.time() - self.started_at) * self.new_per_minute / 60)
+        return fake_tweets(keyword, self.tweets_per_keyword + grown, self.started_at)
+
+    def record_search(self, keyword):
+        with self._lock:
+            self.searches.append((time.monotonic(), keyword))
+
+    @property
+    def url(self):
+        """Base URL to put in TWITTER_BASE_URL."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        """Serve in a background daemon thread and return self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/search":
+            keyword = parse_qs(url.query).get("q", [""])[0]
+            self.server.record_search(keyword)
+            page = PAGE_TEMPLATE.format(
+                title=html.escape(f"{keyword} - Search"),
+                tweets=json.dumps(self.server.timeline(keyword)).replace("</", "<\\/"),
+                batch=self.server.batch,
+                initial_delay=int(self.server.initial_delay * 1000),
+                scroll_delay=int(self.server.scroll_delay * 1000)
+            )
+        else:
+            page = "<!DOCTYPE html><html><head><title>Home</title></head><body>Home</body></html>"
+        data = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fixture of the x.com live search page")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--tweets", type=int, default=100, help="Tweets per keyword at start-up")
+    parser.add_argument("--batch", type=int, default=10, help="Tweets rendered per load")
+    parser.add_argument("--initial-delay", type=float, default=1.0)
+    parser.add_argument("--scroll-delay", type=float, default=0.5)
+    parser.add_argument("--new-per-minute", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockTwitterServer(port=args.port, tweets_per_keyword=args.tweets, batch=args.batch,
+                               initial_delay=args.initial_delay, scroll_delay=args.scroll_delay,
+                               new_per_minute=args.new_per_minute)
+    print(f"Mock x.com listening on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,220 @@
+# Reusable Matplotlib charts for Twitter Sentiment Analysis Project
+# Each chart owns one Figure and creates its artists (pie wedges, bars,
+# labels) once. update() changes those artists in place - wedge angles,
+# bar lengths, tick labels - instead of building a new figure, so a refresh
+# costs a redraw only and memory stays flat however often it happens.
+#
+# Figures are created with matplotlib.figure.Figure, not pyplot, so they
+# are not kept alive by pyplot's global figure registry. They work both
+# embedded in Tk (FigureCanvasTkAgg, then canvas.draw_idle() after update())
+# and headless (figure.savefig()).
+
+# Import required libraries
+import math
+import numpy as np
+from matplotlib.figure import Figure
+
+# Sentiments in chart order, with their display names and colors
+SENTIMENT_STYLES = (
+    ("positive", "Positive", "green"),
+    ("neutral", "Neutral", "blue"),
+    ("negative", "Negative", "red"),
+)
+
+
+def _no_data_text(ax, message):
+    # Centered message shown instead of the chart when there is nothing to plot
+    return ax.text(0.5, 0.5, message, transform=ax.transAxes, ha="center", va="center", visible=False)
+
+
+class SentimentPieChart:
+    """Pie chart of the positive / neutral / negative split."""
+
+    START_ANGLE = 90
+    EXPLODE = (0.1, 0, 0)      # Positive slice pulled out
+    LABEL_DISTANCE = 1.1
+    PCT_DISTANCE = 0.6
+
+    def __init__(self, figure=None):
+        self.figure = figure or Figure(figsize=(6, 4), tight_layout=True)
+        self.ax = self.figure.add_subplot()
+        labels = [name for _, name, _ in SENTIMENT_STYLES]
+        colors = [color for _, _, color in SENTIMENT_STYLES]
+        # Placeholder sizes; update() sets the real angles
+        self.wedges, self.labels, self.percentages = self.ax.pie(
+            [1, 1, 1], explode=self.EXPLODE, labels=labels, colors=colors,
+            autopct='%1.1f%%', shadow=True, startangle=self.START_ANGLE,
+            labeldistance=self.LABEL_DISTANCE, pctdistance=self.PCT_DISTANCE
+        )
+        self.ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+        self.ax.set_title('Tweet Sentiment Distribution')
+        self.empty = _no_data_text(self.ax, "No tweets yet")
+
+    def update(self, stats):
+        """
+        Args:
+            stats (dict): Counts per sentiment, e.g. AnalyticsModel.sentiment_counts()
+        """
+        sizes = [max(0, stats.get(sentiment, 0)) for sentiment, _, _ in SENTIMENT_STYLES]
+        total = sum(sizes)
+        self.empty.set_visible(total == 0)
+
+        theta1 = self.START_ANGLE
+        for wedge, label, percentage, size, explode in zip(self.wedges, self.labels, self.percentages,
+                                                           sizes, self.EXPLODE):
+            fraction = size / total if total else 0
+            theta2 = theta1 + 360 * fraction
+            middle = math.radians((theta1 + theta2) / 2)
+            dx, dy = math.cos(middle), math.sin(middle)
+            center = (explode * dx, explode * dy)
+
+            wedge.set_center(center)
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            label.set_position((center[0] + self.LABEL_DISTANCE * dx, center[1] + self.LABEL_DISTANCE * dy))
+            label.set_horizontalalignment('left' if dx > 0 else 'right')
+            percentage.set_position((center[0] + self.PCT_DISTANCE * dx, center[1] + self.PCT_DISTANCE * dy))
+            percentage.set_text(f"{fraction * 100:.1f}%")
+
+            visible = size > 0
+            for artist in (wedge, label, percentage):
+                artist.set_visible(visible)
+            theta1 = theta2
+
+
+class HorizontalBarChart:
+    """Top-N horizontal bar chart (most frequent at the top) with count labels."""
+
+    def __init__(self, title, ylabel, color, slots, figure=None, empty_message="No data yet"):
+        """
+        Args:
+            title (str): Axes title
+            ylabel (str): Label of the category axis
+            color (str): Bar color
+            slots (int): Maximum number of bars
+        """
+        self.figure = figure or Figure(figsize=(6, 4), tight_layout=True)
+        self.ax = self.figure.add_subplot()
+        self.slots = slots
+        self.bars = self.ax.barh(range(slots), [0] * slots, color=color)
+        self.values = [self.ax.text(0, i, "", va='center') for i in range(slots)]
+        self.ax.set_xlabel('Count')
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_title(title)
+        self.empty = _no_data_text(self.ax, empty_message)
+
+    def update(self, pairs):
+        """
+        Args:
+            pairs (list): (label, count) pairs, most frequent first
+        """
+        # Reverse to have the highest value at the top
+        pairs = list(pairs)[:self.slots][::-1]
+        count = len(pairs)
+        for i, (bar, value) in enumerate(zip(self.bars, self.values)):
+            visible = i < count
+            bar.set_visible(visible)
+            value.set_visible(visible)
+            if visible:
+                bar.set_width(pairs[i][1])
+                value.set_position((pairs[i][1] + 0.1, i))
+                value.set_text(str(pairs[i][1]))
+
+        self.ax.set_yticks(range(count))
+        self.ax.set_yticklabels([label for label, _ in pairs])
+        self.ax.set_ylim(-0.5, max(count, 1) - 0.5)
+        largest = max((c for _, c in pairs), default=0)
+        self.ax.set_xlim(0, largest * 1.15 + 1)  # Room for the count labels
+        self.empty.set_visible(count == 0)
+
+
+def select_hashtags(top_by_sentiment, limit=10):
+    """
+    Pick the hashtags for the hashtags-by-sentiment chart.
+
+    Takes the union of each sentiment's top hashtags and, if that is more
+    than `limit`, keeps the `limit` with the highest combined count.
+
+    Args:
+        top_by_sentiment (dict): {"positive": [(hashtag, count), ...], ...}
+
+    Returns:
+        list: Hashtags, highest combined count first
+    """
+    totals = {}
+    for pairs in top_by_sentiment.values():
+        for hashtag, count in pairs:
+            totals[hashtag] = totals.get(hashtag, 0) + count
+    ranked = sorted(totals, key=lambda hashtag: (-totals[hashtag], hashtag))
+    return ranked[:limit]
+
+
+class HashtagSentimentChart:
+    """Grouped bar chart: for each hashtag, one bar per sentiment."""
+
+    WIDTH = 0.25  # Width of bars
+
+    def __init__(self, slots=10, figure=None):
+        self.figure = figure or Figure(figsize=(6, 5), tight_layout=True)
+        self.ax = self.figure.add_subplot()
+        self.slots = slots
+        x = np.arange(slots)
+        self.containers = {}
+        for offset, (sentiment, name, color) in zip((-self.WIDTH, 0, self.WIDTH), SENTIMENT_STYLES):
+            self.containers[sentiment] = self.ax.bar(x + offset, [0] * slots, self.WIDTH, label=name, color=color)
+        self.ax.set_xlabel('Hashtags')
+        self.ax.set_ylabel('Count')
+        self.ax.set_title('Top Hashtags by Sentiment')
+        self.ax.legend()
+        self.empty = _no_data_text(self.ax, "No hashtag data available")
+
+    def update(self, hashtags, counts_by_sentiment):
+        """
+        Args:
+            hashtags (list): Hashtags to show, e.g. from select_hashtags()
+            counts_by_sentiment (dict): {"positive": {hashtag: count}, ...}
+        """
+        hashtags = list(hashtags)[:self.slots]
+        count = len(hashtags)
+        largest = 0
+        for sentiment, container in self.containers.items():
+            counts = counts_by_sentiment.get(sentiment, {})
+            for i, bar in enumerate(container.patches):
+                visible = i < count
+                bar.set_visible(visible)
+                height = counts.get(hashtags[i], 0) if visible else 0
+                bar.set_height(height)
+                largest = max(largest, height)
+
+        self.ax.set_xticks(range(count))
+        self.ax.set_xticklabels(hashtags, rotation=45, ha='right')
+        self.ax.set_xlim(-0.5, max(count, 1) - 0.5)
+        self.ax.set_ylim(0, largest * 1.1 + 1)
+        self.ax.get_legend().set_visible(count > 0)
+        self.empty.set_visible(count == 0)
+
+
+def update_charts(charts, analytics):
+    """
+    Refresh the standard chart set from an AnalyticsModel.
+
+    Args:
+        charts (dict): {"distribution": SentimentPieChart, "words": HorizontalBarChart,
+                        "hashtags_by_sentiment": HashtagSentimentChart}
+        analytics (AnalyticsModel): Source of the counts
+    """
+    charts["distribution"].update(analytics.sentiment_counts())
+    charts["words"].update(analytics.top_words(15))
+    hashtags = select_hashtags(analytics.top_hashtags_by_sentiment(5))
+    # Every sentiment's count for the chosen hashtags, not just its own top 5
+    charts["hashtags_by_sentiment"].update(hashtags, analytics.hashtag_counts_by_sentiment(hashtags))
+
+
+def create_charts():
+    """Create the standard chart set used by the app and the reports."""
+    return {
+        "distribution": SentimentPieChart(),
+        "words": HorizontalBarChart('Most Frequent Words', 'Word', 'lightgreen', slots=15,
+                                    empty_message="No significant words found"),
+        "hashtags_by_sentiment": HashtagSentimentChart(),
+    }
@@ -0,0 +1,275 @@
+# Browser session pool for Twitter Sentiment Analysis Project
+# Starting Chrome, opening x.com and applying the login cookies takes 10+
+# seconds. DriverPool pays that once per session instead of once per scrape:
+# finished scrapes hand their WebDriver back, and the next scrape (or a
+# concurrent one, up to the pool size) gets an already-authenticated browser.
+#
+# Before a pooled session is handed out again it is health-checked; a dead or
+# logged-out browser is quit and replaced. Sessions are also recycled after a
+# number of uses or an age limit, since long-lived Chrome processes grow.
+#
+# The pool does not know how to start a browser: the caller passes a factory
+# (see twitter_scraper.get_driver_pool). Each driver is used by one thread at
+# a time; Selenium sessions are not thread-safe.
+
+# Import required libraries
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# Pool configuration, overridable through environment variables
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+DRIVER_MAX_USES = int(os.getenv("DRIVER_MAX_USES", "50"))
+DRIVER_MAX_AGE = float(os.getenv("DRIVER_MAX_AGE_SECONDS", "3600"))
+
+
+def browser_is_alive(driver):
+    """
+    Default health check: the browser still answers a trivial script.
+
+    Returns:
+        bool: False if the session crashed or was closed
+    """
+    try:
+        driver.execute_script("return document.readyState")
+        return True
+    except Exception:
+        return False
+
+
+class _Session:
+    """A pooled driver plus what the pool needs to know about it."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Bounded pool of warm WebDriver sessions.
+
+    Example:
+        pool = DriverPool(lambda: start_session("twitter_cookies.json"), size=2)
+        pool.warm()                       # Optional: start the browsers now
+        with pool.session() as driver:
+            driver.get("https://x.com/search?q=python&f=live")
+        pool.close()
+    """
+
+    def __init__(self, factory, size=DRIVER_POOL_SIZE, health_check=browser_is_alive,
+                 max_uses=DRIVER_MAX_USES, max_age=DRIVER_MAX_AGE):
+        """
+        Args:
+            factory (callable): Starts and authenticates a new driver
+            size (int): Most sessions alive at once (idle + in use)
+            health_check (callable): driver -> bool, run before a session is reused
+            max_uses (int): Quit a session after this many scrapes (0: never)
+            max_age (float): Quit a session this many seconds after it started (0: never)
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.health_check = health_check
+        self.max_uses = max_uses
+        self.max_age = max_age
+
+        self._idle = deque()     # Sessions ready to hand out, most recently used last
+        self._in_use = {}        # id(driver) -> _Session
+        self._live = 0           # Sessions idle, in use, or being started
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self.started = 0         # Browsers started
+        self.reused = 0          # Acquisitions served by a warm session
+        self.replaced = 0        # Sessions quit because they failed the health check
+        self.recycled = 0        # Sessions quit because of max_uses / max_age
+        self.wait_seconds = 0.0  # Time callers spent waiting for a free session
+
+    # ----- Handing sessions out and back -----
+
+    def acquire(self, timeout=None):
+        """
+        Return a healthy driver, starting one if the pool has room.
+
+        Blocks while all `size` sessions are in use.
+
+        Args:
+            timeout (float): Seconds to wait for a free session (None: forever)
+
+        Returns:
+            WebDriver: Exclusive to the caller until release()
+
+        Raises:
+            TimeoutError: No session became free in time
+            RuntimeError: The pool was closed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            session = self._reserve(deadline)
+            if session is None:
+                return self._start()
+            if not self._expired(session) and self.health_check(session.driver):
+                with self._condition:
+                    self._in_use[id(session.driver)] = session
+                    self.reused += 1
+                return session.driver
+            # Dead, logged out or expired: replace it and try again
+            with self._condition:
+                if self._expired(session):
+                    self.recycled += 1
+                else:
+                    self.replaced += 1
+            self._discard(session)
+
+    def release(self, driver, healthy=True):
+        """
+        Give a driver back to the pool.
+
+        Args:
+            driver (WebDriver): A driver returned by acquire()
+            healthy (bool): False to quit it instead of reusing it
+        """
+        with self._condition:
+            session = self._in_use.pop(id(driver), None)
+            if session is None:
+                return
+            session.uses += 1
+            keep = healthy and not self._closed and not self._expired(session)
+            if keep:
+                self._idle.append(session)
+                self._condition.notify()
+            elif healthy:
+                self.recycled += 1
+        if not keep:
+            self._discard(session)
+
+    @contextmanager
+    def session(self, timeout=None):
+        """
+        Context manager around acquire()/release().
+
+        If the block raises, the driver is health-checked right away and
+        quit if the browser itself is what failed.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, healthy=self.health_check(driver))
+            raise
+        self.release(driver)
+
+    # ----- Lifecycle -----
+
+    def warm(self, count=None):
+        """
+        Start idle sessions ahead of the first scrape.
+
+        Args:
+            count (int): Sessions to have alive (default and maximum: the pool size)
+
+        Returns:
+            int: Number of sessions started
+        """
+        count = self.size if count is None else min(count, self.size)
+        started = 0
+        while True:
+            with self._condition:
+                if self._closed or self._live >= count:
+                    return started
+                self._live += 1
+            driver = self._start()
+            with self._condition:
+                session = self._in_use.pop(id(driver))
+                self._idle.append(session)
+                self._condition.notify()
+            started += 1
+
+    def close(self):
+        """Quit idle sessions now and in-use ones when they are released."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for session in idle:
+            self._discard(session)
+
+    def stats(self):
+        """
+        Return pool counters.
+
+        Example return value:
+            {"size": 2, "live": 2, "idle": 1, "in_use": 1, "started": 2, "reused": 7,
+             "replaced": 0, "recycled": 0, "wait_seconds": 0.0}
+        """
+        with self._condition:
+            return {
+                "size": self.size,
+                "live": self._live,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "started": self.started,
+                "reused": self.reused,
+                "replaced": self.replaced,
+                "recycled": self.recycled,
+                "wait_seconds": round(self.wait_seconds, 3)
+            }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ----- Internals -----
+
+    def _reserve(self, deadline):
+        # Take an idle session, or claim a slot for a new one (returns None)
+        start = time.monotonic()
+        with self._condition:
+            try:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    if self._idle:
+                        return self._idle.pop()  # Most recently used: least likely to have gone stale
+                    if self._live < self.size:
+                        self._live += 1
+                        return None
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No browser session became free (pool size {self.size})")
+                    self._condition.wait(remaining)
+            finally:
+                self.wait_seconds += time.monotonic() - start
+
+    def _start(self):
+        # Runs outside the lock: starting Chrome takes seconds
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self._condition:
+                self._live -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._in_use[id(driver)] = _Session(driver)
+            self.started += 1
+        return driver
+
+    def _expired(self, session):
+        too_old = self.max_age and time.monotonic() - session.created_at >= self.max_age
+        return bool(too_old or (self.max_uses and session.uses >= self.max_uses))
+
+    def _discard(self, session):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"[!] Error closing browser session: {e}")
+        with self._condition:
+            self._live -= 1
+            self._condition.notify()
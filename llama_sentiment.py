@@ -1,80 +1,397 @@
 # Import necessary libraries for environment variables, JSON handling, and HTTP requests
 import os
 import json
+import re
+import time
 import requests
+from rate_limiter import MAX_ATTEMPTS, estimate_tokens, get_rate_limiter
+from sentiment_cache import get_cache, make_cache_key
 
 # Retrieve Groq API key from environment variable or use hardcoded fallback
 # Best practice: Use environment variables to keep API keys secure
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "your_api_key_here")
 
-def classify_sentiment(text: str) -> str:
+# Groq API endpoint for chat completions (OpenAI-compatible)
+# Can be pointed at a local mock server for testing and benchmarking
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+
+# Seconds to wait for a single API response before giving up
+REQUEST_TIMEOUT = float(os.getenv("GROQ_REQUEST_TIMEOUT", "30"))
+
+# Llama3 model with 8B parameters and 8192 context length
+MODEL_NAME = "llama3-8b-8192"
+
+# System message that defines the AI's role and behavior
+SYSTEM_PROMPT = "You are a sentiment analysis assistant that classifies text as positive, negative, or neutral."
+
+# Bump this whenever a prompt changes so previously cached labels are not reused
+PROMPT_VERSION = "1"
+
+# The only labels we ever store in the database
+VALID_SENTIMENTS = ("positive", "negative", "neutral")
+
+# Default number of tweets packed into a single batch prompt
+DEFAULT_BATCH_SIZE = 20
+
+
+# Shared HTTP session so successive calls reuse one keep-alive connection
+# instead of paying a fresh TCP/TLS handshake every time
+_session = requests.Session()
+
+
+def build_headers():
+    """Return the HTTP headers for a Groq API request."""
+    return {
+        "Authorization": f"Bearer {GROQ_API_KEY}",  # Bearer token authentication
+        "Content-Type": "application/json"          # Specify JSON payload format
+    }
+
+
+def build_payload(prompt, max_tokens):
     """
-    Sends text to Groq API for sentiment classification using Llama3 model.
+    Construct the chat-completion request payload for a prompt.
     
     Args:
-        text (str): The input text to analyze for sentiment
+        prompt (str): The user message to send
+        max_tokens (int): Upper bound on the length of the reply
         
     Returns:
-        str: One of three sentiment classifications: 'positive', 'negative', or 'neutral'
+        dict: JSON-serializable request body
     """
-    
-    # Define the Groq API endpoint for chat completions
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    
-    # Set up HTTP headers with authorization and content type
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",  # Bearer token authentication
-        "Content-Type": "application/json"          # Specify JSON payload format
-    }
-    
-    # Create a structured prompt for sentiment analysis
-    # This prompt instructs the AI to respond with only one specific word
-    prompt = f"""
-    Analyze the sentiment of the following tweet. 
-    Respond with only one word: 'positive', 'negative', or 'neutral'.
-    
-    Tweet: {text}
-    """
-    
-    # Construct the API request payload
-    payload = {
-        "model": "llama3-8b-8192",  # Specify Llama3 model with 8B parameters and 8192 context length
+    return {
+        "model": MODEL_NAME,
         "messages": [
             # System message defines the AI's role and behavior
-            {"role": "system", "content": "You are a sentiment analysis assistant that classifies text as positive, negative, or neutral."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             # User message contains the actual analysis request
             {"role": "user", "content": prompt}
         ],
-        "temperature": 0.1,  # Low temperature (0.0-1.0) for more consistent, deterministic results
-        "max_tokens": 10     # Limit response length since we only need a single word
+        "temperature": 0.1,      # Low temperature (0.0-1.0) for more consistent, deterministic results
+        "max_tokens": max_tokens
     }
+
+
+def _post_chat(prompt, max_tokens):
+    """
+    Send a single chat-completion request to Groq and return the reply text.
     
-    # Attempt to make API request with error handling
-    try:
-        # Send POST request to Groq API
-        response = requests.post(url, json=payload, headers=headers)
+    The call goes through the shared rate limiter: it waits for request and
+    token budget, retries 429/5xx responses and connection errors with
+    backoff (honouring Retry-After), and fails fast while the circuit is open.
+    
+    Args:
+        prompt (str): The user message to send
+        max_tokens (int): Upper bound on the length of the reply
+        
+    Returns:
+        str: The raw content of the first choice in the API response
+        
+    Raises:
+        CircuitOpenError: If the API has been failing and calls are suspended
+        requests.RequestException: If the request still fails after all attempts
+    """
+    limiter = get_rate_limiter()
+    tokens = estimate_tokens(prompt, max_tokens)
+    
+    for attempt in range(MAX_ATTEMPTS):
+        # Wait for our share of the requests/tokens-per-minute budget
+        limiter.acquire(tokens)
+        
+        try:
+            # Send POST request to Groq API
+            response = _session.post(
+                GROQ_API_URL,
+                json=build_payload(prompt, max_tokens),
+                headers=build_headers(),
+                timeout=REQUEST_TIMEOUT
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(limiter.on_error(attempt))
+            continue
         
-        # Raise an exception if the HTTP request returned an error status
+        # Back off and retry on throttling or transient server errors
+        delay = limiter.on_response(response.status_code, response.headers.get("Retry-After"), attempt)
+        if delay is not None and attempt < MAX_ATTEMPTS - 1:
+            print(f"[!] Groq API returned {response.status_code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        
+        # Fail loudly on any remaining HTTP error
         response.raise_for_status()
         
-        # Parse the JSON response
+        # Extract the AI's response text from the API response structure
         data = response.json()
+        return data["choices"][0]["message"]["content"]
+
+
+def normalize_label(response_text):
+    """
+    Map a free-form model reply onto one of the valid sentiment labels.
+    
+    This handles cases where the AI might return variations like "The sentiment is positive".
+    
+    Args:
+        response_text (str): Raw reply text from the model
         
-        # Extract the AI's response text from the API response structure
-        response_text = data["choices"][0]["message"]["content"].strip().lower()
-        
-        # Normalize the response to ensure it matches one of our expected values
-        # This handles cases where the AI might return variations like "The sentiment is positive"
-        if "positive" in response_text:
-            return "positive"
-        elif "negative" in response_text:
-            return "negative"
-        else:
-            # Default to neutral if response doesn't clearly indicate positive or negative
-            return "neutral"
+    Returns:
+        str: 'positive', 'negative', or 'neutral'
+    """
+    response_text = str(response_text).strip().lower()
+    if "positive" in response_text:
+        return "positive"
+    elif "negative" in response_text:
+        return "negative"
+    else:
+        # Default to neutral if response doesn't clearly indicate positive or negative
+        return "neutral"
+
+
+def build_single_prompt(text):
+    """
+    Create a structured prompt for sentiment analysis of one tweet.
+    
+    This prompt instructs the AI to respond with only one specific word.
+    """
+    return f"""
+    Analyze the sentiment of the following tweet. 
+    Respond with only one word: 'positive', 'negative', or 'neutral'.
+    
+    Tweet: {text}
+    """
+
+
+def classify_sentiment(text: str) -> str:
+    """
+    Sends text to Groq API for sentiment classification using Llama3 model.
+    
+    Args:
+        text (str): The input text to analyze for sentiment
+        
+    Returns:
+        str: One of three sentiment classifications: 'positive', 'negative', or 'neutral'
+    """
+    
+    # Return the stored label if this text has been classified before
+    cache = get_cache()
+    cache_key = make_cache_key(text, MODEL_NAME, PROMPT_VERSION)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Attempt to make API request with error handling
+    try:
+        # Limit response length since we only need a single word
+        response_text = _post_chat(build_single_prompt(text), max_tokens=10)
+        sentiment = normalize_label(response_text)
+        cache.set(cache_key, sentiment)  # Only real answers are cached, never the fallback
+        return sentiment
             
     except Exception as e:
         # Handle any errors (network issues, API errors, parsing errors, etc.)
         print(f"[!] Groq API error: {e}")
         # Return neutral as a safe fallback when analysis fails
-        return "neutral"
\ No newline at end of file
+        return "neutral"
+
+
+def build_batch_prompt(texts):
+    """
+    Pack several tweets into one numbered prompt that asks for a JSON answer.
+    
+    Args:
+        texts (list): Tweets to classify; they are numbered from 1 in the prompt
+        
+    Returns:
+        str: The prompt to send as the user message
+    """
+    # Newlines inside a tweet would break the numbering, so flatten them
+    numbered = "\n".join(
+        f"{i}. {' '.join(str(text).split())}" for i, text in enumerate(texts, 1)
+    )
+    return f"""
+    Analyze the sentiment of each of the following numbered tweets.
+    Respond with only a JSON array, one object per tweet, in this exact format:
+    [{{"id": 1, "sentiment": "positive"}}, {{"id": 2, "sentiment": "neutral"}}]
+    Each sentiment must be one word: 'positive', 'negative', or 'neutral'.
+    
+    Tweets:
+    {numbered}
+    """
+
+
+def parse_batch_response(response_text, count):
+    """
+    Parse the JSON array returned for a batch prompt.
+    
+    Items that are missing, duplicated with a different label, out of range or
+    carry an unknown label are left out, so the caller can retry just those.
+    
+    Args:
+        response_text (str): Raw reply text from the model
+        count (int): Number of tweets that were sent in the batch
+        
+    Returns:
+        dict: Mapping of zero-based position in the batch to a valid sentiment label
+    """
+    # The model sometimes wraps the array in prose or code fences; keep only the array
+    match = re.search(r"\[.*\]", response_text, re.DOTALL)
+    if not match:
+        return {}
+    
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    
+    if not isinstance(items, list):
+        return {}
+    
+    labels = {}
+    conflicting = set()  # Positions answered twice with different labels
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            position = int(item.get("id")) - 1  # Prompt numbering starts at 1
+        except (TypeError, ValueError):
+            continue
+        sentiment = str(item.get("sentiment", "")).strip().lower()
+        if 0 <= position < count and sentiment in VALID_SENTIMENTS:
+            if labels.get(position, sentiment) != sentiment:
+                conflicting.add(position)
+            labels[position] = sentiment
+    for position in conflicting:
+        del labels[position]
+    return labels
+
+
+def batch_max_tokens(count):
+    """Token budget for a batch reply: roughly a dozen tokens per JSON object plus the brackets."""
+    return 16 * count + 16
+
+
+class BatchJob:
+    """
+    Bookkeeping shared by the synchronous and asynchronous batch classifiers.
+    
+    On creation, texts already in the sentiment cache are resolved and
+    duplicates are collapsed, so only unique, unseen texts are sent to the API.
+    Those are addressed by their index into unique_texts.
+    """
+    
+    def __init__(self, texts):
+        self.results = [None] * len(texts)
+        self._cache = get_cache()
+        
+        # Serve repeats from the cache and collapse duplicates inside this call
+        keys = [make_cache_key(text, MODEL_NAME, PROMPT_VERSION) for text in texts]
+        cached = self._cache.get_many(keys)
+        self._positions_by_key = {}  # Cache key -> every input index carrying that text
+        for index, key in enumerate(keys):
+            if key in cached:
+                self.results[index] = cached[key]
+            else:
+                self._positions_by_key.setdefault(key, []).append(index)
+        
+        self._unique_keys = list(self._positions_by_key)
+        self.unique_texts = [texts[self._positions_by_key[key][0]] for key in self._unique_keys]
+        self._labels_by_key = {}
+    
+    def record(self, chunk, labels):
+        """
+        Store the labels parsed for one chunk of unique texts.
+        
+        Args:
+            chunk (list): Indexes into unique_texts that were sent together
+            labels (dict): Position within the chunk -> sentiment, as parsed
+            
+        Returns:
+            list: The indexes from chunk that did not get a valid label
+        """
+        failed = []
+        for position, index in enumerate(chunk):
+            if position in labels:
+                self._labels_by_key[self._unique_keys[index]] = labels[position]
+            else:
+                failed.append(index)
+        return failed
+    
+    def finish(self, unresolved):
+        """
+        Cache the new labels and expand them back to input order.
+        
+        Args:
+            unresolved (list): Indexes into unique_texts that never got a label
+            
+        Returns:
+            list: One sentiment label per input text
+        """
+        # Only real answers are cached, never the fallback
+        self._cache.set_many(self._labels_by_key)
+        for key, sentiment in self._labels_by_key.items():
+            for index in self._positions_by_key[key]:
+                self.results[index] = sentiment
+        
+        # Same safe fallback as classify_sentiment for anything still unresolved
+        if unresolved:
+            print(f"[!] Giving up on {len(unresolved)} tweet(s); defaulting to neutral")
+            for index in unresolved:
+                for position in self._positions_by_key[self._unique_keys[index]]:
+                    self.results[position] = "neutral"
+        return self.results
+
+
+def classify_sentiment_batch(texts, batch_size=DEFAULT_BATCH_SIZE, max_retries=2):
+    """
+    Classify many texts with as few Groq API calls as possible.
+    
+    Tweets are packed batch_size at a time into a single numbered prompt and the
+    model answers with a JSON array. Items that come back missing or malformed
+    are collected and sent again (and only those), up to max_retries times.
+    Texts already in the sentiment cache, and duplicates within the call,
+    never reach the API.
+    
+    Args:
+        texts (list): The input texts to analyze for sentiment
+        batch_size (int): Maximum number of texts per API call
+        max_retries (int): How many extra rounds to spend on failed items
+        
+    Returns:
+        list: One of 'positive', 'negative' or 'neutral' per input, in input order
+        
+    Example:
+        classify_sentiment_batch(["I love it", "This is awful"])
+        # -> ["positive", "negative"]
+    """
+    batch_size = max(1, int(batch_size))
+    job = BatchJob(list(texts))
+    pending = list(range(len(job.unique_texts)))  # Indexes into unique_texts still waiting for a label
+    
+    for attempt in range(max_retries + 1):
+        if not pending:
+            break
+        
+        failed = []
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            chunk_texts = [job.unique_texts[i] for i in chunk]
+            
+            try:
+                response_text = _post_chat(
+                    build_batch_prompt(chunk_texts),
+                    max_tokens=batch_max_tokens(len(chunk))
+                )
+                labels = parse_batch_response(response_text, len(chunk))
+            except Exception as e:
+                # Network or API error: the whole chunk goes back in the retry pool
+                print(f"[!] Groq API error (batch of {len(chunk)}): {e}")
+                labels = {}
+            
+            failed.extend(job.record(chunk, labels))
+        
+        if failed and attempt < max_retries:
+            print(f"[!] Retrying {len(failed)} unclassified tweet(s)...")
+        pending = failed
+    
+    return job.finish(pending)
@@ -0,0 +1,272 @@
+# Local offline sentiment engine for Twitter Sentiment Analysis Project
+# Scores tweets on the CPU with a small linear model over hashed n-grams,
+# so bulk backfills never depend on the Groq API.
+#
+# How it works:
+#   1. Each tweet is tokenized and turned into unigram + bigram features
+#   2. Features are hashed (stable CRC32) into a fixed-size weight vector
+#   3. A tweet's score is the sum of its feature weights (NumPy, whole batch at once)
+#   4. score >= threshold -> positive, score <= -threshold -> negative, else neutral
+#
+# Weights start from a built-in sentiment lexicon (with negation and
+# intensifier bigrams) and can be refined with fit() on labelled tweets,
+# for example the LLM-labelled tweets already stored in MongoDB.
+
+# Import required libraries
+import os
+import re
+import zlib
+import threading
+import numpy as np
+
+# Path to weights saved with LocalSentimentEngine.save(); the lexicon is used if unset
+LOCAL_MODEL_PATH = os.getenv("LOCAL_SENTIMENT_MODEL", "")
+
+# Number of hash buckets (2**18 float32 weights = 1 MB)
+HASH_DIM = 2 ** 18
+
+# |score| needed before a tweet counts as positive or negative
+POLARITY_THRESHOLD = 0.5
+
+# Words, contractions and a few ASCII emoticons
+TOKEN_PATTERN = re.compile(r"[a-z][a-z']*|[:;]-?[()dp]|<3")
+
+# Built-in lexicon: word -> polarity weight
+POSITIVE_WORDS = {
+    "good": 1.5, "great": 2.0, "excellent": 2.5, "amazing": 2.5, "awesome": 2.5,
+    "fantastic": 2.5, "wonderful": 2.5, "love": 2.0, "loved": 2.0, "loving": 2.0,
+    "loves": 2.0, "like": 0.8, "liked": 1.0, "likes": 0.8, "best": 2.0, "better": 1.0,
+    "happy": 2.0, "glad": 1.5, "nice": 1.5, "cool": 1.2, "fun": 1.5, "beautiful": 2.0,
+    "brilliant": 2.5, "perfect": 2.5, "win": 1.5, "wins": 1.5, "won": 1.5,
+    "winning": 1.5, "success": 2.0, "successful": 2.0, "excited": 2.0, "exciting": 2.0,
+    "thanks": 1.5, "thank": 1.5, "grateful": 2.0, "congrats": 2.0,
+    "congratulations": 2.0, "proud": 2.0, "enjoy": 1.5, "enjoyed": 1.5, "impressive": 2.0,
+    "impressed": 2.0, "recommend": 1.5, "helpful": 1.5, "positive": 1.5, "strong": 1.0,
+    "support": 1.0, "hope": 1.0, "hopeful": 1.5, "incredible": 2.5, "favorite": 1.5,
+    "favourite": 1.5, "fast": 0.8, "easy": 1.0, "smooth": 1.0, "beat": 0.8,
+    "bullish": 1.5, "gains": 1.2, "rally": 1.2, "improve": 1.0, "improved": 1.2,
+    "improvement": 1.2, "safe": 1.0, "fixed": 1.0, "works": 0.8, "worth": 1.0,
+    "lol": 0.8, "yay": 2.0, "wow": 1.2, "superb": 2.5, "outstanding": 2.5,
+    "pleased": 1.5, "delighted": 2.5, "lovely": 2.0, "cute": 1.5, "peace": 1.0,
+    "blessed": 2.0, "legend": 1.5, "goat": 1.5, "fire": 1.0, "solid": 1.0,
+    ":)": 1.5, ":-)": 1.5, ":d": 2.0, ":-d": 2.0, ";)": 1.0, ":p": 0.8, "<3": 2.0,
+}
+NEGATIVE_WORDS = {
+    "bad": 1.5, "terrible": 2.5, "awful": 2.5, "horrible": 2.5, "worst": 2.5,
+    "worse": 1.5, "hate": 2.5, "hated": 2.5, "hates": 2.5, "sad": 2.0, "angry": 2.0,
+    "annoying": 1.5, "annoyed": 1.5, "disappointed": 2.0, "disappointing": 2.0,
+    "fail": 2.0, "failed": 2.0, "fails": 2.0, "failure": 2.0, "broken": 1.5,
+    "bug": 1.0, "bugs": 1.0, "crash": 1.5, "crashed": 1.5, "slow": 1.0, "poor": 1.5,
+    "ugly": 1.5, "stupid": 2.0, "dumb": 1.5, "wrong": 1.2, "problem": 1.0,
+    "problems": 1.0, "issue": 0.8, "issues": 0.8, "scam": 2.5, "fraud": 2.5,
+    "lie": 1.5, "lies": 1.5, "lying": 1.5, "fake": 1.5, "useless": 2.0, "waste": 1.5,
+    "boring": 1.5, "sucks": 2.0, "suck": 2.0, "trash": 2.0, "garbage": 2.0,
+    "disaster": 2.5, "crisis": 1.5, "war": 1.5, "death": 1.5, "dead": 1.2, "kill": 1.5,
+    "killed": 1.5, "attack": 1.5, "fear": 1.5, "afraid": 1.5, "scared": 1.5,
+    "worried": 1.5, "worry": 1.2, "pain": 1.5, "hurt": 1.5, "lost": 1.0, "lose": 1.0,
+    "losing": 1.0, "loss": 1.2, "losses": 1.2, "bearish": 1.5,
+    "dump": 1.2, "down": 0.5, "expensive": 1.0, "overpriced": 1.5, "delay": 1.0,
+    "delayed": 1.0, "cancelled": 1.2, "canceled": 1.2, "ridiculous": 1.5,
+    "pathetic": 2.0, "shame": 1.5, "shameful": 2.0, "disgusting": 2.5, "gross": 1.5,
+    "mess": 1.5, "corrupt": 2.0, "toxic": 2.0, "unfortunately": 1.2, "sorry": 0.8,
+    "cry": 1.2, "crying": 1.2, "ugh": 1.5, "wtf": 1.5, "smh": 1.2, "negative": 1.5,
+    ":(": 1.5, ":-(": 1.5,
+}
+
+# Words that flip the polarity of the next word ("not good"), and words that
+# strengthen it ("very good")
+NEGATORS = {"not", "no", "never", "none", "nothing", "neither", "nor", "without", "hardly", "cannot",
+            "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't", "weren't", "can't", "won't",
+            "couldn't", "wouldn't", "shouldn't", "haven't", "hasn't", "ain't"}
+INTENSIFIERS = {"very": 1.5, "so": 1.3, "really": 1.4, "extremely": 1.8, "super": 1.5,
+                "totally": 1.4, "absolutely": 1.6, "too": 1.2, "most": 1.3, "highly": 1.4}
+
+
+def tokenize(text):
+    """
+    Split text into lower-case word and emoticon tokens.
+
+    Args:
+        text (str): Tweet text (ideally already cleaned of URLs, mentions and hashtags)
+
+    Returns:
+        list: Tokens in order of appearance
+    """
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class LocalSentimentEngine:
+    """
+    Linear sentiment model over hashed unigrams and bigrams.
+
+    Scoring is done for a whole batch at once: feature indexes for every tweet
+    are concatenated into one array and summed per tweet with np.bincount, so
+    the per-tweet Python work is limited to tokenization and a dict lookup.
+
+    Example:
+        engine = LocalSentimentEngine()
+        labels, confidence = engine.predict(["I love it", "this is awful"])
+        # labels -> ["positive", "negative"]
+    """
+
+    def __init__(self, dim=HASH_DIM, threshold=POLARITY_THRESHOLD):
+        """
+        Args:
+            dim (int): Number of hash buckets in the weight vector
+            threshold (float): |score| needed before a tweet counts as positive or negative
+        """
+        self.dim = dim
+        self.threshold = threshold
+        self.weights = np.zeros(dim, dtype=np.float32)
+        self._index_cache = {}  # feature string -> hash bucket, avoids re-hashing common tokens
+        self._load_lexicon()
+
+    def _index(self, feature):
+        # Stable across processes (unlike hash()), so saved weights stay valid
+        index = self._index_cache.get(feature)
+        if index is None:
+            index = zlib.crc32(feature.encode("utf-8")) % self.dim
+            if len(self._index_cache) < 1_000_000:
+                self._index_cache[feature] = index
+        return index
+
+    def _load_lexicon(self):
+        # Unigram weights straight from the lexicon
+        lexicon = dict((word, weight) for word, weight in POSITIVE_WORDS.items())
+        lexicon.update((word, -weight) for word, weight in NEGATIVE_WORDS.items())
+        for word, weight in lexicon.items():
+            self.weights[self._index(word)] += weight
+
+        # Bigram weights cancel the unigram and add the adjusted polarity, so that
+        # "not good" sums to -0.8 * good and "very good" to 1.5 * good
+        for word, weight in lexicon.items():
+            for negator in NEGATORS:
+                self.weights[self._index(f"{negator} {word}")] += -weight - 0.8 * weight
+            for intensifier, factor in INTENSIFIERS.items():
+                self.weights[self._index(f"{intensifier} {word}")] += (factor - 1.0) * weight
+
+    def _features(self, texts):
+        """
+        Convert texts to a flat array of feature indexes.
+
+        Returns:
+            tuple: (feature_indexes, doc_ids) - parallel int arrays, doc_ids[i]
+            says which text feature_indexes[i] came from
+        """
+        indexes = []
+        lengths = []
+        index = self._index
+        for text in texts:
+            tokens = tokenize(text)
+            features = [index(token) for token in tokens]
+            features.extend(index(f"{a} {b}") for a, b in zip(tokens, tokens[1:]))
+            indexes.extend(features)
+            lengths.append(len(features))
+        feature_indexes = np.fromiter(indexes, dtype=np.int64, count=len(indexes))
+        doc_ids = np.repeat(np.arange(len(lengths)), lengths)
+        return feature_indexes, doc_ids
+
+    def score(self, texts):
+        """
+        Compute a polarity score per text (positive > 0 > negative).
+
+        Args:
+            texts (list): Texts to score
+
+        Returns:
+            numpy.ndarray: One float score per text
+        """
+        texts = list(texts)
+        feature_indexes, doc_ids = self._features(texts)
+        return np.bincount(doc_ids, weights=self.weights[feature_indexes], minlength=len(texts))
+
+    def predict(self, texts):
+        """
+        Classify texts and estimate how sure the model is.
+
+        Confidence grows with |score| for positive/negative labels. Neutral is
+        what the model says when it found little evidence either way, so its
+        confidence is capped at 0.5.
+
+        Returns:
+            tuple: (labels, confidence) - list of labels and a float array in [0, 1]
+        """
+        scores = self.score(texts)
+        labels = np.where(scores >= self.threshold, "positive",
+                          np.where(scores <= -self.threshold, "negative", "neutral"))
+        magnitude = np.abs(scores)
+        confidence = np.where(labels == "neutral",
+                              0.5 * (1.0 - np.minimum(magnitude / self.threshold, 1.0)),
+                              np.tanh(magnitude))
+        return labels.tolist(), confidence
+
+    def classify(self, text):
+        """Classify a single text; returns 'positive', 'negative', or 'neutral'."""
+        return self.predict([text])[0][0]
+
+    def fit(self, texts, labels, epochs=20, learning_rate=0.5, l2=0.01):
+        """
+        Refine the weights on labelled examples with batch gradient descent.
+
+        Each label is mapped to a target score (positive=+1, neutral=0,
+        negative=-1) and squared error is minimised. L2 regularisation pulls
+        weights back towards the lexicon so rare features stay sane.
+
+        Args:
+            texts (list): Training texts
+            labels (list): 'positive', 'negative' or 'neutral' for each text
+            epochs (int): Number of full passes over the data
+            learning_rate (float): Step size
+            l2 (float): Strength of the pull towards the lexicon weights
+
+        Returns:
+            LocalSentimentEngine: self, for chaining
+        """
+        texts = list(texts)
+        targets = np.array([{"positive": 1.0, "negative": -1.0}.get(label, 0.0) for label in labels])
+        feature_indexes, doc_ids = self._features(texts)
+        prior = self.weights.copy()
+        # Features seen in many tweets get proportionally smaller steps
+        counts = np.maximum(np.bincount(feature_indexes, minlength=self.dim), 1)
+
+        for _ in range(epochs):
+            # Scores are scaled so the +-threshold decision boundary lines up with +-0.5 targets
+            scores = np.bincount(doc_ids, weights=self.weights[feature_indexes], minlength=len(texts))
+            residual = np.clip(scores / (2 * self.threshold), -1.5, 1.5) - targets
+            gradient = np.bincount(feature_indexes, weights=residual[doc_ids], minlength=self.dim) / counts
+            self.weights -= (learning_rate * (gradient + l2 * (self.weights - prior))).astype(np.float32)
+        return self
+
+    def save(self, path):
+        """Save the weights to a .npz file."""
+        np.savez_compressed(path, weights=self.weights, threshold=self.threshold)
+
+    @classmethod
+    def load(cls, path):
+        """Load an engine saved with save()."""
+        data = np.load(path)
+        engine = cls(dim=len(data["weights"]), threshold=float(data["threshold"]))
+        engine.weights = data["weights"].astype(np.float32)
+        return engine
+
+
+# Shared engine, created on first use
+_shared_engine = None
+_shared_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Return the process-wide LocalSentimentEngine.
+
+    Loads trained weights from LOCAL_SENTIMENT_MODEL if that is set,
+    otherwise starts from the built-in lexicon.
+    """
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            if LOCAL_MODEL_PATH and os.path.exists(LOCAL_MODEL_PATH):
+                _shared_engine = LocalSentimentEngine.load(LOCAL_MODEL_PATH)
+            else:
+                _shared_engine = LocalSentimentEngine()
+        return _shared_engine
@@ -3,7 +3,14 @@
 # Uses MongoDB as the database backend for scalable data storage
 
 # Import the MongoDB Python driver (pymongo)
-from pymongo import MongoClient
+import time
+import hashlib
+import threading
+from collections import Counter
+from pymongo import MongoClient, UpdateOne, DeleteOne, ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError
+from bson import ObjectId, Int64
+from text_preprocessing import extract_words
 
 # Establish connection to MongoDB server
 # MongoDB runs on localhost (your computer) on default port 27017
@@ -17,6 +24,382 @@ db = client["twitter_db"]
 # Collections in MongoDB are like tables in SQL databases
 collection = db["tweets"]
 
+# Pre-aggregated counts per keyword and hour, kept up to date by the write functions
+# (see "Sentiment summary" below), so dashboards never have to scan `tweets`
+summary_collection = db["tweet_summary"]
+
+# Per-keyword high-water marks of what has been scraped (see "Scrape cursors" below)
+state_collection = db["scrape_state"]
+
+# Counters that must survive clearing the other collections (see get_data_version)
+meta_collection = db["tweet_meta"]
+
+# Indexes are created (and old documents migrated) once per process, before the first write
+_indexes_ready = False
+_indexes_lock = threading.Lock()
+
+def make_tweet_key(tweet):
+    """
+    Compute the stable identity key of a tweet.
+    
+    Tweets scraped with their status ID are identified by it, so two different
+    tweets with the same text never collide. Without an ID we fall back to a
+    hash of username + clean_text, which still tells different authors apart.
+    
+    Args:
+        tweet (dict): Tweet data with clean_text and, ideally, tweet_id and username
+        
+    Returns:
+        str: "id:<tweet id>" or "hash:<sha1 hex>"
+    """
+    if tweet.get("tweet_id"):
+        return f"id:{tweet['tweet_id']}"
+    content = f"{tweet.get('username', '')}\x00{tweet['clean_text']}"
+    return "hash:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+def migrate_tweet_keys(batch_size=1000):
+    """
+    Backfill tweet_key on documents stored before it existed.
+    
+    Documents that end up with the same key (true duplicates) are collapsed,
+    keeping the most recently scraped copy, so the unique index can be built.
+    Once that index exists and nothing needed a key, the duplicate scan is skipped.
+    
+    Args:
+        batch_size (int): Number of updates per bulk_write call
+        
+    Returns:
+        dict: {"backfilled": <documents updated>, "duplicates_removed": <documents deleted>}
+    """
+    # Only fetch the fields the key is computed from
+    cursor = collection.find(
+        {"tweet_key": {"$exists": False}},
+        {"tweet_id": 1, "username": 1, "clean_text": 1}
+    )
+    backfilled = 0
+    operations = []
+    for doc in cursor:
+        if "clean_text" not in doc:
+            continue
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"tweet_key": make_tweet_key(doc)}}))
+        if len(operations) >= batch_size:
+            backfilled += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        backfilled += collection.bulk_write(operations, ordered=False).modified_count
+    
+    # With nothing backfilled, the unique index (once built) rules out duplicates: skip the full scan
+    if not backfilled and "tweet_key_unique" in collection.index_information():
+        return {"backfilled": 0, "duplicates_removed": 0}
+    
+    # Find keys shared by several documents and keep only the newest of each
+    duplicates = collection.aggregate([
+        {"$match": {"tweet_key": {"$exists": True}}},
+        {"$sort": {"timestamp": -1}},
+        {"$group": {"_id": "$tweet_key", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ], allowDiskUse=True)
+    deletes = [DeleteOne({"_id": doc_id}) for group in duplicates for doc_id in group["ids"][1:]]
+    removed = collection.bulk_write(deletes, ordered=False).deleted_count if deletes else 0
+    
+    if backfilled or removed:
+        print(f"Migrated tweet keys: {backfilled} backfilled, {removed} duplicates removed")
+    return {"backfilled": backfilled, "duplicates_removed": removed}
+
+def migrate_tweet_tokens(batch_size=1000):
+    """
+    Store the `tokens` array on documents written before it existed.
+    
+    Args:
+        batch_size (int): Number of updates per bulk_write call
+        
+    Returns:
+        int: Number of documents updated
+    """
+    cursor = collection.find(
+        {"tokens": {"$exists": False}, "clean_text": {"$exists": True}},
+        {"clean_text": 1}
+    )
+    updated = 0
+    operations = []
+    for doc in cursor:
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"tokens": extract_words(doc["clean_text"])}}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    if updated:
+        print(f"Migrated tweet tokens: {updated} backfilled")
+    return updated
+
+def _prepare_for_write(tweet):
+    # Derived fields every stored tweet carries
+    tweet["tweet_key"] = make_tweet_key(tweet)
+    if "tokens" not in tweet:
+        tweet["tokens"] = extract_words(tweet.get("clean_text"))
+
+def ensure_indexes():
+    """
+    Create the indexes the handler relies on (safe to call repeatedly).
+    
+    - tweet_key (unique): the upsert filter, so writes no longer scan the collection
+    - sentiment + _id, keyword + _id, keyword + sentiment + _id: keyset pages of
+      the tweet list filtered by sentiment and/or keyword (get_tweets_page on _id);
+      the sentiment one also serves get_tweets_by_sentiment
+    - keyword + timestamp: get_tweets_by_keyword, newest first
+    - timestamp: get_recent_tweets
+    - tweet_summary keyword + hour (unique): one summary document per bucket
+    - scrape_state keyword (unique): one cursor document per keyword
+    
+    Existing documents are migrated first so the unique index can be built,
+    given a `tokens` array (once per database, recorded in tweet_meta), and summarized if the summary collection is
+    still empty. Called before the first write and before the first summary
+    read (get_summary, get_data_version), so a database filled by an older
+    version shows its counts without waiting for a write.
+    """
+    global _indexes_ready
+    with _indexes_lock:
+        if _indexes_ready:
+            return
+        migrate_tweet_keys()
+        # Every write stores tokens, so older documents need the (unindexed) scan only once per database
+        migrations = meta_collection.find_one({"_id": "migrations"}) or {}
+        if not migrations.get("tweet_tokens"):
+            migrate_tweet_tokens()
+            meta_collection.update_one({"_id": "migrations"}, {"$set": {"tweet_tokens": True}}, upsert=True)
+        collection.create_index([("tweet_key", ASCENDING)], unique=True, name="tweet_key_unique")
+        collection.create_index([("sentiment", ASCENDING), ("_id", ASCENDING)], name="sentiment_id")
+        collection.create_index([("keyword", ASCENDING), ("_id", ASCENDING)], name="keyword_id")
+        collection.create_index([("keyword", ASCENDING), ("sentiment", ASCENDING), ("_id", ASCENDING)],
+                                name="keyword_sentiment_id")
+        collection.create_index([("keyword", ASCENDING), ("timestamp", DESCENDING)], name="keyword_timestamp")
+        collection.create_index([("timestamp", DESCENDING)], name="timestamp")
+        summary_collection.create_index([("keyword", ASCENDING), ("hour", ASCENDING)],
+                                        unique=True, name="keyword_hour_unique")
+        state_collection.create_index([("keyword", ASCENDING)], unique=True, name="keyword_unique")
+        # Tweets stored before the summary existed are summarized once
+        if summary_collection.estimated_document_count() == 0 and collection.estimated_document_count() > 0:
+            rebuild_summary()
+        _indexes_ready = True
+
+# Sentiment labels every stats dictionary reports, even when their count is 0
+SENTIMENTS = ("positive", "neutral", "negative")
+
+# Time bucket -> length of the "YYYY-MM-DD HH:MM:SS" timestamp prefix that identifies it
+TIME_BUCKETS = {
+    "minute": 16,  # "2024-05-01 14:03"
+    "hour": 13,    # "2024-05-01 14"
+    "day": 10,     # "2024-05-01"
+    "month": 7     # "2024-05"
+}
+
+def _empty_counts():
+    counts = {"total": 0}
+    counts.update({sentiment: 0 for sentiment in SENTIMENTS})
+    return counts
+
+def _add_count(counts, sentiment, count):
+    # Other labels (e.g. a missing sentiment) only add to the total
+    counts["total"] += count
+    if sentiment in counts:
+        counts[sentiment] += count
+
+# ---------------------------------------------------------------------------
+# Sentiment summary
+#
+# One document per (keyword, hour) holding the tweet count per sentiment and
+# hashtag / word frequency tables per sentiment:
+#
+#   {"keyword": "iphone", "hour": "2024-05-01 14",
+#    "total": 12,
+#    "sentiments": {"positive": 7, "neutral": 3, "negative": 2},
+#    "hashtags": {"positive": {"#apple": 4}, "negative": {"#fail": 1}},
+#    "words": {"positive": {"love": 3, "camera": 2}, ...},
+#    "revision": 5}
+#
+# Writes apply $inc deltas: a new tweet adds its contribution, an updated
+# tweet first subtracts what its previous version contributed (so a changed
+# sentiment or a new scrape hour moves the counts instead of double counting).
+# Counts that drop to 0 are left in place; readers skip them. Every write
+# also bumps the bucket's revision, which get_data_version() sums into a cheap
+# "has anything changed" fingerprint.
+# ---------------------------------------------------------------------------
+
+# Label used for tweets stored without a sentiment
+UNKNOWN_SENTIMENT = "unknown"
+
+# Fields of a stored tweet that its summary contribution depends on
+SUMMARY_FIELDS = {"keyword": 1, "timestamp": 1, "sentiment": 1, "hashtags": 1, "tokens": 1, "clean_text": 1, "tweet_key": 1}
+
+def _summary_contribution(tweet):
+    """
+    Return ((keyword, hour), {field path: count}) for one tweet document.
+    """
+    sentiment = tweet.get("sentiment") or UNKNOWN_SENTIMENT
+    bucket = (tweet.get("keyword"), (tweet.get("timestamp") or "")[:TIME_BUCKETS["hour"]])
+    counts = Counter({"total": 1, f"sentiments.{sentiment}": 1})
+    for hashtag in tweet.get("hashtags") or []:
+        counts[f"hashtags.{sentiment}.{hashtag}"] += 1
+    tokens = tweet["tokens"] if "tokens" in tweet else extract_words(tweet.get("clean_text"))
+    for word in tokens:
+        counts[f"words.{sentiment}.{word}"] += 1
+    return bucket, counts
+
+def _summary_delta(changes):
+    """
+    Sum contributions for a list of (old document or None, new document) pairs.
+    
+    Returns:
+        dict: {(keyword, hour): {field path: non-zero increment}}
+    """
+    deltas = {}
+    for old, new in changes:
+        if old is not None:
+            bucket, counts = _summary_contribution(old)
+            deltas.setdefault(bucket, Counter()).subtract(counts)
+        if new is not None:
+            bucket, counts = _summary_contribution(new)
+            deltas.setdefault(bucket, Counter()).update(counts)
+    return {
+        bucket: {path: value for path, value in counts.items() if value}
+        for bucket, counts in deltas.items()
+    }
+
+def _apply_summary_delta(changes):
+    """Apply the summary increments for (old, new) document pairs in one bulk_write."""
+    operations = [
+        UpdateOne({"keyword": keyword, "hour": hour}, {"$inc": dict(increments, revision=1)}, upsert=True)
+        for (keyword, hour), increments in _summary_delta(changes).items()
+        if increments
+    ]
+    if operations:
+        summary_collection.bulk_write(operations, ordered=False)
+
+def _bump_summary_epoch():
+    """Count one more deletion of summary buckets; the epoch only ever goes up."""
+    meta_collection.update_one({"_id": "summary"}, {"$inc": {"epoch": 1}}, upsert=True)
+
+def rebuild_summary(batch_size=1000):
+    """
+    Recompute the whole summary collection from the tweets collection.
+    
+    Only needed for tweets stored before the summary existed, or to repair
+    drift (e.g. after editing tweets outside this module).
+    
+    Args:
+        batch_size (int): Number of summary documents per bulk_write call
+        
+    Returns:
+        int: Number of (keyword, hour) buckets written
+    """
+    changes = ((None, doc) for doc in collection.find({}, SUMMARY_FIELDS))
+    deltas = _summary_delta(changes)
+    # Bumped before and after, so no half-rebuilt state can match a later data version
+    _bump_summary_epoch()
+    summary_collection.delete_many({})
+    operations = [
+        UpdateOne({"keyword": keyword, "hour": hour}, {"$inc": dict(increments, revision=1)}, upsert=True)
+        for (keyword, hour), increments in deltas.items()
+    ]
+    for start in range(0, len(operations), batch_size):
+        summary_collection.bulk_write(operations[start:start + batch_size], ordered=False)
+    _bump_summary_epoch()
+    return len(operations)
+
+def get_summary(keyword=None, since=None, until=None):
+    """
+    Read sentiment counts and hashtag / word frequencies from the summary.
+    
+    Cost grows with the number of (keyword, hour) buckets read, not with the
+    number of tweets stored.
+    
+    Args:
+        keyword (str): Only include this keyword (default: all)
+        since (str): Only include hours >= this "YYYY-MM-DD HH" prefix
+        until (str): Only include hours < this prefix
+        
+    Returns:
+        dict: Merged counts over the selected buckets
+        
+    Example return value:
+        {
+            "totals": {"total": 150, "positive": 65, "neutral": 42, "negative": 43},
+            "by_hour": {"2024-05-01 14": {"total": 100, "positive": 50, ...}, ...},
+            "hashtags": Counter({"#apple": 12, ...}),
+            "hashtags_by_sentiment": {"positive": Counter({"#apple": 9}), ...},
+            "words": Counter({"camera": 20, ...}),
+            "words_by_sentiment": {"positive": Counter({"love": 11}), ...}
+        }
+    """
+    # Tweets stored before the summary existed are summarized on first use, reads included
+    ensure_indexes()
+    query = {}
+    if keyword is not None:
+        query["keyword"] = keyword
+    if since is not None or until is not None:
+        query["hour"] = {}
+        if since is not None:
+            query["hour"]["$gte"] = since
+        if until is not None:
+            query["hour"]["$lt"] = until
+    
+    totals = _empty_counts()
+    by_hour = {}
+    tables = {"hashtags": {}, "words": {}}
+    for doc in summary_collection.find(query, {"_id": 0}):
+        hour_counts = by_hour.setdefault(doc["hour"], _empty_counts())
+        for sentiment, count in doc.get("sentiments", {}).items():
+            if count > 0:
+                _add_count(totals, sentiment, count)
+                _add_count(hour_counts, sentiment, count)
+        for table, by_sentiment in tables.items():
+            for sentiment, counts in doc.get(table, {}).items():
+                merged = by_sentiment.setdefault(sentiment, Counter())
+                for item, count in counts.items():
+                    if count > 0:
+                        merged[item] += count
+    
+    result = {"totals": totals, "by_hour": dict(sorted(by_hour.items()))}
+    for table, by_sentiment in tables.items():
+        by_sentiment = {sentiment: counts for sentiment, counts in by_sentiment.items() if counts}
+        result[table] = sum(by_sentiment.values(), Counter())
+        result[f"{table}_by_sentiment"] = by_sentiment
+    return result
+
+def get_data_version(keyword=None):
+    """
+    Return a cheap fingerprint of the stored data, read from the summary only.
+    
+    Any write that changes a count bumps a summary revision, so equal
+    versions mean the counts have not changed. Revisions restart when the
+    summary is deleted (clear_tweets, rebuild_summary), so those bump a
+    global epoch that is part of the version too. Used to skip re-rendering
+    reports over unchanged data.
+    
+    Args:
+        keyword (str): Only consider this keyword (default: all)
+        
+    Returns:
+        dict: {"epoch": n, "buckets": n, "revisions": n, "total": n}
+    """
+    ensure_indexes()  # The summary must be built before its version means anything
+    meta = meta_collection.find_one({"_id": "summary"}) or {}
+    version = {"epoch": meta.get("epoch", 0), "buckets": 0, "revisions": 0, "total": 0}
+    query = {} if keyword is None else {"keyword": keyword}
+    pipeline = [
+        {"$match": query},
+        {"$group": {
+            "_id": None,
+            "buckets": {"$sum": 1},
+            "revisions": {"$sum": "$revision"},
+            "total": {"$sum": "$total"}
+        }}
+    ]
+    for doc in summary_collection.aggregate(pipeline):
+        version.update(buckets=doc["buckets"], revisions=doc["revisions"], total=doc["total"])
+    return version
+
 def insert_tweet(tweet):
     """
     Insert a new tweet document into the MongoDB collection.
@@ -39,7 +422,7 @@ def insert_or_update_tweet(tweet):
     This is the PREFERRED method as it prevents duplicate tweets.
     
     How it works:
-    1. Search for existing tweet with the same clean_text
+    1. Search for existing tweet with the same tweet_key (see make_tweet_key)
     2. If found: update the existing document with new data
     3. If not found: insert as a new document
     
@@ -49,21 +432,331 @@ def insert_or_update_tweet(tweet):
     Returns:
         ObjectId or str: New document ID if inserted, "updated" if existing document was modified
     """
-    # Use MongoDB's update_one method with upsert=True for smart insert/update
-    result = collection.update_one(
-        {"clean_text": tweet["clean_text"]},  # Search condition: find tweet with matching clean_text
-        {"$set": tweet},                      # Update operation: replace/set all fields with new tweet data
-        upsert=True                          # If no matching document found, insert as new document
+    ensure_indexes()
+    _prepare_for_write(tweet)
+    
+    new_id = ObjectId()
+    
+    # Upsert and get the previous version back in the same atomic operation,
+    # so the summary can subtract exactly what that version contributed
+    previous = collection.find_one_and_update(
+        {"tweet_key": tweet["tweet_key"]},    # Search condition: indexed lookup by tweet identity
+        {"$set": tweet,                       # Update operation: replace/set all fields with new tweet data
+         "$setOnInsert": {"_id": new_id}},    # Known up front, since the "before" image of an insert is None
+        projection=SUMMARY_FIELDS,
+        upsert=True,                          # If no matching document found, insert as new document
+        return_document=ReturnDocument.BEFORE
     )
+    _apply_summary_delta([(previous, {**(previous or {}), **tweet})])
     
     # Check if a new document was created (upserted) or existing one was updated
-    if result.upserted_id:
+    if previous is None:
         # New document was inserted
-        return result.upserted_id
+        return new_id
     else:
         # Existing document was updated
         return "updated"
 
+def bulk_upsert_tweets(tweets, batch_size=500):
+    """
+    Insert or update many tweets with as few database round trips as possible.
+    
+    Same matching rule as insert_or_update_tweet (same tweet_key = same tweet),
+    but the operations are sent batch_size at a time through bulk_write as
+    unordered UpdateOne upserts, so one round trip covers a whole batch and a
+    failing document does not stop the others.
+    
+    The summary collection is updated from the previous versions of the batch,
+    read with one $in query before the write. A concurrent writer changing the
+    same tweet in between can make the summary drift; rebuild_summary() fixes it.
+    
+    Args:
+        tweets (list): Tweet dictionaries with all fields
+        batch_size (int): Maximum number of operations per bulk_write call
+        
+    Returns:
+        dict: Counts of what happened, e.g. {"inserted": 12, "updated": 3, "errors": 0},
+        plus "failed_keys": the tweet_key of every tweet that was not written, and
+        "updated_keys": those of written tweets that were already stored
+    """
+    ensure_indexes()
+    
+    # Within one call the last copy of a tweet wins; two upserts of the same
+    # new tweet would otherwise hit the unique index in the same batch
+    unique = {}
+    for tweet in tweets:
+        _prepare_for_write(tweet)
+        unique[tweet["tweet_key"]] = tweet
+    tweets = list(unique.values())
+    
+    counts = {"inserted": 0, "updated": 0, "errors": 0, "failed_keys": [], "updated_keys": []}
+    for start in range(0, len(tweets), batch_size):
+        batch = tweets[start:start + batch_size]
+        previous = {
+            doc["tweet_key"]: doc
+            for doc in collection.find({"tweet_key": {"$in": [t["tweet_key"] for t in batch]}}, SUMMARY_FIELDS)
+        }
+        operations = [
+            UpdateOne({"tweet_key": tweet["tweet_key"]}, {"$set": tweet}, upsert=True)
+            for tweet in batch
+        ]
+        failed = set()
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+            counts["inserted"] += result.upserted_count
+            counts["updated"] += result.matched_count
+        except BulkWriteError as e:
+            # Unordered writes keep going past failures; count what did succeed
+            details = e.details
+            counts["inserted"] += details.get("nUpserted", 0)
+            counts["updated"] += details.get("nMatched", 0)
+            counts["errors"] += len(details.get("writeErrors", []))
+            failed = {error["index"] for error in details.get("writeErrors", [])}
+            counts["failed_keys"].extend(batch[index]["tweet_key"] for index in sorted(failed))
+            print(f"[!] Bulk upsert: {len(details.get('writeErrors', []))} write error(s)")
+        
+        counts["updated_keys"].extend(
+            tweet["tweet_key"] for index, tweet in enumerate(batch)
+            if index not in failed and tweet["tweet_key"] in previous
+        )
+        
+        # Only tweets that were actually written change the summary
+        _apply_summary_delta([
+            (previous.get(tweet["tweet_key"]), {**previous.get(tweet["tweet_key"], {}), **tweet})
+            for index, tweet in enumerate(batch)
+            if index not in failed
+        ])
+    return counts
+
+class WriteBufferFull(Exception):
+    """Raised by BufferedTweetWriter.add while failed writes keep the buffer at its limit."""
+
+class BufferedTweetWriter:
+    """
+    Collects tweets and writes them with bulk_upsert_tweets in batches.
+    
+    A batch is flushed as soon as it holds max_size tweets, or once the oldest
+    buffered tweet has waited max_delay seconds, whichever comes first. Call
+    close() (or use it as a context manager) to flush whatever is left.
+    
+    After a failed write, automatic flushes pause for max_delay, and at most
+    max_buffered tweets are kept for the retry; add() raises WriteBufferFull
+    beyond that instead of growing without bound.
+    
+    Example:
+        with BufferedTweetWriter(max_size=100, max_delay=2.0) as writer:
+            for tweet in tweets:
+                writer.add(tweet)
+    """
+    
+    def __init__(self, max_size=100, max_delay=2.0, write_batch=bulk_upsert_tweets,
+                 on_flush=None, background=False, max_buffered=None):
+        """
+        Args:
+            max_size (int): Flush when this many tweets are buffered
+            max_delay (float): Flush when the oldest buffered tweet is this many seconds old
+                (also the pause before retrying a failed write)
+            write_batch (callable): Function that persists a list of tweets
+            on_flush (callable): Called as on_flush(tweets, result, seconds) after each write
+            background (bool): Start a timer thread so time-based flushes happen
+                even when add() is not being called
+            max_buffered (int): Most tweets held while writes fail (default: 10 * max_size)
+        """
+        self.max_size = max(1, max_size)
+        self.max_buffered = max(self.max_size, max_buffered or 10 * self.max_size)
+        self.max_delay = max_delay
+        self.write_batch = write_batch
+        self.on_flush = on_flush
+        self._buffer = []
+        self._oldest = None  # time.monotonic() of the first tweet in the buffer
+        self._retry_at = None  # After a failed write: no automatic flush before this time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer = None
+        if background:
+            self._timer = threading.Thread(target=self._run_timer, daemon=True)
+            self._timer.start()
+    
+    def add(self, tweet):
+        """
+        Buffer one tweet, flushing if the buffer is full or overdue.
+        
+        Raises:
+            WriteBufferFull: max_buffered tweets are already waiting for a failed write
+        """
+        with self._lock:
+            if len(self._buffer) >= self.max_buffered:
+                raise WriteBufferFull(f"{len(self._buffer)} tweets are waiting for a failed write")
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append(tweet)
+            full = len(self._buffer) >= self.max_size and not self._backing_off()
+        if full:
+            self.flush()
+        else:
+            self.flush_if_due()
+    
+    def _backing_off(self):
+        # Caller holds the lock
+        return self._retry_at is not None and time.monotonic() < self._retry_at
+    
+    def seconds_until_due(self):
+        """Seconds until the buffer must be flushed by time, or None if it is empty."""
+        with self._lock:
+            if not self._buffer:
+                return None
+            due = self._oldest + self.max_delay
+            if self._retry_at is not None:
+                due = max(due, self._retry_at)
+            return max(0.0, due - time.monotonic())
+    
+    def flush_if_due(self):
+        """Flush if the oldest buffered tweet has waited max_delay seconds."""
+        remaining = self.seconds_until_due()
+        if remaining is not None and remaining <= 0:
+            self.flush()
+    
+    def flush(self):
+        """
+        Write everything that is buffered right now.
+        
+        If the write raises, the tweets go back to the front of the buffer and
+        the error propagates; automatic flushes retry them after max_delay.
+        An explicit flush() (or close()) always tries right away.
+        
+        Returns:
+            dict or None: The write_batch result, or None if there was nothing to write
+        """
+        with self._lock:
+            tweets, self._buffer = self._buffer, []
+            oldest, self._oldest = self._oldest, None
+        if not tweets:
+            return None
+        start = time.monotonic()
+        try:
+            result = self.write_batch(tweets)
+        except Exception:
+            with self._lock:
+                self._buffer[:0] = tweets
+                self._oldest = oldest
+                self._retry_at = time.monotonic() + self.max_delay
+            raise
+        with self._lock:
+            self._retry_at = None
+        if self.on_flush:
+            self.on_flush(tweets, result, time.monotonic() - start)
+        return result
+    
+    def _run_timer(self):
+        while not self._closed.wait(min(self.max_delay, 1.0) / 2):
+            try:
+                self.flush_if_due()
+            except Exception as e:
+                print(f"[!] Background flush failed: {e}")
+    
+    def pending(self):
+        """Return a copy of the tweets still waiting to be written."""
+        with self._lock:
+            return list(self._buffer)
+    
+    def close(self):
+        """Stop the timer thread (if any) and flush the remaining tweets (see flush() for failures)."""
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        return self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# ---------------------------------------------------------------------------
+# Scrape cursors
+#
+# One document per keyword with the newest tweet stored for it so far:
+#
+#   {"keyword": "iphone", "last_tweet_id": 1790000000000000000,
+#    "last_posted_at": "2024-05-01 14:03:12", "updated_at": "2024-05-01 14:05:40"}
+#
+# The live search lists newest tweets first, so an incremental scrape can stop
+# scrolling at the first tweet at or below these marks. Marks only move up
+# ($max); status IDs are stored as 64-bit integers so they compare numerically.
+# ---------------------------------------------------------------------------
+
+def get_scrape_cursor(keyword):
+    """
+    Return the high-water marks stored for a keyword.
+    
+    Args:
+        keyword (str): Search keyword
+        
+    Returns:
+        dict or None: {"last_tweet_id": int or None, "last_posted_at": str or None},
+        or None if the keyword was never scraped
+    """
+    doc = state_collection.find_one({"keyword": keyword}, {"_id": 0, "last_tweet_id": 1, "last_posted_at": 1})
+    if doc is None:
+        return None
+    return {"last_tweet_id": doc.get("last_tweet_id"), "last_posted_at": doc.get("last_posted_at")}
+
+def _scraped_before(tweet, other):
+    # Whether `tweet` is known to be older than `other`: by status ID when both have one, else by posting time
+    if tweet.get("tweet_id") and other.get("tweet_id"):
+        return int(tweet["tweet_id"]) < int(other["tweet_id"])
+    if tweet.get("posted_at") and other.get("posted_at"):
+        return tweet["posted_at"] < other["posted_at"]
+    return False
+
+def advance_scrape_cursor(keyword, tweets, failed=()):
+    """
+    Raise a keyword's high-water marks to the newest of the given stored tweets.
+    
+    Never lowers them, so calls may come in any order. Tweets of the same
+    scrape that could not be written hold the marks below them: only stored
+    tweets provably older than every failed one (by status ID, else posting
+    time) count, for both marks, so the next incremental scrape reaches the
+    failed tweets again (the newer ones are re-upserted).
+    
+    Args:
+        keyword (str): Search keyword
+        tweets (iterable): Stored tweet dicts (tweet_id and/or posted_at are used)
+        failed (iterable): Tweet dicts of the same scrape that were not written
+        
+    Returns:
+        dict or None: The marks written, or None if no tweet carried an ID or posting time
+    """
+    # Tweets with neither field are never recognised as known, so they need no cap
+    failed = [tweet for tweet in failed if tweet.get("tweet_id") or tweet.get("posted_at")]
+    
+    newest = {}
+    for tweet in tweets:
+        if not all(_scraped_before(tweet, other) for other in failed):
+            continue
+        if tweet.get("tweet_id"):
+            newest["last_tweet_id"] = max(newest.get("last_tweet_id", 0), int(tweet["tweet_id"]))
+        if tweet.get("posted_at"):
+            newest["last_posted_at"] = max(newest.get("last_posted_at", ""), tweet["posted_at"])
+    if not newest:
+        return None
+    marks = dict(newest)
+    if "last_tweet_id" in marks:
+        marks["last_tweet_id"] = Int64(marks["last_tweet_id"])
+    ensure_indexes()
+    state_collection.update_one(
+        {"keyword": keyword},
+        {"$max": marks, "$set": {"updated_at": time.strftime('%Y-%m-%d %H:%M:%S')}},
+        upsert=True
+    )
+    return newest
+
+def reset_scrape_cursor(keyword=None):
+    """
+    Forget the high-water marks of one keyword (default: all), so the next scrape starts from the top.
+    """
+    state_collection.delete_many({} if keyword is None else {"keyword": keyword})
+
 def clear_tweets():
     """
     Delete ALL tweet documents from the collection.
@@ -76,6 +769,11 @@ def clear_tweets():
     """
     # Delete all documents in the collection (empty filter {} matches all documents)
     collection.delete_many({})
+    _bump_summary_epoch()
+    summary_collection.delete_many({})
+    _bump_summary_epoch()
+    # Without the tweets, the cursors would make the next scrape skip everything
+    state_collection.delete_many({})
     print("All tweets have been deleted from the database.")
 
 def get_all_tweets():
@@ -83,7 +781,8 @@ def get_all_tweets():
     Retrieve all tweet documents from the database.
     
     This function returns every tweet that has been stored in the collection.
-    Be careful with large datasets as this loads everything into memory.
+    Be careful with large datasets as this loads everything into memory;
+    stream_all_tweets() iterates with flat memory instead.
     
     Returns:
         list: List of dictionaries, each representing a tweet document
@@ -91,6 +790,134 @@ def get_all_tweets():
     # Find all documents (empty filter {}) and convert cursor to list
     return list(collection.find({}))
 
+# Documents fetched per round trip by the streaming reads below
+DEFAULT_READ_BATCH_SIZE = 1000
+
+def _projection(fields):
+    # None = whole documents; otherwise only the named fields (no _id unless asked for)
+    if fields is None:
+        return None
+    projection = {field: 1 for field in fields}
+    projection.setdefault("_id", 0)
+    return projection
+
+def stream_tweets(query=None, fields=None, batch_size=DEFAULT_READ_BATCH_SIZE, sort=None, limit=0):
+    """
+    Iterate over matching tweets without loading them all into memory.
+    
+    The cursor fetches batch_size documents per round trip, and the
+    projection keeps only the fields the caller needs, so memory use stays
+    flat however many tweets are stored.
+    
+    Args:
+        query (dict): MongoDB filter (default: all tweets)
+        fields (list): Field names to return, e.g. ["clean_text", "sentiment"] (default: all)
+        batch_size (int): Documents per round trip
+        sort (list): (field, direction) pairs, e.g. [("timestamp", DESCENDING)]
+        limit (int): Maximum number of documents (0 = no limit)
+        
+    Yields:
+        dict: One tweet document (or its projected fields) at a time
+        
+    Example:
+        for tweet in stream_tweets({"keyword": "iphone"}, fields=["hashtags"]):
+            counts.update(tweet.get("hashtags", []))
+    """
+    cursor = collection.find(query or {}, _projection(fields), batch_size=batch_size, limit=limit)
+    if sort:
+        cursor = cursor.sort(sort)
+    try:
+        yield from cursor
+    finally:
+        # Free the server-side cursor if the caller stops early
+        cursor.close()
+
+def stream_all_tweets(fields=None, batch_size=DEFAULT_READ_BATCH_SIZE):
+    """Streaming version of get_all_tweets(); see stream_tweets()."""
+    return stream_tweets({}, fields, batch_size)
+
+def stream_tweets_by_sentiment(sentiment, fields=None, batch_size=DEFAULT_READ_BATCH_SIZE, limit=0):
+    """Streaming version of get_tweets_by_sentiment(); see stream_tweets()."""
+    return stream_tweets({"sentiment": sentiment}, fields, batch_size, limit=limit)
+
+def stream_tweets_by_keyword(keyword, fields=None, batch_size=DEFAULT_READ_BATCH_SIZE):
+    """Streaming version of get_tweets_by_keyword(), newest first; see stream_tweets()."""
+    return stream_tweets({"keyword": keyword}, fields, batch_size,
+                         sort=[("timestamp", DESCENDING), ("_id", DESCENDING)])
+
+def get_tweets_page(query=None, fields=None, limit=100, after=None, order_by="_id", descending=False):
+    """
+    Fetch one page of tweets using keyset pagination.
+    
+    Instead of skip(), which re-reads every skipped document, each page
+    starts right after the last document of the previous one, so page 1000
+    costs the same as page 1. The sort is on _id alone or on timestamp with
+    _id as the tie-breaker, both served by indexes.
+    
+    Args:
+        query (dict): MongoDB filter (default: all tweets)
+        fields (list): Field names to return (default: all); _id and order_by are always included
+        limit (int): Page size
+        after: The `next` value returned with the previous page (None for the first page)
+        order_by (str): "_id" (insertion order) or "timestamp"
+        descending (bool): Newest first if True
+        
+    Returns:
+        tuple: (list of tweets, next) - pass `next` as `after` for the following
+        page; it is None when there are no more pages
+        
+    Example:
+        tweets, after = get_tweets_page(order_by="timestamp", descending=True)
+        while after is not None:
+            more, after = get_tweets_page(order_by="timestamp", descending=True, after=after)
+    """
+    if order_by not in ("_id", "timestamp"):
+        raise ValueError("order_by must be '_id' or 'timestamp'")
+    direction = DESCENDING if descending else ASCENDING
+    past = "$lt" if descending else "$gt"
+    
+    conditions = [query] if query else []
+    if after is not None:
+        if order_by == "_id":
+            conditions.append({"_id": {past: after}})
+        else:
+            timestamp, last_id = after
+            conditions.append({"$or": [
+                {"timestamp": {past: timestamp}},
+                {"timestamp": timestamp, "_id": {past: last_id}}
+            ]})
+    page_query = {"$and": conditions} if len(conditions) > 1 else (conditions[0] if conditions else {})
+    
+    sort = [("_id", direction)] if order_by == "_id" else [("timestamp", direction), ("_id", direction)]
+    projection = None
+    if fields is not None:
+        projection = {field: 1 for field in fields}
+        projection.update({"_id": 1, order_by: 1})
+    
+    tweets = list(collection.find(page_query, projection).sort(sort).limit(limit))
+    if len(tweets) < limit or not tweets:
+        return tweets, None
+    last = tweets[-1]
+    return tweets, last["_id"] if order_by == "_id" else (last.get("timestamp"), last["_id"])
+
+def iter_tweet_pages(query=None, fields=None, page_size=1000, order_by="_id", descending=False):
+    """
+    Yield successive pages from get_tweets_page() until the collection is exhausted.
+    
+    Unlike stream_tweets(), no server cursor stays open between pages, so a
+    slow consumer (e.g. a UI filling a list) never hits a cursor timeout.
+    
+    Yields:
+        list: Tweets of one page
+    """
+    after = None
+    while True:
+        tweets, after = get_tweets_page(query, fields, page_size, after, order_by, descending)
+        if tweets:
+            yield tweets
+        if after is None:
+            return
+
 def get_tweets_by_sentiment(sentiment):
     """
     Retrieve only tweets that match a specific sentiment classification.
@@ -110,7 +937,7 @@ def get_tweets_by_sentiment(sentiment):
     # Find documents where the sentiment field matches the specified value
     return list(collection.find({"sentiment": sentiment}))
 
-def get_tweet_stats():
+def get_tweet_stats(keyword=None):
     """
     Calculate and return statistics about the tweets stored in the database.
     
@@ -121,6 +948,11 @@ def get_tweet_stats():
     - Count of negative tweets
     
     Perfect for creating dashboards, reports, or monitoring data quality.
+    The counts are read from the tweet_summary buckets (see get_summary), the
+    same source as the app's counters and the reports.
+    
+    Args:
+        keyword (str): Only count tweets scraped for this keyword (default: all)
     
     Returns:
         dict: Dictionary containing count statistics for each sentiment category
@@ -133,21 +965,7 @@ def get_tweet_stats():
             "negative": 43
         }
     """
-    # Count total documents in the collection
-    total = collection.count_documents({})
-    
-    # Count documents for each sentiment category
-    positive = collection.count_documents({"sentiment": "positive"})
-    neutral = collection.count_documents({"sentiment": "neutral"})
-    negative = collection.count_documents({"sentiment": "negative"})
-    
-    # Return statistics as a structured dictionary
-    return {
-        "total": total,
-        "positive": positive,
-        "neutral": neutral,
-        "negative": negative
-    }
+    return get_summary(keyword)["totals"]
 
 def get_tweets_by_keyword(keyword):
     """
@@ -164,6 +982,15 @@ def get_tweets_by_keyword(keyword):
     # Find documents where the keyword field matches the specified value
     return list(collection.find({"keyword": keyword}))
 
+def get_keywords():
+    """
+    Return every keyword tweets have been scraped for.
+    
+    Returns:
+        list: Sorted distinct keywords (answered from the keyword_timestamp index)
+    """
+    return sorted(keyword for keyword in collection.distinct("keyword") if keyword is not None)
+
 def get_recent_tweets(limit=10):
     """
     Retrieve the most recently added tweets from the database.
@@ -0,0 +1,326 @@
+# Client-side rate limiting for Groq API calls
+# Keeps every caller in the process (sync and async clients, all threads)
+# under the provider's requests-per-minute and tokens-per-minute ceilings,
+# backs off on 429/5xx responses and stops calling a failing API altogether.
+#
+# Pieces:
+#   - TokenBucket:     reservation-based bucket usable from threads and asyncio
+#   - CircuitBreaker:  fails fast after repeated errors, probes again later
+#   - backoff_delay(): Retry-After-aware exponential backoff with full jitter
+#   - RateLimiter:     combines the above and records throttling metrics
+
+# Import required libraries
+import os
+import time
+import random
+import threading
+
+# Provider limits, overridable through environment variables
+REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+TOKENS_PER_MINUTE = float(os.getenv("GROQ_TOKENS_PER_MINUTE", "30000"))
+
+# Retry and circuit breaker settings
+MAX_ATTEMPTS = int(os.getenv("GROQ_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE = 0.5      # Seconds for the first retry
+BACKOFF_CAP = 60.0      # Never wait longer than this between attempts
+BREAKER_THRESHOLD = 5   # Consecutive failures before the circuit opens
+BREAKER_COOLDOWN = 30.0 # Seconds the circuit stays open before a probe is allowed
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+
+def estimate_tokens(prompt, max_tokens):
+    """
+    Rough token cost of a request, for the tokens-per-minute bucket.
+
+    Uses the common ~4 characters per token rule for the prompt plus the
+    reply budget. Over-estimating slightly is safer than hitting a 429.
+    """
+    return len(prompt) // 4 + max_tokens + 20  # +20 for the system prompt and message framing
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header value in seconds.
+
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing or not numeric
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None  # HTTP-date form is not used by Groq
+
+
+def backoff_delay(attempt, retry_after=None, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """
+    Delay before retry number `attempt` (0 for the first retry).
+
+    Exponential backoff with full jitter spreads concurrent callers out; a
+    server-provided Retry-After is always respected as the lower bound.
+
+    Returns:
+        float: Seconds to sleep
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at `rate_per_minute`.
+
+    reserve() never blocks: it deducts the tokens right away (the level may go
+    negative) and returns how long the caller must wait before using them. That
+    way threads can time.sleep() and coroutines can asyncio.sleep() on the same
+    bucket, and waiting callers are served in reservation order.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Args:
+            rate_per_minute (float): Sustained refill rate
+            capacity (float): Maximum burst size (default: one minute's worth)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount=1.0):
+        """
+        Take `amount` tokens and return the seconds to wait before using them.
+        """
+        # A single request larger than the whole bucket can still go through, eventually
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= amount
+            if self._level >= 0:
+                return 0.0
+            return -self._level / self.rate
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open circuit breaker.
+
+    After `threshold` consecutive failures the circuit opens and every call
+    fails fast for `cooldown` seconds. Then it goes half-open: calls are let
+    through, the first success closes it again and a failure re-opens it.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.open_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """'closed', 'open' or 'half-open'."""
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def check(self):
+        """Raise CircuitOpenError if calls are currently not allowed."""
+        with self._lock:
+            if self._state() == "open":
+                remaining = self.cooldown - (time.monotonic() - self.opened_at)
+                raise CircuitOpenError(f"Groq API circuit open, retry in {remaining:.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            # A failed half-open probe re-opens immediately
+            if self.failures >= self.threshold or self.opened_at is not None:
+                if self._state() != "open":
+                    self.open_count += 1
+                self.opened_at = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Shared client-side limiter for one API provider.
+
+    Typical use around a single HTTP call:
+
+        limiter.acquire(estimate_tokens(prompt, max_tokens))   # may sleep
+        response = send()
+        delay = limiter.on_response(response.status_code,
+                                    response.headers.get("Retry-After"), attempt)
+        if delay is None: done, else sleep(delay) and retry
+
+    Async callers use reserve() / await asyncio.sleep() instead of acquire().
+    """
+
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                 burst_seconds=60.0, breaker=None):
+        """
+        Args:
+            requests_per_minute (float): Sustained request ceiling
+            tokens_per_minute (float): Sustained token ceiling
+            burst_seconds (float): How many seconds' worth of budget may be spent at once
+            breaker (CircuitBreaker): Breaker to use (default: a new one)
+        """
+        burst = burst_seconds / 60.0
+        self.request_bucket = TokenBucket(requests_per_minute, capacity=max(1.0, requests_per_minute * burst))
+        self.token_bucket = TokenBucket(tokens_per_minute, capacity=tokens_per_minute * burst)
+        self.breaker = breaker or CircuitBreaker()
+
+        # Global pause set by Retry-After, so one 429 slows down every caller
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics exposed through stats()
+        self.requests = 0
+        self.throttled_seconds = 0.0   # Caller time spent waiting on buckets, pauses and backoff (summed over callers)
+        self.rate_limited = 0          # 429 responses received
+        self.server_errors = 0         # 5xx responses and connection failures
+        self.retries = 0
+
+    def reserve(self, tokens):
+        """
+        Reserve capacity for one request and return the seconds to wait first.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        self.breaker.check()
+        wait = max(self.request_bucket.reserve(1), self.token_bucket.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._paused_until - time.monotonic())
+            self.requests += 1
+            if wait > 0:
+                self.throttled_seconds += wait
+        return max(0.0, wait)
+
+    def acquire(self, tokens):
+        """Blocking version of reserve() for threaded callers."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_response(self, status, retry_after=None, attempt=0):
+        """
+        Record the outcome of a request.
+
+        Args:
+            status (int): HTTP status code
+            retry_after (str): Value of the Retry-After header, if any
+            attempt (int): Zero-based attempt number of this request
+
+        Returns:
+            float or None: Seconds to wait before retrying, or None if the
+            response should not be retried (success or a non-retryable error).
+            On the last attempt (MAX_ATTEMPTS - 1) the delay is not counted as
+            a retry, since the caller gives up instead.
+        """
+        if status not in RETRYABLE_STATUSES:
+            # 4xx other than 429 means our request is wrong, not that the API is unhealthy
+            self.breaker.record_success()
+            return None
+
+        retry_after = parse_retry_after(retry_after)
+        with self._lock:
+            if status == 429:
+                self.rate_limited += 1
+                if retry_after:
+                    # Everybody waits, not just the caller that got the 429
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            else:
+                self.server_errors += 1
+        self.breaker.record_failure()
+        return self._retry(attempt, retry_after)
+
+    def on_error(self, attempt=0):
+        """
+        Record a connection error or timeout.
+
+        Returns:
+            float: Seconds to wait before retrying
+        """
+        with self._lock:
+            self.server_errors += 1
+        self.breaker.record_failure()
+        return self._retry(attempt)
+
+    def _retry(self, attempt, retry_after=None):
+        delay = backoff_delay(attempt, retry_after)
+        # After the last attempt callers raise instead of waiting: no retry happens
+        if attempt < MAX_ATTEMPTS - 1:
+            with self._lock:
+                self.retries += 1
+                self.throttled_seconds += delay
+        return delay
+
+    def stats(self):
+        """
+        Return throttling metrics.
+
+        Example return value:
+            {
+                "requests": 120,
+                "throttled_seconds": 14.2,
+                "rate_limited": 1,
+                "server_errors": 0,
+                "retries": 1,
+                "circuit_state": "closed",
+                "circuit_opens": 0
+            }
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "rate_limited": self.rate_limited,
+                "server_errors": self.server_errors,
+                "retries": self.retries,
+                "circuit_state": self.breaker.state,
+                "circuit_opens": self.breaker.open_count
+            }
+
+
+# Shared process-wide limiter, created on first use
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    Return the process-wide RateLimiter for Groq, creating it on first call.
+
+    Returns:
+        RateLimiter: The shared limiter instance
+    """
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
@@ -0,0 +1,186 @@
+# Headless analytics reports for Twitter Sentiment Analysis Project
+# Produces the same analytics and charts as the GUI (sentiment distribution,
+# top words, hashtags by sentiment) without Tk or a display: charts are
+# rendered with Matplotlib's Agg backend to PNG/SVG, the numbers behind them
+# are written to report.json.
+#
+# Counts come from the pre-aggregated summary collection, so a report costs
+# about the same over a million tweets as over a thousand. Each output
+# directory keeps a manifest with the data-version fingerprint it was
+# rendered for; when the data has not changed since, nothing is re-rendered.
+#
+# Usage:
+#   python report.py                               # All keywords, PNG + JSON into ./reports
+#   python report.py --keyword iphone --format svg --format json --output-dir reports/iphone
+
+# Import required libraries
+import os
+import json
+import time
+import hashlib
+import argparse
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from analytics_model import AnalyticsModel
+from charts import create_charts, update_charts, select_hashtags
+from mongodb_handler import get_data_version
+
+# Report configuration, overridable through environment variables
+REPORT_DIR = os.getenv("REPORT_DIR", "reports")
+REPORT_FORMATS = tuple(os.getenv("REPORT_FORMATS", "png,json").split(","))
+
+# Formats generate_report() understands
+SUPPORTED_FORMATS = ("png", "svg", "json")
+
+# Bump when the report layout changes, so cached outputs are rendered again
+REPORT_SCHEMA = 1
+
+MANIFEST_NAME = "manifest.json"
+
+
+def build_report_data(analytics):
+    """
+    Collect the numbers shown by the report from an AnalyticsModel.
+
+    Args:
+        analytics (AnalyticsModel): Loaded model
+
+    Returns:
+        dict: JSON-serializable report data
+
+    Example return value:
+        {
+            "totals": {"total": 150, "positive": 65, "neutral": 42, "negative": 43},
+            "top_words": [["camera", 20], ...],
+            "top_hashtags": [["#apple", 12], ...],
+            "hashtags_by_sentiment": {"hashtags": ["#apple", ...],
+                                      "counts": {"positive": {"#apple": 9}, ...}}
+        }
+    """
+    hashtags = select_hashtags(analytics.top_hashtags_by_sentiment(5))
+    return {
+        "totals": analytics.sentiment_counts(),
+        "top_words": analytics.top_words(15),
+        "top_hashtags": analytics.top_hashtags(10),
+        "hashtags_by_sentiment": {
+            "hashtags": hashtags,
+            "counts": analytics.hashtag_counts_by_sentiment(hashtags)
+        }
+    }
+
+
+def data_fingerprint(keyword=None, formats=REPORT_FORMATS):
+    """
+    Fingerprint of everything a report depends on: data version, keyword, formats, layout.
+
+    Args:
+        keyword (str): Report keyword (None: all keywords)
+        formats (iterable): Output formats
+
+    Returns:
+        str: Hex digest; equal digests mean the cached outputs are still valid
+    """
+    source = {
+        "data": get_data_version(keyword),
+        "keyword": keyword,
+        "formats": sorted(formats),
+        "schema": REPORT_SCHEMA
+    }
+    return hashlib.sha1(json.dumps(source, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _read_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    # Write to a temporary file first so readers never see a half-written file
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def generate_report(keyword=None, output_dir=REPORT_DIR, formats=REPORT_FORMATS, force=False):
+    """
+    Write the report files, unless the ones already in output_dir are current.
+
+    Args:
+        keyword (str): Only report on this keyword (default: all)
+        output_dir (str): Directory for the chart images, report.json and manifest
+        formats (iterable): Any of "png", "svg", "json"
+        force (bool): Render even if the fingerprint is unchanged
+
+    Returns:
+        dict: {"cached": bool, "fingerprint": str, "files": [paths]}
+
+    Example:
+        result = generate_report(keyword="iphone", output_dir="reports/iphone", formats=("svg", "json"))
+        if not result["cached"]:
+            print("Rendered", result["files"])
+    """
+    formats = [fmt.strip().lower() for fmt in formats if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in SUPPORTED_FORMATS]
+    if unknown:
+        raise ValueError(f"Unsupported report format(s): {', '.join(unknown)}")
+
+    # Taken before loading: if data changes while we render, the next run sees a new fingerprint
+    fingerprint = data_fingerprint(keyword, formats)
+    manifest = _read_manifest(output_dir)
+    if (not force and manifest and manifest.get("fingerprint") == fingerprint
+            and all(os.path.exists(path) for path in manifest.get("files", []))):
+        return {"cached": True, "fingerprint": fingerprint, "files": manifest["files"]}
+
+    os.makedirs(output_dir, exist_ok=True)
+    analytics = AnalyticsModel(examples_per_sentiment=0)
+    analytics.load(keyword=keyword)
+
+    files = []
+    image_formats = [fmt for fmt in formats if fmt != "json"]
+    if image_formats:
+        charts = create_charts()
+        update_charts(charts, analytics)
+        for name, chart in charts.items():
+            FigureCanvasAgg(chart.figure)  # Attach the Agg canvas; no GUI backend involved
+            for fmt in image_formats:
+                path = os.path.join(output_dir, f"{name}.{fmt}")
+                chart.figure.savefig(path, format=fmt)
+                files.append(path)
+
+    if "json" in formats:
+        path = os.path.join(output_dir, "report.json")
+        data = build_report_data(analytics)
+        data.update({"keyword": keyword, "fingerprint": fingerprint,
+                     "generated_at": time.strftime("%Y-%m-%d %H:%M:%S")})
+        _write_json(path, data)
+        files.append(path)
+
+    # Written last: an interrupted run leaves the old manifest, so the next run renders again
+    _write_json(os.path.join(output_dir, MANIFEST_NAME), {"fingerprint": fingerprint, "files": files})
+    return {"cached": False, "fingerprint": fingerprint, "files": files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render sentiment analytics reports without a display")
+    parser.add_argument("--keyword", help="Only report on this keyword (default: all)")
+    parser.add_argument("--output-dir", default=REPORT_DIR, help="Where to write the report files")
+    parser.add_argument("--format", action="append", choices=SUPPORTED_FORMATS, dest="formats",
+                        help="Output format, repeatable (default: %s)" % ",".join(REPORT_FORMATS))
+    parser.add_argument("--force", action="store_true", help="Render even if the data has not changed")
+    args = parser.parse_args()
+
+    result = generate_report(keyword=args.keyword, output_dir=args.output_dir,
+                             formats=args.formats or REPORT_FORMATS, force=args.force)
+    if result["cached"]:
+        print(f"Report is up to date ({result['fingerprint'][:12]}), nothing rendered.")
+    else:
+        print(f"Report rendered ({result['fingerprint'][:12]}):")
+    for path in result["files"]:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
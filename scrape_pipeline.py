@@ -0,0 +1,300 @@
+# Streaming pipeline between scraping, classification and storage
+# Instead of scrape-everything, then classify-everything, then save-everything,
+# the three stages run at the same time and hand tweets to each other through
+# bounded queues:
+#
+#   source (generator of extracted tweets)
+#       -> [classify queue] -> N classifier threads (batched backend calls)
+#       -> [write queue]    -> 1 writer thread (BufferedTweetWriter -> bulk upserts)
+#
+# Bounded queues give backpressure: if storage falls behind, classifiers block
+# on put(), and if classifiers fall behind, the source blocks. End-to-end time
+# approaches the slowest stage instead of the sum of all stages.
+
+# Import required libraries
+import time
+import queue
+import threading
+from mongodb_handler import BufferedTweetWriter, WriteBufferFull, bulk_upsert_tweets
+from sentiment_backends import classify_sentiment_batch
+
+# Marks the end of the stream on a queue
+_END = object()
+
+
+class StageStats:
+    """Thread-safe throughput counters for one pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0    # Time spent doing work (summed over the stage's threads)
+        self.blocked_seconds = 0.0 # Time spent waiting for a full downstream queue
+        self._lock = threading.Lock()
+
+    def record(self, items, busy, blocked=0.0):
+        with self._lock:
+            self.items += items
+            self.batches += 1
+            self.busy_seconds += busy
+            self.blocked_seconds += blocked
+
+    def as_dict(self, wall_seconds):
+        with self._lock:
+            return {
+                "items": self.items,
+                "batches": self.batches,
+                "busy_seconds": round(self.busy_seconds, 3),
+                "blocked_seconds": round(self.blocked_seconds, 3),
+                "items_per_second": round(self.items / wall_seconds, 2) if wall_seconds > 0 else 0.0
+            }
+
+
+class TweetPipeline:
+    """
+    Runs extraction, classification and storage as overlapping stages.
+
+    Example:
+        pipeline = TweetPipeline(classifier_workers=4)
+        tweets = pipeline.run(iter_extracted_tweets(...))
+        print(pipeline.stats())
+    """
+
+    def __init__(self, classify_batch=classify_sentiment_batch, write_batch=bulk_upsert_tweets,
+                 classifier_workers=2, classify_batch_size=20, write_batch_size=50,
+                 queue_size=100, max_batch_wait=0.5, on_tweet=None, on_failed=None, notify_updates=True):
+        """
+        Args:
+            classify_batch (callable): list of clean texts -> list of sentiment labels
+            write_batch (callable): list of tweet dicts -> result dict, persists them
+            classifier_workers (int): Number of classifier threads
+            classify_batch_size (int): Maximum tweets per classify_batch call
+            write_batch_size (int): Flush to the database once this many tweets are buffered
+            queue_size (int): Capacity of each queue between stages (backpressure bound)
+            max_batch_wait (float): Seconds a stage waits to fill a batch after its first item
+                (for the writer: the longest a tweet stays buffered before a flush)
+            on_tweet (callable): Called with each tweet dict once it has been stored
+            on_failed (callable): Called with each tweet dict that could not be stored
+                (a write error for that tweet, or a batch still failing when the run ends)
+            notify_updates (bool): Also call on_tweet for tweets that were already in the
+                database (write_batch reports them in "updated_keys"); turn off when
+                on_tweet counts tweets, or re-scraped ones would be counted twice
+        """
+        self.classify_batch = classify_batch
+        self.write_batch = write_batch
+        self.classifier_workers = max(1, classifier_workers)
+        self.classify_batch_size = max(1, classify_batch_size)
+        self.write_batch_size = max(1, write_batch_size)
+        self.queue_size = queue_size
+        self.max_batch_wait = max_batch_wait
+        self.on_tweet = on_tweet
+        self.on_failed = on_failed
+        self.notify_updates = notify_updates
+        self.failed = []  # Tweets of the last run that were not stored (when collecting)
+
+        self.source_stats = StageStats("extract")
+        self.classify_stats = StageStats("classify")
+        self.write_stats = StageStats("write")
+        self.write_counts = {}  # Summed write_batch results, e.g. inserted/updated
+        self.wall_seconds = 0.0
+
+    def _take_batch(self, source_queue, size):
+        """
+        Block for one item, then gather up to `size` items for max_batch_wait seconds.
+
+        Returns:
+            tuple: (items, finished) - finished is True once the end marker was seen
+        """
+        item = source_queue.get()
+        if item is _END:
+            return [], True
+        items = [item]
+        deadline = time.monotonic() + self.max_batch_wait
+        while len(items) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = source_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _END:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _put(self, target_queue, item):
+        # Returns how long we were blocked by a full downstream queue
+        start = time.monotonic()
+        target_queue.put(item)
+        return time.monotonic() - start
+
+    def _classifier(self, classify_queue, write_queue):
+        while True:
+            tweets, finished = self._take_batch(classify_queue, self.classify_batch_size)
+            if tweets:
+                start = time.monotonic()
+                try:
+                    sentiments = self.classify_batch([t["clean_text"] for t in tweets])
+                except Exception as e:
+                    # Same safe fallback the backends use for a failed call
+                    print(f"[!] Classification error (batch of {len(tweets)}): {e}")
+                    sentiments = ["neutral"] * len(tweets)
+                busy = time.monotonic() - start
+
+                blocked = 0.0
+                for tweet, sentiment in zip(tweets, sentiments):
+                    tweet["sentiment"] = sentiment
+                    blocked += self._put(write_queue, tweet)
+                self.classify_stats.record(len(tweets), busy, blocked)
+            if finished:
+                # Let the other classifier threads see the end marker too
+                classify_queue.put(_END)
+                return
+
+    def _not_stored(self, tweets, collect):
+        if collect:
+            self.failed.extend(tweets)
+        if self.on_failed:
+            for tweet in tweets:
+                self.on_failed(tweet)
+
+    def _writer(self, write_queue, stored, workers_left):
+        def on_flush(tweets, result, seconds):
+            failed_keys = set()
+            updated_keys = set()
+            if isinstance(result, dict):
+                failed_keys = set(result.get("failed_keys", ()))
+                updated_keys = set(result.get("updated_keys", ()))
+                for name, value in result.items():
+                    if isinstance(value, int):
+                        self.write_counts[name] = self.write_counts.get(name, 0) + value
+            written = [tweet for tweet in tweets if tweet.get("tweet_key") not in failed_keys]
+            if len(written) < len(tweets):
+                self._not_stored([tweet for tweet in tweets if tweet.get("tweet_key") in failed_keys],
+                                 stored is not None)
+            if stored is not None:
+                stored.extend(written)
+            self.write_stats.record(len(tweets), seconds)
+            if self.on_tweet:
+                for tweet in written:
+                    if self.notify_updates or tweet.get("tweet_key") not in updated_keys:
+                        self.on_tweet(tweet)
+
+        def guarded(action, *args):
+            # Log errors but keep the pipeline draining
+            try:
+                action(*args)
+            except Exception as e:
+                print(f"[!] Error saving tweets: {e}")
+
+        # Flushes on size itself; time-based flushes happen when the queue goes quiet
+        buffer = BufferedTweetWriter(max_size=self.write_batch_size, max_delay=self.max_batch_wait,
+                                     write_batch=self.write_batch, on_flush=on_flush)
+        while True:
+            try:
+                item = write_queue.get(timeout=buffer.seconds_until_due())
+            except queue.Empty:
+                guarded(buffer.flush)
+                continue
+            if item is _END:
+                # One end marker arrives per classifier; stop after the last one
+                workers_left -= 1
+                if workers_left == 0:
+                    guarded(buffer.close)
+                    # A failed flush keeps its tweets buffered for a retry; none is left now
+                    unwritten = buffer.pending()
+                    if unwritten:
+                        print(f"[!] {len(unwritten)} tweet(s) could not be saved")
+                        self._not_stored(unwritten, stored is not None)
+                    return
+                continue
+            try:
+                buffer.add(item)
+            except WriteBufferFull as e:
+                # Storage is down and the retry buffer is at its limit: give this tweet up
+                print(f"[!] Error saving tweets: {e}")
+                self._not_stored([item], stored is not None)
+            except Exception as e:
+                print(f"[!] Error saving tweets: {e}")
+
+    def run(self, source, collect=True):
+        """
+        Drive tweets from `source` through classification and storage.
+
+        Args:
+            source (iterable): Yields tweet dicts with at least 'clean_text'
+            collect (bool): Keep the stored tweets to return them; long-running
+                callers that only need on_tweet pass False so memory stays flat
+
+        Returns:
+            list: The tweets that were stored, with 'sentiment' filled in
+            (empty when collect is False); the ones that were not are in self.failed
+        """
+        # Room for every classifier's end marker even when the queue is tiny
+        classify_queue = queue.Queue(maxsize=max(self.queue_size, self.classifier_workers + 1))
+        write_queue = queue.Queue(maxsize=max(self.queue_size, self.classifier_workers + 1))
+        stored = [] if collect else None
+
+        # Fresh counters for this run
+        self.source_stats = StageStats("extract")
+        self.classify_stats = StageStats("classify")
+        self.write_stats = StageStats("write")
+        self.write_counts = {}
+        self.failed = []
+
+        # Each classifier forwards one end marker to the writer when it finishes
+        def classifier_then_signal(*args):
+            self._classifier(*args)
+            write_queue.put(_END)
+
+        classifiers = [
+            threading.Thread(target=classifier_then_signal, args=(classify_queue, write_queue), daemon=True)
+            for _ in range(self.classifier_workers)
+        ]
+        writer = threading.Thread(
+            target=self._writer, args=(write_queue, stored, self.classifier_workers), daemon=True
+        )
+
+        start = time.monotonic()
+        for thread in classifiers + [writer]:
+            thread.start()
+
+        # The source stage runs on the calling thread (Selenium drivers are not thread-safe)
+        try:
+            iterator = iter(source)
+            while True:
+                produce_start = time.monotonic()
+                try:
+                    tweet = next(iterator)
+                except StopIteration:
+                    break
+                busy = time.monotonic() - produce_start
+                self.source_stats.record(1, busy, self._put(classify_queue, tweet))
+        finally:
+            classify_queue.put(_END)
+            for thread in classifiers:
+                thread.join()
+            writer.join()
+            self.wall_seconds = time.monotonic() - start
+
+        return stored if collect else []
+
+    def stats(self):
+        """
+        Return per-stage throughput counters for the last run().
+
+        Example return value:
+            {
+                "wall_seconds": 12.4,
+                "write_counts": {"inserted": 75, "updated": 5, "errors": 0},
+                "extract":  {"items": 80, "batches": 80, "busy_seconds": 11.9, "blocked_seconds": 0.0, "items_per_second": 6.45},
+                "classify": {"items": 80, "batches": 5,  "busy_seconds": 3.1,  "blocked_seconds": 0.0, "items_per_second": 6.45},
+                "write":    {"items": 80, "batches": 6,  "busy_seconds": 0.4,  "blocked_seconds": 0.0, "items_per_second": 6.45}
+            }
+        """
+        result = {"wall_seconds": round(self.wall_seconds, 3), "write_counts": dict(self.write_counts)}
+        for stage in (self.source_stats, self.classify_stats, self.write_stats):
+            result[stage.name] = stage.as_dict(self.wall_seconds)
+        return result
@@ -0,0 +1,413 @@
+# Multi-keyword scraping scheduler for Twitter Sentiment Analysis Project
+# Keeps a list of keywords fresh: each keyword is scraped again once its
+# interval has passed, the most important due keyword goes first, and N
+# browser workers scrape different keywords at the same time.
+#
+#   N browser workers (threads, each borrowing a session from the DriverPool)
+#       -> [extracted queue] -> one shared TweetPipeline (classify -> store)
+#
+# All workers feed the same classification and storage pipeline, so batching
+# works across keywords. A global politeness limit (search page loads per
+# minute, shared by all workers) keeps the total request rate to the site
+# bounded however many workers run.
+#
+# Scrapes are incremental by default: each keyword's high-water marks (newest
+# stored tweet, kept in MongoDB) make a worker stop scrolling at the first
+# tweet it has already seen, so repeat runs only classify and store new tweets.
+#
+# Usage:
+#   python scrape_scheduler.py --keyword iphone --keyword android:2:600 --workers 2 --duration 3600
+#   python scrape_scheduler.py --keywords-file keywords.json --rounds 1
+#   python scrape_scheduler.py --keyword iphone --rounds 1 --full
+
+# Import required libraries
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+from rate_limiter import TokenBucket
+from scrape_pipeline import TweetPipeline
+from driver_pool import DriverPool
+from twitter_scraper import iter_tweets, start_session, session_health_check
+from mongodb_handler import get_scrape_cursor, advance_scrape_cursor
+
+# Scheduler configuration, overridable through environment variables
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "2"))
+SCRAPER_SEARCHES_PER_MINUTE = float(os.getenv("SCRAPER_SEARCHES_PER_MINUTE", "6"))
+DEFAULT_INTERVAL = float(os.getenv("SCRAPER_DEFAULT_INTERVAL", "900"))  # Seconds between scrapes of a keyword
+
+# Marks the end of the extracted-tweets stream
+_END = object()
+
+
+class KeywordJob:
+    """One tracked keyword: its schedule and its running statistics."""
+
+    def __init__(self, keyword, priority=1, interval=DEFAULT_INTERVAL, max_tweets=20):
+        """
+        Args:
+            keyword (str): Search term
+            priority (int): Higher runs first when several keywords are due
+            interval (float): Seconds from the end of one scrape to the next
+            max_tweets (int): Tweets to collect per scrape
+        """
+        self.keyword = keyword
+        self.priority = priority
+        self.interval = interval
+        self.max_tweets = max_tweets
+        self.next_run = 0.0      # Monotonic time the keyword is due (0: as soon as run() starts)
+        self.running = False
+
+        self.runs = 0
+        self.errors = 0
+        self.extracted = 0       # Tweets read from the page
+        self.stored = 0          # Tweets that came out of the pipeline stored
+        self.pending_marks = []  # tweet_id/posted_at of stored tweets not yet in the scrape cursor
+        self.failed_marks = []   # ...and of tweets that could not be stored, which cap the cursor
+        self.scrape_seconds = 0.0
+        self.first_tweet_seconds = 0.0
+        self.lateness_seconds = 0.0  # How long after next_run scrapes actually started
+        self.last_run = None
+        self.last_error = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a job from {"keyword": ..., "priority": ..., "interval": ..., "max_tweets": ...}."""
+        return cls(data["keyword"], priority=data.get("priority", 1),
+                   interval=data.get("interval", DEFAULT_INTERVAL), max_tweets=data.get("max_tweets", 20))
+
+    def stats(self):
+        """
+        Example return value:
+            {"priority": 2, "interval": 600, "runs": 3, "errors": 0, "extracted": 60, "stored": 58,
+             "tweets_per_run": 20.0, "avg_scrape_seconds": 14.2, "avg_first_tweet_seconds": 3.1,
+             "avg_lateness_seconds": 0.4, "tweets_per_second": 1.41, "last_run": "2024-05-01 14:03:12",
+             "last_error": None}
+        """
+        runs = max(self.runs, 1)
+        return {
+            "priority": self.priority,
+            "interval": self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            "extracted": self.extracted,
+            "stored": self.stored,
+            "tweets_per_run": round(self.extracted / runs, 2),
+            "avg_scrape_seconds": round(self.scrape_seconds / runs, 3),
+            "avg_first_tweet_seconds": round(self.first_tweet_seconds / runs, 3),
+            "avg_lateness_seconds": round(self.lateness_seconds / runs, 3),
+            "tweets_per_second": round(self.extracted / self.scrape_seconds, 2) if self.scrape_seconds > 0 else 0.0,
+            "last_run": self.last_run,
+            "last_error": self.last_error
+        }
+
+
+class ScrapeScheduler:
+    """
+    Runs scrapes for many keywords on a pool of browser workers.
+
+    Example:
+        with ScrapeScheduler([KeywordJob("iphone", priority=2, interval=600),
+                              KeywordJob("android")], workers=2) as scheduler:
+            scheduler.run(duration=3600)     # Or rounds=1 to scrape every keyword once
+            print(scheduler.stats())
+    """
+
+    def __init__(self, jobs, workers=SCRAPER_WORKERS, searches_per_minute=SCRAPER_SEARCHES_PER_MINUTE,
+                 pool=None, pipeline=None, extract=iter_tweets, queue_size=200, on_tweet=None,
+                 incremental=True):
+        """
+        Args:
+            jobs (list): KeywordJob instances (or dicts for KeywordJob.from_dict)
+            workers (int): Keywords scraped at the same time (one browser each)
+            searches_per_minute (float): Global politeness limit on search page loads
+            pool (DriverPool): Browser sessions (default: a pool of `workers` sessions
+                owned by the scheduler and closed by close())
+            pipeline (TweetPipeline): Shared classify/store stages (default: a new one)
+            extract (callable): (driver, keyword, max_tweets) -> iterable of tweet dicts;
+                also given since=<cursor> when incremental
+            queue_size (int): Extracted tweets buffered ahead of the pipeline (backpressure)
+            on_tweet (callable): Called with each tweet dict once it has been stored
+            incremental (bool): Stop each scrape at the keyword's stored high-water marks
+                and advance them from the stored tweets (needs MongoDB)
+        """
+        self.jobs = [job if isinstance(job, KeywordJob) else KeywordJob.from_dict(job) for job in jobs]
+        self.workers = max(1, workers)
+        self.politeness = TokenBucket(searches_per_minute, capacity=1)
+        self._owns_pool = pool is None
+        if pool is None:
+            pool = DriverPool(start_session, size=self.workers, health_check=session_health_check("twitter_cookies.json"))
+        self.pool = pool
+        self.pipeline = pipeline or TweetPipeline()
+        self.pipeline.on_tweet = self._stored
+        self.pipeline.on_failed = self._not_stored
+        self.extract = extract
+        self.queue_size = queue_size
+        self.on_tweet = on_tweet
+        self.incremental = incremental
+
+        self._by_keyword = {job.keyword: job for job in self.jobs}
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self.wall_seconds = 0.0
+
+    # ----- Running -----
+
+    def run(self, duration=None, rounds=None):
+        """
+        Scrape until `duration` seconds have passed, every keyword ran `rounds` times, or stop().
+
+        Blocks the calling thread. Each keyword's schedule carries over
+        between calls: one scraped recently is not due again until its
+        interval has passed.
+
+        Args:
+            duration (float): Stop starting new scrapes after this many seconds
+            rounds (int): Stop once every keyword has been scraped this many times in this call
+
+        Returns:
+            dict: stats()
+        """
+        self._stop.clear()
+        now = time.monotonic()
+        deadline = None if duration is None else now + duration
+        with self._condition:
+            for job in self.jobs:
+                job.next_run = max(job.next_run, now)  # Never-run keywords are due from now on
+        target_runs = None if rounds is None else {job.keyword: job.runs + rounds for job in self.jobs}
+        extracted = queue.Queue(maxsize=self.queue_size)
+
+        def source():
+            while True:
+                tweet = extracted.get()
+                if tweet is _END:
+                    return
+                yield tweet
+
+        start = time.monotonic()
+        # Stored tweets only go through on_tweet; collecting them would grow without bound
+        pipeline_thread = threading.Thread(target=self.pipeline.run, args=(source(),),
+                                           kwargs={"collect": False}, daemon=True)
+        pipeline_thread.start()
+        workers = [
+            threading.Thread(target=self._worker, args=(extracted, deadline, target_runs), daemon=True)
+            for _ in range(self.workers)
+        ]
+        for thread in workers:
+            thread.start()
+        try:
+            for thread in workers:
+                # Short joins keep the main thread responsive to KeyboardInterrupt
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in workers:
+                thread.join()
+        finally:
+            extracted.put(_END)
+            pipeline_thread.join()
+            # Everything is stored now; record the last scrapes' marks
+            for job in self.jobs:
+                self._save_cursor(job)
+            self.wall_seconds = time.monotonic() - start
+        return self.stats()
+
+    def stop(self):
+        """Ask the workers to finish their current scrape and exit."""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def close(self):
+        """Quit the browsers of the pool the scheduler created (a pool passed in is left open)."""
+        if self._owns_pool:
+            self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _worker(self, extracted, deadline, target_runs):
+        while True:
+            job = self._next_job(deadline, target_runs)
+            if job is None:
+                return
+            self._scrape(job, extracted)
+
+    def _next_job(self, deadline, target_runs):
+        # Block until a keyword is due and return it (marked running), or None when done
+        with self._condition:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    return None
+                pending = [job for job in self.jobs
+                           if target_runs is None or job.runs + (1 if job.running else 0) < target_runs[job.keyword]]
+                if not pending:
+                    return None
+                due = [job for job in pending if not job.running and job.next_run <= now]
+                if due:
+                    job = max(due, key=lambda j: (j.priority, -j.next_run))
+                    job.running = True
+                    return job
+                # Sleep until the next keyword is due, a scrape finishes, or the deadline
+                waiting = [job.next_run for job in pending if not job.running]
+                wake = min(waiting) if waiting else None
+                if deadline is not None:
+                    wake = deadline if wake is None else min(wake, deadline)
+                self._condition.wait(None if wake is None else max(0.0, wake - now))
+            return None
+
+    def _scrape(self, job, extracted):
+        scheduled = job.next_run
+        # Global politeness: every search page load takes a token, whichever worker makes it
+        wait = self.politeness.reserve()
+        if wait and self._stop.wait(wait):
+            with self._condition:
+                job.running = False
+                self._condition.notify_all()
+            return
+
+        start = time.monotonic()
+        first_tweet = None
+        count = 0
+        error = None
+        try:
+            kwargs = {}
+            if self.incremental:
+                # The previous run's tweets are stored by now unless the interval is shorter than a pipeline flush
+                self._save_cursor(job)
+                kwargs["since"] = get_scrape_cursor(job.keyword)
+            with self.pool.session() as driver:
+                for tweet in self.extract(driver, job.keyword, job.max_tweets, **kwargs):
+                    if first_tweet is None:
+                        first_tweet = time.monotonic() - start
+                    extracted.put(tweet)
+                    count += 1
+                    if self._stop.is_set():
+                        break
+        except Exception as e:
+            error = e
+            print(f"[!] Scrape of '{job.keyword}' failed: {e}")
+        finished = time.monotonic()
+
+        with self._condition:
+            job.running = False
+            job.runs += 1
+            job.extracted += count
+            job.scrape_seconds += finished - start
+            job.first_tweet_seconds += first_tweet if first_tweet is not None else finished - start
+            job.lateness_seconds += max(0.0, start - scheduled)
+            job.last_run = time.strftime('%Y-%m-%d %H:%M:%S')
+            if error is not None:
+                job.errors += 1
+                job.last_error = str(error)
+            job.next_run = finished + job.interval
+            self._condition.notify_all()
+
+    def _stored(self, tweet):
+        # Called by the pipeline's writer thread after each flush
+        with self._condition:
+            job = self._by_keyword.get(tweet.get("keyword"))
+            if job is not None:
+                job.stored += 1
+                if self.incremental:
+                    job.pending_marks.append({"tweet_id": tweet.get("tweet_id"), "posted_at": tweet.get("posted_at")})
+        if self.on_tweet:
+            self.on_tweet(tweet)
+
+    def _not_stored(self, tweet):
+        # Called by the pipeline for tweets whose write failed
+        if self.incremental:
+            with self._condition:
+                job = self._by_keyword.get(tweet.get("keyword"))
+                if job is not None:
+                    job.failed_marks.append({"tweet_id": tweet.get("tweet_id"), "posted_at": tweet.get("posted_at")})
+
+    def _save_cursor(self, job):
+        # Advance the keyword's high-water marks to the tweets stored since the last call,
+        # but not past any that failed
+        with self._condition:
+            marks, job.pending_marks = job.pending_marks, []
+            failed, job.failed_marks = job.failed_marks, []
+        if not marks:
+            return
+        try:
+            advance_scrape_cursor(job.keyword, marks, failed=failed)
+        except Exception as e:
+            print(f"[!] Could not save the scrape cursor for '{job.keyword}': {e}")
+            with self._condition:
+                job.pending_marks.extend(marks)  # Retried on the next save
+                job.failed_marks.extend(failed)
+
+    # ----- Reporting -----
+
+    def stats(self):
+        """
+        Return per-keyword statistics plus the shared pipeline's and browser pool's counters.
+
+        Example return value:
+            {
+                "wall_seconds": 61.2,
+                "keywords": {"iphone": {...KeywordJob.stats()...}, ...},
+                "pipeline": {...TweetPipeline.stats()...},
+                "browsers": {...DriverPool.stats()...}
+            }
+        """
+        with self._condition:
+            keywords = {job.keyword: job.stats() for job in self.jobs}
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "keywords": keywords,
+            "pipeline": self.pipeline.stats(),
+            "browsers": self.pool.stats()
+        }
+
+
+def parse_keyword(spec):
+    """
+    Parse a command-line keyword spec: "keyword[:priority[:interval]]".
+
+    Example:
+        parse_keyword("iphone:2:600")  # KeywordJob("iphone", priority=2, interval=600)
+    """
+    parts = spec.split(":")
+    job = KeywordJob(parts[0])
+    if len(parts) > 1 and parts[1]:
+        job.priority = int(parts[1])
+    if len(parts) > 2 and parts[2]:
+        job.interval = float(parts[2])
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape many keywords on a schedule")
+    parser.add_argument("--keyword", action="append", default=[], help="keyword[:priority[:interval]], repeatable")
+    parser.add_argument("--keywords-file", help="JSON list of {keyword, priority, interval, max_tweets}")
+    parser.add_argument("--workers", type=int, default=SCRAPER_WORKERS)
+    parser.add_argument("--searches-per-minute", type=float, default=SCRAPER_SEARCHES_PER_MINUTE)
+    parser.add_argument("--duration", type=float, help="Seconds to run (default: until Ctrl+C)")
+    parser.add_argument("--rounds", type=int, help="Scrape every keyword this many times, then exit")
+    parser.add_argument("--full", action="store_true", help="Scrape from the top, ignoring and not updating the high-water marks")
+    args = parser.parse_args()
+
+    jobs = [parse_keyword(spec) for spec in args.keyword]
+    if args.keywords_file:
+        with open(args.keywords_file, "r", encoding="utf-8") as f:
+            jobs.extend(KeywordJob.from_dict(entry) for entry in json.load(f))
+    if not jobs:
+        parser.error("no keywords given (use --keyword or --keywords-file)")
+
+    with ScrapeScheduler(jobs, workers=args.workers, searches_per_minute=args.searches_per_minute,
+                         incremental=not args.full) as scheduler:
+        stats = scheduler.run(duration=args.duration, rounds=args.rounds)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# Pluggable sentiment backends for Twitter Sentiment Analysis Project
+# Callers use classify_sentiment() / classify_sentiment_batch() from this module
+# and the configured backend decides how the work is done:
+#
+#   SENTIMENT_BACKEND=groq   Llama3 via the Groq API (default)
+#   SENTIMENT_BACKEND=local  Offline NumPy engine from local_sentiment.py
+#   SENTIMENT_BACKEND=cascade  Local engine first, Groq only for uncertain tweets
+#
+# New backends subclass SentimentBackend and register themselves in BACKENDS.
+
+# Import required libraries
+import os
+import random
+import threading
+
+# Name of the backend used when none is given explicitly
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "groq")
+
+# Cascade settings: tweets the local engine is less sure about than this go to the LLM
+CASCADE_CONFIDENCE_THRESHOLD = float(os.getenv("CASCADE_CONFIDENCE_THRESHOLD", "0.7"))
+# Share of confident tweets also sent to the LLM, to measure agreement on the easy cases
+CASCADE_AUDIT_RATE = float(os.getenv("CASCADE_AUDIT_RATE", "0.0"))
+
+
+class SentimentBackend:
+    """
+    Interface every sentiment backend implements.
+
+    Subclasses must implement classify_batch(); classify() defaults to a
+    batch of one.
+    """
+
+    name = None
+
+    def classify(self, text):
+        """
+        Classify a single text.
+
+        Returns:
+            str: 'positive', 'negative', or 'neutral'
+        """
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts):
+        """
+        Classify many texts.
+
+        Returns:
+            list: One of 'positive', 'negative' or 'neutral' per input, in input order
+        """
+        raise NotImplementedError
+
+
+class GroqBackend(SentimentBackend):
+    """Llama3 on the Groq API: cached, batched, concurrent and rate-limited."""
+
+    name = "groq"
+
+    def classify(self, text):
+        # Imported lazily so the local backend works without aiohttp/requests installed
+        from llama_sentiment import classify_sentiment
+        return classify_sentiment(text)
+
+    def classify_batch(self, texts):
+        from async_sentiment import classify_sentiment_concurrent
+        return classify_sentiment_concurrent(list(texts))
+
+
+class LocalBackend(SentimentBackend):
+    """Offline hashed n-gram model; no network access at all."""
+
+    name = "local"
+
+    def classify_batch(self, texts):
+        from local_sentiment import get_engine
+        labels, _ = get_engine().predict(texts)
+        return labels
+
+
+class CascadeBackend(SentimentBackend):
+    """
+    Two-tier classifier: the local engine scores every tweet, and only tweets
+    whose confidence is below `threshold` are escalated to the LLM backend.
+
+    stats() reports the escalation rate and how often the two tiers agree.
+    Agreement is measured on the escalated tweets (where both tiers produced a
+    label) and, if audit_rate > 0, on a random sample of confident tweets that
+    is also sent to the LLM without changing their label.
+    """
+
+    name = "cascade"
+
+    def __init__(self, threshold=CASCADE_CONFIDENCE_THRESHOLD, audit_rate=CASCADE_AUDIT_RATE, remote=None):
+        """
+        Args:
+            threshold (float): Minimum local confidence (0-1) to skip the LLM
+            audit_rate (float): Share (0-1) of confident tweets double-checked by the LLM
+            remote (SentimentBackend): Escalation tier (default: the shared Groq backend)
+        """
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+        self.remote = remote
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Zero all counters."""
+        with self._lock:
+            self.total = 0
+            self.escalated = 0
+            self.escalated_agreed = 0   # LLM confirmed the local label on an uncertain tweet
+            self.audited = 0
+            self.audited_agreed = 0     # LLM confirmed the local label on a confident tweet
+
+    def classify_batch(self, texts):
+        from local_sentiment import get_engine
+        texts = list(texts)
+        labels, confidence = get_engine().predict(texts)
+
+        escalate = [i for i, c in enumerate(confidence) if c < self.threshold]
+        audit = []
+        if self.audit_rate > 0:
+            audit = [i for i, c in enumerate(confidence)
+                     if c >= self.threshold and random.random() < self.audit_rate]
+
+        ask = escalate + audit
+        remote = self.remote or get_backend(GroqBackend.name)
+        remote_labels = remote.classify_batch([texts[i] for i in ask]) if ask else []
+        remote_by_index = dict(zip(ask, remote_labels))
+
+        with self._lock:
+            self.total += len(texts)
+            self.escalated += len(escalate)
+            self.audited += len(audit)
+            for i in escalate:
+                self.escalated_agreed += remote_by_index[i] == labels[i]
+            for i in audit:
+                self.audited_agreed += remote_by_index[i] == labels[i]
+
+        # The LLM has the final word on uncertain tweets; audited ones keep the local label
+        for i in escalate:
+            labels[i] = remote_by_index[i]
+        return labels
+
+    def stats(self):
+        """
+        Return escalation and agreement statistics.
+
+        Example return value:
+            {
+                "total": 500,
+                "escalated": 120,
+                "escalation_rate": 0.24,
+                "escalated_agreement": 0.55,   # Tiers agree on uncertain tweets
+                "audited": 38,
+                "audited_agreement": 0.92      # Tiers agree on confident tweets
+            }
+        """
+        with self._lock:
+            return {
+                "total": self.total,
+                "escalated": self.escalated,
+                "escalation_rate": self.escalated / self.total if self.total else 0.0,
+                "escalated_agreement": self.escalated_agreed / self.escalated if self.escalated else None,
+                "audited": self.audited,
+                "audited_agreement": self.audited_agreed / self.audited if self.audited else None
+            }
+
+
+# Registry of available backends, by configuration name
+BACKENDS = {
+    GroqBackend.name: GroqBackend,
+    LocalBackend.name: LocalBackend,
+    CascadeBackend.name: CascadeBackend,
+}
+
+# One instance per backend name, shared by the whole process
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    """
+    Return the shared backend instance for `name`.
+
+    Args:
+        name (str): Backend name; defaults to the SENTIMENT_BACKEND setting
+
+    Returns:
+        SentimentBackend: The backend instance
+
+    Raises:
+        ValueError: If no backend with that name is registered
+    """
+    name = (name or SENTIMENT_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{name}'. Available: {', '.join(sorted(BACKENDS))}")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+def classify_sentiment(text, backend=None):
+    """
+    Classify one text with the configured backend.
+
+    Args:
+        text (str): The input text to analyze for sentiment
+        backend (str): Backend name to use instead of SENTIMENT_BACKEND
+
+    Returns:
+        str: One of three sentiment classifications: 'positive', 'negative', or 'neutral'
+    """
+    return get_backend(backend).classify(text)
+
+
+def classify_sentiment_batch(texts, backend=None):
+    """
+    Classify many texts with the configured backend.
+
+    Args:
+        texts (list): The input texts to analyze for sentiment
+        backend (str): Backend name to use instead of SENTIMENT_BACKEND
+
+    Returns:
+        list: One of 'positive', 'negative' or 'neutral' per input, in input order
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    return get_backend(backend).classify_batch(texts)
@@ -0,0 +1,284 @@
+# Sentiment Cache for Twitter Sentiment Analysis Project
+# This module remembers sentiment labels we already paid an API call for.
+# Retweets, copy-pasta and bot spam produce the same clean_text over and over,
+# so looking the label up locally saves a large share of Groq requests.
+#
+# Two tiers are used:
+#   1. An in-process LRU dictionary (fast, lost when the program exits)
+#   2. An on-disk SQLite table (survives restarts, bounded by TTL and size)
+
+# Import required libraries
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Cache configuration, overridable through environment variables
+CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", "sentiment_cache.db")
+CACHE_MEMORY_SIZE = int(os.getenv("SENTIMENT_CACHE_MEMORY_SIZE", "10000"))
+CACHE_TTL_SECONDS = int(os.getenv("SENTIMENT_CACHE_TTL", str(30 * 24 * 3600)))  # 30 days
+CACHE_MAX_DISK_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", "500000"))
+
+# How many disk writes happen between two eviction sweeps
+EVICTION_INTERVAL = 500
+
+
+def normalize_text(text):
+    """
+    Normalize tweet text so trivially different copies share one cache entry.
+
+    Args:
+        text (str): Cleaned tweet text
+
+    Returns:
+        str: Lower-cased text with runs of whitespace collapsed to a single space
+    """
+    return " ".join(str(text).lower().split())
+
+
+def make_cache_key(text, model, prompt_version):
+    """
+    Build a content-addressed cache key for a piece of text.
+
+    The model name and prompt version are part of the key so that changing
+    either one automatically invalidates every previously cached label.
+
+    Args:
+        text (str): Cleaned tweet text
+        model (str): Name of the model that produced the label
+        prompt_version (str): Version tag of the prompt used
+
+    Returns:
+        str: Hex SHA-256 digest identifying this (text, model, prompt) combination
+    """
+    raw = f"{model}\x00{prompt_version}\x00{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Two-tier (memory LRU + SQLite) cache mapping cache keys to sentiment labels.
+
+    All methods are thread-safe, so the GUI worker thread and any background
+    scraping threads can share a single instance.
+    """
+
+    def __init__(self, path=CACHE_PATH, memory_size=CACHE_MEMORY_SIZE,
+                 ttl=CACHE_TTL_SECONDS, max_disk_entries=CACHE_MAX_DISK_ENTRIES):
+        """
+        Args:
+            path (str): SQLite file for the disk tier, or None to keep memory only
+            memory_size (int): Maximum number of labels held in the LRU tier
+            ttl (int): Seconds after which an entry (in either tier) is considered stale
+            max_disk_entries (int): Maximum number of rows kept in the disk tier
+        """
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+
+        self._memory = OrderedDict()  # key -> (label, created_at), most recently used last
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+        # Hit/miss counters exposed through stats()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Open (or create) the SQLite disk tier
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                " key TEXT PRIMARY KEY,"
+                " sentiment TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sentiment_cache_accessed"
+                " ON sentiment_cache (accessed_at)"
+            )
+            self._db.commit()
+
+    def _remember(self, key, sentiment, created_at):
+        # Put a label in the LRU tier, dropping the least recently used entry if full
+        self._memory[key] = (sentiment, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """
+        Look up several keys at once.
+
+        Args:
+            keys (list): Cache keys produced by make_cache_key
+
+        Returns:
+            dict: Mapping of key to label for every key that was found
+        """
+        # Hits and misses are counted once per distinct key, however often it repeats
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        cutoff = now - self.ttl
+        with self._lock:
+            missing = []
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and entry[1] < cutoff:
+                    # Expired here as on disk; a warm process must not outlive the TTL
+                    del self._memory[key]
+                    entry = None
+                if entry is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[0]
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            if missing and self._db is not None:
+                # SQLite limits the number of bound parameters, so query in slices
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, sentiment, created_at FROM sentiment_cache"
+                        f" WHERE key IN ({placeholders}) AND created_at >= ?",
+                        chunk + [cutoff]
+                    ).fetchall()
+                    for key, sentiment, created_at in rows:
+                        found[key] = sentiment
+                        self._remember(key, sentiment, created_at)
+                        self.disk_hits += 1
+                    if rows:
+                        # Touch the rows so size-bounded eviction stays least-recently-used
+                        self._db.executemany(
+                            "UPDATE sentiment_cache SET accessed_at = ? WHERE key = ?",
+                            [(now, key) for key, _, _ in rows]
+                        )
+                self._db.commit()
+
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key):
+        """
+        Look up a single key.
+
+        Returns:
+            str or None: The cached label, or None on a miss
+        """
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items):
+        """
+        Store several labels at once.
+
+        Args:
+            items (dict): Mapping of cache key to sentiment label
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, sentiment in items.items():
+                self._remember(key, sentiment, now)
+
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache"
+                    " (key, sentiment, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    [(key, sentiment, now, now) for key, sentiment in items.items()]
+                )
+                self._db.commit()
+
+                self._writes_since_eviction += len(items)
+                if self._writes_since_eviction >= EVICTION_INTERVAL:
+                    self._evict()
+
+    def set(self, key, sentiment):
+        """Store a single label."""
+        self.set_many({key: sentiment})
+
+    def _evict(self):
+        # Drop expired rows, then the least recently used rows above the size bound.
+        # Caller must hold self._lock.
+        self._writes_since_eviction = 0
+        self._db.execute(
+            "DELETE FROM sentiment_cache WHERE created_at < ?",
+            (time.time() - self.ttl,)
+        )
+        count = self._db.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM sentiment_cache WHERE key IN ("
+                " SELECT key FROM sentiment_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,)
+            )
+        self._db.commit()
+
+    def evict(self):
+        """Run an eviction sweep on the disk tier right now."""
+        with self._lock:
+            if self._db is not None:
+                self._evict()
+
+    def clear(self):
+        """Remove every entry from both tiers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM sentiment_cache")
+                self._db.commit()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        """
+        Return hit/miss counters for monitoring how much the cache is saving.
+
+        Example return value:
+            {
+                "hits": 120,
+                "memory_hits": 100,
+                "disk_hits": 20,
+                "misses": 80,
+                "hit_rate": 0.6,
+                "memory_entries": 150
+            }
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory)
+            }
+
+
+# Shared process-wide cache, created on first use
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Return the process-wide SentimentCache, creating it on first call.
+
+    Returns:
+        SentimentCache: The shared cache instance
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SentimentCache()
+        return _shared_cache
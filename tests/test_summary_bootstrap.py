@@ -0,0 +1,59 @@
+# Summary reads on a database filled before the summary collection existed
+# Uses mongomock in place of a MongoDB server:
+#   pip install mongomock pytest && python -m pytest tests
+
+import os
+import sys
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mongodb_handler
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    # Point every collection at a fresh in-memory database
+    db = mongomock.MongoClient()["twitter_db"]
+    monkeypatch.setattr(mongodb_handler, "db", db)
+    monkeypatch.setattr(mongodb_handler, "collection", db["tweets"])
+    monkeypatch.setattr(mongodb_handler, "summary_collection", db["tweet_summary"])
+    monkeypatch.setattr(mongodb_handler, "state_collection", db["scrape_state"])
+    monkeypatch.setattr(mongodb_handler, "meta_collection", db["tweet_meta"])
+    monkeypatch.setattr(mongodb_handler, "_indexes_ready", False)
+    return mongodb_handler
+
+
+def seed_old_tweets(handler):
+    # Written straight to the collection, as an older version would have left them
+    handler.collection.insert_many([
+        {"tweet_id": "1", "username": "a", "clean_text": "love it #win", "sentiment": "positive",
+         "keyword": "phone", "hashtags": ["#win"], "timestamp": "2024-05-01 14:03:00"},
+        {"tweet_id": "2", "username": "b", "clean_text": "broken again", "sentiment": "negative",
+         "keyword": "phone", "hashtags": [], "timestamp": "2024-05-01 15:10:00"},
+        {"tweet_id": "3", "username": "c", "clean_text": "it is fine", "sentiment": "neutral",
+         "keyword": "tablet", "hashtags": [], "timestamp": "2024-05-02 09:00:00"},
+    ])
+
+
+def test_get_summary_counts_existing_tweets_without_a_write(handler):
+    seed_old_tweets(handler)
+
+    summary = handler.get_summary()
+
+    assert summary["totals"] == {"total": 3, "positive": 1, "neutral": 1, "negative": 1}
+    assert summary["hashtags"]["#win"] == 1
+    assert handler.get_summary(keyword="phone")["totals"]["total"] == 2
+    assert handler.get_tweet_stats() == summary["totals"]
+
+
+def test_get_data_version_sees_existing_tweets_without_a_write(handler):
+    seed_old_tweets(handler)
+
+    version = handler.get_data_version()
+
+    assert version["total"] == 3
+    assert version["buckets"] == 3
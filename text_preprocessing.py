@@ -0,0 +1,234 @@
+# Tweet text preprocessing for Twitter Sentiment Analysis Project
+# Turns raw tweet text into the fields we store and analyze: hashtags,
+# mentions, URLs, emojis, language, cleaned text and a dedup key.
+#
+# preprocess_tweet() handles one tweet; preprocess_batch() handles large
+# batches (e.g. re-processing an archive) on a process pool, sending the
+# work in chunks so the per-task overhead stays small.
+
+# Import required libraries
+import os
+import re
+import hashlib
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+# Patterns are compiled once at import time, not on every call
+HASHTAG_PATTERN = re.compile(r"#\w+")
+MENTION_PATTERN = re.compile(r"@\w+")
+URL_PATTERN = re.compile(r"http\S+")
+CLEAN_PATTERN = re.compile(r"http\S+|@\w+|#\w+")  # What clean_text strips, as before
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F1E6-\U0001F1FF"  # Flags
+    "\U0001F300-\U0001F5FF"  # Symbols and pictographs
+    "\U0001F600-\U0001F64F"  # Emoticons
+    "\U0001F680-\U0001F6FF"  # Transport and map
+    "\U0001F900-\U0001F9FF"  # Supplemental symbols and pictographs
+    "\U0001FA70-\U0001FAFF"  # Symbols and pictographs extended-A
+    "☀-➿"          # Miscellaneous symbols and dingbats
+    "]"
+)
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+RETWEET_PREFIX_PATTERN = re.compile(r"^rt\b:?\s*")
+TOKEN_PATTERN = re.compile(r"\b\w+\b")  # Words counted by the "most frequent words" analytics
+
+# Scripts that identify a language (or family) on their own
+SCRIPT_LANGUAGES = (
+    (re.compile(r"[؀-ۿ]"), "ar"),
+    (re.compile(r"[֐-׿]"), "he"),
+    (re.compile(r"[Ѐ-ӿ]"), "ru"),
+    (re.compile(r"[Ͱ-Ͽ]"), "el"),
+    (re.compile(r"[฀-๿]"), "th"),
+    (re.compile(r"[ऀ-ॿ]"), "hi"),
+    (re.compile(r"[぀-ヿ]"), "ja"),  # Kana before Han: Japanese mixes both
+    (re.compile(r"[가-힯]"), "ko"),
+    (re.compile(r"[一-鿿]"), "zh"),
+)
+# Any character from the scripts above, to skip the per-script checks for most tweets
+NON_LATIN_PATTERN = re.compile("|".join(pattern.pattern for pattern, _ in SCRIPT_LANGUAGES))
+
+# Very common words for telling Latin-script languages apart
+LATIN_STOPWORDS = {
+    "en": {"the", "and", "is", "are", "this", "that", "with", "for", "you", "not", "have", "was", "it", "of"},
+    "fr": {"le", "la", "les", "et", "est", "une", "des", "pour", "pas", "que", "qui", "dans", "je", "c'est"},
+    "es": {"el", "los", "las", "y", "es", "una", "para", "que", "por", "con", "del", "muy", "pero", "yo"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "ein", "eine", "mit", "ich", "auf", "für", "zu"},
+    "pt": {"o", "os", "e", "é", "um", "uma", "para", "que", "não", "com", "do", "da", "muito", "eu"},
+    "it": {"il", "lo", "gli", "e", "è", "un", "una", "per", "che", "non", "con", "del", "della", "sono"},
+}
+
+# Inverted index: stopword -> languages it belongs to, so detection is one pass over the words
+STOPWORD_LANGUAGES = {}
+for _language, _stopwords in LATIN_STOPWORDS.items():
+    for _word in _stopwords:
+        STOPWORD_LANGUAGES.setdefault(_word, []).append(_language)
+
+# Common English words left out of the word frequency analytics
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "is", "are", "was", "were",
+    "be", "been", "being", "in", "on", "at", "to", "for", "with",
+    "by", "about", "against", "between", "into", "through", "during",
+    "before", "after", "above", "below", "from", "up", "down", "of",
+    "off", "over", "under", "again", "further", "then", "once", "here",
+    "there", "when", "where", "why", "how", "all", "any", "both", "each",
+    "few", "more", "most", "other", "some", "such", "no", "nor", "not",
+    "only", "own", "same", "so", "than", "too", "very", "s", "t", "can",
+    "will", "just", "don", "should", "now", "i", "me", "my", "myself",
+    "we", "our", "ours", "ourselves", "you", "your", "yours", "yourself",
+    "yourselves", "he", "him", "his", "himself", "she", "her", "hers",
+    "herself", "it", "its", "itself", "they", "them", "their", "theirs",
+    "themselves", "what", "which", "who", "whom", "this", "that", "these",
+    "those", "am", "have", "has", "had", "having", "do", "does", "did", "doing",
+    "would", "could", "ought", "i'm", "you're", "he's", "she's", "it's", "we're",
+    "they're", "i've", "you've", "we've", "they've", "i'd", "you'd", "he'd",
+    "she'd", "we'd", "they'd", "i'll", "you'll", "he'll", "she'll", "we'll",
+    "they'll", "isn't", "aren't", "wasn't", "weren't", "hasn't", "haven't",
+    "hadn't", "doesn't", "don't", "didn't", "won't", "wouldn't", "shan't",
+    "shouldn't", "can't", "cannot", "couldn't", "mustn't", "let's", "that's",
+    "who's", "what's", "here's", "there's", "when's", "where's", "why's",
+    "how's", "yeah", "u", "ur", "r", "n", "im", "m", "rt"
+}
+
+# Below this many texts a process pool costs more than it saves
+MIN_PARALLEL_BATCH = 2000
+
+# Texts sent to a worker process per task
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def detect_language(text):
+    """
+    Cheap language guess without external dependencies.
+
+    Non-Latin scripts are recognised by character range; Latin-script text is
+    matched against a handful of stopword lists. Twitter's own `lang`
+    attribute is more reliable when it is available.
+
+    Args:
+        text (str): Tweet text
+
+    Returns:
+        str: ISO 639-1 code, or "und" (undetermined) if there is no clear signal
+    """
+    # Pure ASCII text cannot contain any of the non-Latin scripts
+    if not text.isascii() and NON_LATIN_PATTERN.search(text):
+        for pattern, language in SCRIPT_LANGUAGES:
+            if pattern.search(text):
+                return language
+
+    hits = {}
+    for word in WORD_PATTERN.findall(text.lower()):
+        for language in STOPWORD_LANGUAGES.get(word, ()):
+            hits[language] = hits.get(language, 0) + 1
+    if not hits:
+        return "und"
+    return max(hits, key=hits.get)
+
+
+def normalize_for_dedup(text):
+    """
+    Normalize text so retweets and trivial copies compare equal.
+
+    Applies Unicode NFKC and case folding, drops a leading "RT", URLs,
+    mentions, punctuation and emojis, and collapses whitespace.
+
+    Args:
+        text (str): Raw or cleaned tweet text
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = CLEAN_PATTERN.sub(" ", text)
+    text = EMOJI_PATTERN.sub(" ", text)
+    text = PUNCTUATION_PATTERN.sub(" ", text)
+    text = WHITESPACE_PATTERN.sub(" ", text).strip()
+    return RETWEET_PREFIX_PATTERN.sub("", text)
+
+
+def extract_words(text):
+    """
+    Split cleaned tweet text into the words counted by the word frequency analytics.
+    
+    Lowercases the text and drops stopwords and single characters.
+    
+    Args:
+        text (str): Cleaned tweet text
+        
+    Returns:
+        list: Words in order of appearance (repeats included)
+    """
+    return [word for word in TOKEN_PATTERN.findall((text or "").lower())
+            if word not in STOPWORDS and len(word) > 1]
+
+
+def preprocess_tweet(text, language=None):
+    """
+    Extract every derived field from one raw tweet.
+
+    Args:
+        text (str): Raw tweet text as shown on the page
+        language (str): Language reported by Twitter, if known (skips detection)
+
+    Returns:
+        dict: Fields to merge into the tweet document
+
+    Example:
+        preprocess_tweet("Loving the new #iPhone 😍 @apple https://t.co/x")
+        # -> {"hashtags": ["#iPhone"], "mentions": ["@apple"],
+        #     "urls": ["https://t.co/x"], "emojis": ["😍"],
+        #     "clean_text": "Loving the new  😍", "language": "en",
+        #     "normalized_text": "loving the new", "dedup_key": "9c1f...",
+        #     "tokens": ["loving", "new"]}
+    """
+    text = text or ""
+    clean_text = CLEAN_PATTERN.sub("", text).strip()
+    normalized = normalize_for_dedup(clean_text)
+    return {
+        "hashtags": HASHTAG_PATTERN.findall(text),
+        "mentions": MENTION_PATTERN.findall(text),
+        "urls": URL_PATTERN.findall(text),
+        "emojis": EMOJI_PATTERN.findall(text),
+        "clean_text": clean_text,
+        "language": language or detect_language(clean_text),
+        "normalized_text": normalized,
+        "dedup_key": hashlib.sha1(normalized.encode("utf-8")).hexdigest(),
+        "tokens": extract_words(clean_text)
+    }
+
+
+def _preprocess_chunk(texts):
+    # Top-level function so it can be pickled and run in a worker process
+    return [preprocess_tweet(text) for text in texts]
+
+
+def preprocess_batch(texts, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Preprocess many tweets, in parallel when the batch is large enough.
+
+    Texts are split into chunks of chunk_size and each chunk is one task for
+    the process pool, so millions of tweets cost only a few hundred task
+    round trips. Small batches are processed inline.
+
+    Args:
+        texts (list): Raw tweet texts
+        workers (int): Worker processes (default: CPU count; 1 disables the pool)
+        chunk_size (int): Texts per worker task
+
+    Returns:
+        list: One preprocess_tweet() dict per input text, in input order
+    """
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(texts) < MIN_PARALLEL_BATCH:
+        return _preprocess_chunk(texts)
+
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        for chunk_result in pool.map(_preprocess_chunk, chunks):
+            results.extend(chunk_result)
+    return results
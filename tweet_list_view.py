@@ -0,0 +1,227 @@
+# Virtualized tweet list for the Tweet Sentiment Analyzer app
+# Shows stored tweets in a ttk.Treeview that never holds more than a fixed
+# window of rows. Rows are fetched from MongoDB one keyset page at a time
+# (see mongodb_handler.get_tweets_page) as the user scrolls: near the bottom
+# the next page is appended and the oldest rows are dropped from the top,
+# near the top the previous page comes back. Filtering by sentiment and
+# keyword happens in the database query, so rendering cost and memory stay
+# bounded however many tweets are stored.
+
+# Import required libraries
+import tkinter as tk
+from tkinter import ttk
+from mongodb_handler import get_tweets_page, get_keywords
+
+# Colors of the sentiment labels
+SENTIMENT_COLORS = {
+    'positive': 'green',
+    'neutral': 'blue',
+    'negative': 'red'
+}
+
+# Fields fetched per row
+LIST_FIELDS = ["sentiment", "keyword", "clean_text"]
+
+# Choice shown for "no filter" in the filter boxes
+ALL = "All"
+
+# Load the next/previous page when the visible part is this close to an end (0-1)
+SCROLL_PREFETCH_MARGIN = 0.1
+
+
+class TweetListView(tk.Frame):
+    """
+    Filterable, paged list of stored tweets.
+
+    Pages are loaded through a ui_tasks.TaskExecutor so the Tk thread never
+    waits on the database.
+
+    Example:
+        view = TweetListView(parent, tasks)
+        view.pack(fill=tk.BOTH, expand=True)
+        view.reload()
+    """
+
+    def __init__(self, master, tasks, page_size=200, max_rows=1000):
+        """
+        Args:
+            master (tk.Widget): Parent widget
+            tasks (TaskExecutor): Executor used for database reads
+            page_size (int): Rows fetched per database round trip
+            max_rows (int): Most rows kept in the Treeview at once
+        """
+        super().__init__(master)
+        self.tasks = tasks
+        self.page_size = page_size
+        self.max_rows = max(max_rows, 2 * page_size)
+
+        # Filter bar
+        filter_frame = tk.Frame(self)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+
+        tk.Label(filter_frame, text="Sentiment:").pack(side=tk.LEFT)
+        self.sentiment_filter = ttk.Combobox(filter_frame, width=10, state="readonly",
+                                             values=[ALL] + list(SENTIMENT_COLORS))
+        self.sentiment_filter.set(ALL)
+        self.sentiment_filter.pack(side=tk.LEFT, padx=5)
+        self.sentiment_filter.bind("<<ComboboxSelected>>", lambda _: self.reload())
+
+        tk.Label(filter_frame, text="Keyword:").pack(side=tk.LEFT)
+        self.keyword_filter = ttk.Combobox(filter_frame, width=20, values=[ALL])
+        self.keyword_filter.set(ALL)
+        self.keyword_filter.pack(side=tk.LEFT, padx=5)
+        self.keyword_filter.bind("<<ComboboxSelected>>", lambda _: self.reload())
+        self.keyword_filter.bind("<Return>", lambda _: self.reload())
+
+        self.status = tk.StringVar(value="")
+        tk.Label(filter_frame, textvariable=self.status).pack(side=tk.RIGHT)
+
+        # The list itself
+        list_frame = tk.Frame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(list_frame, columns=("number", "sentiment", "keyword", "text"),
+                                 show="headings", selectmode="browse")
+        for column, title, width, stretch in (("number", "#", 60, False), ("sentiment", "Sentiment", 90, False),
+                                              ("keyword", "Keyword", 120, False), ("text", "Tweet", 500, True)):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, stretch=stretch, anchor=tk.W)
+        for sentiment, color in SENTIMENT_COLORS.items():
+            self.tree.tag_configure(sentiment, foreground=color)
+
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.clear()
+
+    # ----- Filters -----
+
+    def query(self):
+        """MongoDB filter for the current sentiment/keyword selection."""
+        query = {}
+        sentiment = self.sentiment_filter.get()
+        keyword = self.keyword_filter.get().strip()
+        if sentiment and sentiment != ALL:
+            query["sentiment"] = sentiment
+        if keyword and keyword != ALL:
+            query["keyword"] = keyword
+        return query
+
+    def refresh_keywords(self):
+        """Reload the keyword choices from the database (in the background)."""
+        self.tasks.submit(get_keywords, on_done=lambda keywords: self.keyword_filter.configure(values=[ALL] + keywords),
+                          key="tweet-list-keywords")
+
+    # ----- Window state -----
+
+    def clear(self):
+        """Empty the list; the next refresh_tail() loads from the beginning."""
+        self.tree.delete(*self.tree.get_children())
+        self.ids = {}             # Treeview item -> document _id (the keyset cursor)
+        self.first_number = 1     # Row number of the first row shown
+        self.at_start = True      # No rows before the window
+        self.at_end = True        # No rows after the window (as of the last fetch)
+        self.loading = False
+        self.generation = getattr(self, "generation", 0) + 1  # Drops pages requested before the reset
+        self._update_status()
+
+    def reload(self):
+        """Show the first page for the current filters."""
+        self.clear()
+        self.at_end = False
+        self.refresh_keywords()
+        self._fetch(forward=True)
+
+    def refresh_tail(self):
+        """Fetch rows added after the last one shown, if the window is at the end."""
+        if self.at_end:
+            self._fetch(forward=True)
+
+    # ----- Paging -----
+
+    def _fetch(self, forward):
+        if self.loading:
+            return
+        items = self.tree.get_children()
+        if items:
+            after = self.ids[items[-1]] if forward else self.ids[items[0]]
+        else:
+            after = None
+        self.loading = True
+        self._update_status()
+        generation = self.generation
+        self.tasks.submit(
+            get_tweets_page, self.query(), LIST_FIELDS, self.page_size, after, "_id", not forward,
+            on_done=lambda result: self._page_loaded(result, forward, generation),
+            on_error=lambda error: self._page_failed(error, generation),
+            key="tweet-list-page"
+        )
+
+    def _page_failed(self, error, generation):
+        if generation == self.generation:
+            self.loading = False
+            self.status.set(f"Error loading tweets: {error}")
+
+    def _page_loaded(self, result, forward, generation):
+        if generation != self.generation:
+            return  # Filters changed or the list was cleared meanwhile
+        self.loading = False
+        tweets, more = result
+
+        if forward:
+            number = self.first_number + len(self.ids)
+            for tweet in tweets:
+                self._insert(tk.END, number, tweet)
+                number += 1
+            self.at_end = more is None
+            self._trim(from_top=True)
+        else:
+            # Previous page arrives newest-first; insert each one above the current first row
+            anchor = self.tree.get_children()[:1]
+            for tweet in tweets:
+                self.first_number -= 1
+                self._insert(0, self.first_number, tweet)
+            self.at_start = more is None
+            self._trim(from_top=False)
+            if anchor:
+                self.tree.see(anchor[0])  # Keep the rows the user was looking at in view
+        self._update_status()
+
+    def _insert(self, index, number, tweet):
+        sentiment = tweet.get("sentiment") or "unknown"
+        item = self.tree.insert("", index, values=(number, sentiment.upper(), tweet.get("keyword", ""),
+                                                   tweet.get("clean_text", "")), tags=(sentiment,))
+        self.ids[item] = tweet["_id"]
+
+    def _trim(self, from_top):
+        # Drop rows beyond max_rows on the side away from where the user is scrolling
+        items = self.tree.get_children()
+        excess = len(items) - self.max_rows
+        if excess <= 0:
+            return
+        dropped = items[:excess] if from_top else items[-excess:]
+        self.tree.delete(*dropped)
+        for item in dropped:
+            del self.ids[item]
+        if from_top:
+            self.first_number += excess
+            self.at_start = False
+        else:
+            self.at_end = False
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.loading:
+            return
+        if float(last) >= 1.0 - SCROLL_PREFETCH_MARGIN and not self.at_end:
+            self._fetch(forward=True)
+        elif float(first) <= SCROLL_PREFETCH_MARGIN and not self.at_start:
+            self._fetch(forward=False)
+
+    def _update_status(self):
+        count = len(self.ids)
+        if count == 0:
+            self.status.set("No tweets found" if not self.loading else "Loading...")
+        else:
+            self.status.set(f"Showing {self.first_number}-{self.first_number + count - 1}")
@@ -1,32 +1,140 @@
 # Twitter/X Scraper with Sentiment Analysis
 # This script scrapes tweets based on keywords, analyzes sentiment using Groq API (Llama model),
 # and stores results in MongoDB database
+#
+# Extraction, classification and storage run as a streaming pipeline
+# (see scrape_pipeline.py): tweets are classified and saved while the
+# browser is still scrolling for more.
+#
+# Browser sessions come from a DriverPool (see driver_pool.py): Chrome start-up
+# and cookie login happen once per session, not once per scrape.
 
 # Import required libraries
-import time                                          # For adding delays between operations
+import os                                            # For environment variable configuration
+import time                                          # For timestamps
 import json                                          # For handling JSON data (cookies)
-import re                                            # For regular expressions (text cleaning)
+import re                                            # For regular expressions (tweet ID from permalink)
+import atexit                                        # For closing pooled browsers on exit
+import threading                                     # For guarding the shared driver pools
 from selenium import webdriver                       # Main web automation library
 from selenium.webdriver.chrome.options import Options # Chrome browser configuration
 from selenium.webdriver.chrome.service import Service # Chrome driver service management
 from selenium.webdriver.common.by import By         # Element location methods
-from mongodb_handler import insert_or_update_tweet   # Custom function to save tweets to MongoDB
-from llama_sentiment import classify_sentiment       # Custom function using Groq API for sentiment analysis
+from selenium.webdriver.support.ui import WebDriverWait # Explicit (readiness-based) waits
+from selenium.common.exceptions import TimeoutException # Raised when a wait runs out
+from text_preprocessing import preprocess_tweet      # Hashtag/mention/URL/emoji extraction and text cleaning
+from sentiment_backends import get_backend           # Sentiment analysis via the configured backend
+from scrape_pipeline import TweetPipeline            # Overlapping extract -> classify -> store stages
+from driver_pool import DriverPool, browser_is_alive # Warm, authenticated browser sessions
+from mongodb_handler import get_scrape_cursor, advance_scrape_cursor  # Per-keyword high-water marks
 
-def scrape_tweets(keyword, cookie_path="twitter_cookies.json", headless=True, max_tweets=20):
+# Site to scrape; point it at a local fixture (benchmarks/mock_twitter_server.py) for testing
+TWITTER_BASE_URL = os.getenv("TWITTER_BASE_URL", "https://x.com").rstrip("/")
+
+# Cookie that marks a logged-in x.com session
+AUTH_COOKIE_NAME = "auth_token"
+
+# Waits, in seconds; they end as soon as the page is ready, these are only upper bounds
+PAGE_LOAD_TIMEOUT = float(os.getenv("SCRAPER_PAGE_TIMEOUT", "15"))      # Home page / first search results
+SCROLL_TIMEOUT = float(os.getenv("SCRAPER_SCROLL_TIMEOUT", "5"))        # New tweets after one scroll
+
+# Adaptive scrolling: stop after this many scrolls in a row bring no new tweets,
+# and never scroll more than MAX_SCROLLS times for one search
+IDLE_SCROLLS = int(os.getenv("SCRAPER_IDLE_SCROLLS", "2"))
+MAX_SCROLLS = int(os.getenv("SCRAPER_MAX_SCROLLS", "50"))
+
+# Tweet elements on the search page
+TWEET_SELECTOR = 'article[data-testid="tweet"]'
+
+# How tweets are read from the page: "script" (one execute_script call per
+# pass, see EXTRACT_TWEETS_SCRIPT) or "elements" (WebElement lookups per tweet)
+EXTRACTION_MODE = os.getenv("SCRAPER_EXTRACTION", "script")
+
+# Reads every tweet not read before in one round trip and returns plain data
+# (no element references, so nothing can go stale). Articles are marked once
+# read; tweets whose text has not rendered yet are left for the next pass.
+EXTRACT_TWEETS_SCRIPT = """
+const selector = arguments[0];
+function label(node) {
+  return node ? (node.getAttribute('aria-label') || node.innerText) : null;
+}
+function metric(article, testIds) {
+  for (const testId of testIds) {
+    const node = article.querySelector('[data-testid="' + testId + '"]');
+    if (node) return label(node);
+  }
+  return null;
+}
+const results = [];
+for (const article of document.querySelectorAll(selector)) {
+  if (article.dataset.scraped) continue;
+  const textNode = article.querySelector('div[lang]');
+  if (!textNode) continue;
+  article.dataset.scraped = '1';
+  const userNode = article.querySelector('div[data-testid="User-Name"]');
+  const timeNode = article.querySelector('a time');
+  const link = timeNode ? timeNode.closest('a') : null;
+  results.push({
+    text: textNode.innerText,
+    user: userNode ? userNode.innerText : null,
+    href: link ? link.getAttribute('href') : null,
+    time: timeNode ? timeNode.getAttribute('datetime') : null,
+    replies: metric(article, ['reply']),
+    retweets: metric(article, ['retweet', 'unretweet']),
+    likes: metric(article, ['like', 'unlike']),
+    views: label(article.querySelector('a[href$="/analytics"]'))
+  });
+}
+return results;
+"""
+
+# Engagement counts read from each tweet
+METRICS = ("replies", "retweets", "likes", "views")
+
+# First number in a label such as "1,234 Likes. Like" or "1.2K"; the K/M suffix
+# must follow the digits directly and end the word, so "10 Mentions" stays 10
+COUNT_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)([KkMm])?\b")
+
+# Scrolls to the bottom, then reports (through the async callback) whether new
+# tweet elements were added to the page within the timeout. A MutationObserver
+# fires as soon as the first one is inserted, so there is no polling delay.
+SCROLL_AND_WAIT_SCRIPT = """
+const selector = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+let finished = false;
+const observer = new MutationObserver(function (mutations) {
+  for (const mutation of mutations) {
+    for (const node of mutation.addedNodes) {
+      if (node.nodeType === 1 && (node.matches(selector) || node.querySelector(selector))) {
+        finish(true);
+        return;
+      }
+    }
+  }
+});
+const timer = setTimeout(function () { finish(false); }, timeoutMs);
+function finish(result) {
+  if (finished) return;
+  finished = true;
+  observer.disconnect();
+  clearTimeout(timer);
+  done(result);
+}
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+"""
+
+def create_driver(headless=True):
     """
-    Main function to scrape tweets from Twitter/X based on keyword search.
+    Start a Chrome WebDriver configured for scraping.
     
     Args:
-        keyword (str): Search term to find tweets about (e.g., "climate change", "iPhone")
-        cookie_path (str): Path to saved Twitter cookies file for authentication
         headless (bool): Whether to run Chrome in headless mode (invisible browser)
-        max_tweets (int): Maximum number of tweets to scrape per session
         
     Returns:
-        list: List of dictionaries containing tweet data with sentiment analysis
+        webdriver.Chrome: The running browser session
     """
-    
     # Configure Chrome browser options for web scraping
     options = Options()
     
@@ -46,17 +154,70 @@ def scrape_tweets(keyword, cookie_path="twitter_cookies.json", headless=True, ma
     try:
         # Try to use local chromedriver.exe first
         service = Service(executable_path="./chromedriver.exe")
-        driver = webdriver.Chrome(service=service, options=options)
+        return webdriver.Chrome(service=service, options=options)
     except Exception as e:
         # If local driver fails, use system-installed driver
         print(f"Error with specified chromedriver path: {e}")
         print("Falling back to automatic webdriver detection...")
-        driver = webdriver.Chrome(options=options)
+        return webdriver.Chrome(options=options)
+
+def wait_for_page_load(driver, timeout=PAGE_LOAD_TIMEOUT):
+    """
+    Wait until the current document has finished loading.
     
+    Returns:
+        bool: False if it was still loading after `timeout` seconds
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def wait_for_tweets(driver, timeout=PAGE_LOAD_TIMEOUT):
+    """
+    Wait until at least one tweet is rendered on the page.
+    
+    Returns:
+        bool: False if none appeared within `timeout` seconds (e.g. no results)
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.find_elements(By.CSS_SELECTOR, TWEET_SELECTOR)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def scroll_for_more(driver, timeout=SCROLL_TIMEOUT):
+    """
+    Scroll to the bottom and wait for new tweets to be added to the page.
+    
+    Returns:
+        bool: True as soon as a new tweet element appears, False if none did within `timeout`
+    """
+    # The async script must be allowed to run a little longer than its own timer
+    driver.set_script_timeout(timeout + 5)
+    try:
+        return bool(driver.execute_async_script(SCROLL_AND_WAIT_SCRIPT, TWEET_SELECTOR, int(timeout * 1000)))
+    except TimeoutException:
+        return False
+
+def load_cookies(driver, cookie_path="twitter_cookies.json"):
+    """
+    Open x.com and apply the saved session cookies for authentication.
+    
+    Args:
+        driver (webdriver.Chrome): Browser session to authenticate
+        cookie_path (str): Path to saved Twitter cookies file
+    """
     # Navigate to Twitter/X homepage first
     print("Loading Twitter/X homepage...")
-    driver.get("https://x.com")
-    time.sleep(6)  # Wait for page to fully load
+    driver.get(TWITTER_BASE_URL)
+    if not wait_for_page_load(driver):  # Cookies need the domain loaded, nothing more
+        print(f"Homepage still loading after {PAGE_LOAD_TIMEOUT:.0f}s, applying cookies anyway...")
     
     # Load and apply saved cookies for authentication
     try:
@@ -79,91 +240,381 @@ def scrape_tweets(keyword, cookie_path="twitter_cookies.json", headless=True, ma
     except Exception as cookie_file_error:
         print(f"Error loading cookies from {cookie_path}: {cookie_file_error}")
         print("Continuing without cookies (may have limited access)...")
+
+def start_session(cookie_path="twitter_cookies.json", headless=True):
+    """
+    Start a browser and log it in with the saved cookies.
+    
+    Args:
+        cookie_path (str): Path to saved Twitter cookies file
+        headless (bool): Whether to run Chrome in headless mode
+        
+    Returns:
+        webdriver.Chrome: Authenticated browser session
+    """
+    driver = create_driver(headless)
+    try:
+        load_cookies(driver, cookie_path)
+    except BaseException:
+        driver.quit()
+        raise
+    return driver
+
+def session_health_check(cookie_path="twitter_cookies.json"):
+    """
+    Build the check a pooled session must pass before it is reused.
+    
+    The browser must still respond, and if the cookie file holds a login
+    cookie, the session must still have it (i.e. it was not logged out).
+    
+    Args:
+        cookie_path (str): Cookie file the sessions were started with
+        
+    Returns:
+        callable: driver -> bool
+    """
+    try:
+        with open(cookie_path, "r", encoding="utf-8") as f:
+            expects_auth = any(cookie.get("name") == AUTH_COOKIE_NAME for cookie in json.load(f))
+    except Exception:
+        expects_auth = False  # No usable cookie file: sessions were never logged in
+    
+    def check(driver):
+        if not browser_is_alive(driver):
+            return False
+        if not expects_auth:
+            return True
+        try:
+            return driver.get_cookie(AUTH_COOKIE_NAME) is not None
+        except Exception:
+            return False
+    return check
+
+# Shared pools, one per (cookie file, headless) combination, created on first use
+_driver_pools = {}
+_driver_pools_lock = threading.Lock()
+
+def get_driver_pool(cookie_path="twitter_cookies.json", headless=True):
+    """
+    Return the process-wide browser pool for these settings, creating it on first call.
+    
+    Args:
+        cookie_path (str): Path to saved Twitter cookies file
+        headless (bool): Whether to run Chrome in headless mode
+        
+    Returns:
+        DriverPool: The shared pool (size from DRIVER_POOL_SIZE)
+    """
+    key = (cookie_path, headless)
+    with _driver_pools_lock:
+        if key not in _driver_pools:
+            _driver_pools[key] = DriverPool(lambda: start_session(cookie_path, headless),
+                                            health_check=session_health_check(cookie_path))
+        return _driver_pools[key]
+
+@atexit.register
+def close_driver_pools():
+    """Quit every pooled browser (also runs automatically at interpreter exit)."""
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+        _driver_pools.clear()
+    for pool in pools:
+        pool.close()
+
+def parse_count(value):
+    """
+    Parse an engagement count label.
+    
+    Example:
+        parse_count("1,234 Likes. Like")  # 1234
+        parse_count("1.2K")               # 1200
+        parse_count("10 Mentions")        # 10 (the M starts a word, it is no multiplier)
+        parse_count("")                   # 0 (no count is shown for zero)
+    
+    Returns:
+        int or None: The count, or None if the tweet had no such control
+    """
+    if value is None:
+        return None
+    match = COUNT_PATTERN.search(value)
+    if not match:
+        return 0
+    number = float(match.group(1).replace(",", ""))
+    multiplier = {"k": 1000, "m": 1000000}.get((match.group(2) or "").lower(), 1)
+    return int(round(number * multiplier))
+
+def build_tweet(raw, keyword):
+    """
+    Build a tweet document from the raw values read off the page.
+    
+    Args:
+        raw (dict): "text", "user" (User-Name block text), "href" (permalink),
+            "time" (ISO datetime) and the METRICS labels; missing keys are allowed
+        keyword (str): Search keyword used
+        
+    Returns:
+        dict or None: Tweet data (sentiment still unset), or None if the
+        tweet has no text left after cleaning
+    """
+    text = raw.get("text") or ""
+    # The first line of the User-Name block is the display name
+    username = (raw.get("user") or "").split('\n')[0] or "Unknown"
+    
+    # The tweet's status ID from its permalink (the link wrapping the <time> element)
+    match = re.search(r"/status/(\d+)", raw.get("href") or "")
+    tweet_id = match.group(1) if match else None  # Without an ID, identified by content hash instead
     
+    # "2024-05-01T14:03:12.000Z" -> "2024-05-01 14:03:12" (UTC)
+    posted_at = raw["time"][:19].replace("T", " ") if raw.get("time") else None
+    
+    # Extract hashtags, mentions, URLs, emojis and language, and clean the text
+    fields = preprocess_tweet(text)
+    
+    # Skip tweets with empty text after cleaning
+    if not fields["clean_text"]:
+        return None
+    
+    # Create structured data dictionary for the tweet (sentiment is filled in by the pipeline)
+    return {
+        "tweet_id": tweet_id,                                    # Twitter status ID (None if not found)
+        "username": username,                                    # Twitter username
+        "text": text,                                           # Original tweet text
+        "hashtags": fields["hashtags"],                         # List of hashtags found
+        "mentions": fields["mentions"],                         # List of @mentions found
+        "urls": fields["urls"],                                 # List of links found
+        "emojis": fields["emojis"],                             # List of emojis found
+        "language": fields["language"],                         # Detected language code
+        "clean_text": fields["clean_text"],                    # Cleaned text for analysis
+        "dedup_key": fields["dedup_key"],                      # Hash of normalized text, for deduplication
+        "tokens": fields["tokens"],                             # Lowercased words without stopwords, for word counts
+        "sentiment": None,                                      # Sentiment classification (positive/negative/neutral)
+        "posted_at": posted_at,                                 # When the tweet was posted (UTC, None if unknown)
+        "metrics": {name: parse_count(raw.get(name)) for name in METRICS},  # Engagement counts (None if unknown)
+        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),       # Current timestamp
+        "keyword": keyword                                      # Search keyword used
+    }
+
+def extract_tweet(tweet, keyword):
+    """
+    Build a tweet document from one tweet element on the page.
+    
+    Takes several WebDriver round trips per tweet and does not read
+    engagement metrics; extract_page_tweets() is the faster path.
+    
+    Args:
+        tweet (WebElement): An article[data-testid="tweet"] element
+        keyword (str): Search keyword used
+        
+    Returns:
+        dict or None: Tweet data (sentiment still unset), or None if the
+        tweet has no text left after cleaning
+    """
+    # Extract the main text content of the tweet
+    text_elem = tweet.find_element(By.XPATH, './/div[@lang]')  # Find div with language attribute
+    raw = {"text": text_elem.text}
+    
+    # Extract username with error handling
+    try:
+        raw["user"] = tweet.find_element(By.XPATH, './/div[@data-testid="User-Name"]').text
+    except:
+        pass  # build_tweet falls back to "Unknown"
+    
+    # Extract the permalink (the link wrapping the <time> element) and the posting time
+    try:
+        time_elem = tweet.find_element(By.XPATH, './/a//time')
+        raw["time"] = time_elem.get_attribute("datetime")
+        raw["href"] = tweet.find_element(By.XPATH, './/a[.//time]').get_attribute("href")
+    except:
+        pass  # Stored without an ID; identified by content hash instead
+    
+    return build_tweet(raw, keyword)
+
+def extract_page_tweets(driver, keyword):
+    """
+    Read every tweet not read before from the page in one execute_script call.
+    
+    Args:
+        driver (webdriver.Chrome): Browser on a search page
+        keyword (str): Search keyword used
+        
+    Returns:
+        list: Tweet documents (sentiment still unset); tweets with no text left
+        after cleaning are dropped
+    """
+    raws = driver.execute_script(EXTRACT_TWEETS_SCRIPT, TWEET_SELECTOR) or []
+    tweets = (build_tweet(raw, keyword) for raw in raws)
+    return [tweet for tweet in tweets if tweet is not None]
+
+def _extract_elements(driver, keyword):
+    # Element-by-element extraction; a tweet that fails (e.g. went stale while scrolling) is skipped
+    for element in driver.find_elements(By.CSS_SELECTOR, TWEET_SELECTOR):
+        try:
+            yield extract_tweet(element, keyword)
+        except Exception as processing_error:
+            print(f"[!] Error processing tweet: {processing_error}")
+
+def is_known(tweet, since):
+    """
+    Whether a tweet is at or below a scrape cursor's high-water marks.
+    
+    Compares status IDs when both sides have one, else posting times (a tweet
+    posted in the same second as the newest known one counts as new; the
+    database upsert deduplicates it if it is not).
+    
+    Args:
+        tweet (dict): Tweet document from build_tweet()
+        since (dict): Cursor from mongodb_handler.get_scrape_cursor(), or None
+    """
+    if not since:
+        return False
+    if tweet.get("tweet_id") and since.get("last_tweet_id") is not None:
+        return int(tweet["tweet_id"]) <= since["last_tweet_id"]
+    if tweet.get("posted_at") and since.get("last_posted_at"):
+        return tweet["posted_at"] < since["last_posted_at"]
+    return False
+
+def iter_tweets(driver, keyword, max_tweets=20, scrolls=MAX_SCROLLS, extraction=EXTRACTION_MODE, since=None):
+    """
+    Yield extracted tweets from the live search page as they appear.
+    
+    Tweets visible once the first results render are yielded first; each
+    scroll then yields only tweets not seen before. Because this is a
+    generator, the pipeline can classify and store early tweets while we keep
+    scrolling.
+    
+    Nothing waits a fixed time: the first results are awaited with an explicit
+    wait, and each scroll returns as soon as new tweets are inserted. Scrolling
+    stops once max_tweets unique tweets were yielded or IDLE_SCROLLS scrolls in
+    a row brought nothing new.
+    
+    With a cursor (`since`), scraping is incremental: results are newest first,
+    so the first already-known tweet means everything below it is known too,
+    and scrolling stops there.
+    
+    Args:
+        driver (webdriver.Chrome): Authenticated browser session
+        keyword (str): Search term
+        max_tweets (int): Stop after this many tweets
+        scrolls (int): Upper bound on the number of scrolls
+        extraction (str): "script" to read each pass with one execute_script call
+            (falls back to "elements" if the script fails), or "elements"
+        since (dict): High-water marks from get_scrape_cursor(); only newer tweets are yielded
+        
+    Yields:
+        dict: Tweet data with sentiment still unset
+    """
     # Navigate to search results page with the specified keyword
-    search_url = f"https://x.com/search?q={keyword}&src=typed_query&f=live"
+    search_url = f"{TWITTER_BASE_URL}/search?q={keyword}&src=typed_query&f=live"
     print(f"Navigating to search results: {search_url}")
     driver.get(search_url)
-    time.sleep(5)  # Wait for search results to load
-    
-    # Scroll down multiple times to load more tweets (Twitter uses infinite scroll)
-    print("Scrolling to load more tweets...")
-    for scroll_count in range(5):  # Scroll 5 times
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")  # Scroll to bottom
-        time.sleep(3)  # Wait for new content to load
-        print(f"Scroll {scroll_count + 1}/5 completed")
-    
-    # Find all tweet elements on the page using XPath selector
-    tweets = driver.find_elements(By.XPATH, '//article[@data-testid="tweet"]')
-    print(f"Found {len(tweets)} tweet elements on page")
-    
-    # Initialize data collection variables
-    scraped_data = []  # List to store all processed tweet data
-    counter = 0        # Counter to track processed tweets
-    
-    # Process each tweet element found on the page
-    print("Starting tweet processing...")
-    for tweet in tweets:
-        # Stop if we've reached the maximum tweet limit
-        if counter >= max_tweets:
-            print(f"Reached maximum limit of {max_tweets} tweets")
-            break
-        
-        try:
-            # Extract the main text content of the tweet
-            text_elem = tweet.find_element(By.XPATH, './/div[@lang]')  # Find div with language attribute
-            text = text_elem.text  # Get the tweet text
-            
-            # Extract username with error handling
+    if not wait_for_tweets(driver):
+        print(f"No tweets appeared within {PAGE_LOAD_TIMEOUT:.0f}s")
+        return
+    
+    seen = set()  # IDs (or username, text) of tweets already yielded; the page re-renders elements
+    count = 0
+    idle_scrolls = 0
+    reached_known = False
+    
+    for scroll_count in range(scrolls + 1):
+        count_before = count
+        tweets = None
+        if extraction == "script":
             try:
-                username_elem = tweet.find_element(By.XPATH, './/div[@data-testid="User-Name"]')
-                username = username_elem.text.split('\n')[0]  # Get first line (actual username)
-            except:
-                username = "Unknown"  # Default if username extraction fails
-            
-            # Extract hashtags from tweet text using regular expressions
-            hashtags = re.findall(r"#\w+", text)  # Find all words starting with #
-            
-            # Clean the text by removing URLs, mentions (@), and hashtags (#)
-            clean_text = re.sub(r"http\S+|@\w+|#\w+", "", text).strip()
-            
-            # Skip tweets with empty text after cleaning
-            if not clean_text:
-                print("Skipping tweet with empty content after cleaning")
+                tweets = extract_page_tweets(driver, keyword)
+            except Exception as script_error:
+                print(f"[!] Script extraction failed, reading tweet elements instead: {script_error}")
+                extraction = "elements"
+        if tweets is None:
+            tweets = _extract_elements(driver, keyword)
+        
+        for tweet_data in tweets:
+            if tweet_data is None:
+                continue
+            identity = tweet_data["tweet_id"] or (tweet_data["username"], tweet_data["text"])
+            if identity in seen:
+                continue
+            seen.add(identity)
+            if is_known(tweet_data, since):
+                reached_known = True  # Older tweets follow; finish this pass without yielding them
                 continue
             
-            # Analyze sentiment using Groq API (Llama model)
-            print(f"Analyzing sentiment for: {clean_text[:30]}...")
-            sentiment = classify_sentiment(clean_text)  # Call custom sentiment analysis function
-            
-            # Create structured data dictionary for the tweet
-            tweet_data = {
-                "username": username,                                    # Twitter username
-                "text": text,                                           # Original tweet text
-                "hashtags": hashtags,                                   # List of hashtags found
-                "clean_text": clean_text,                              # Cleaned text for analysis
-                "sentiment": sentiment,                                 # Sentiment classification (positive/negative/neutral)
-                "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),       # Current timestamp
-                "keyword": keyword                                      # Search keyword used
-            }
-            
-            # Save tweet data to MongoDB database
-            inserted_id = insert_or_update_tweet(tweet_data)
-            print(f"[✓] Tweet {counter + 1}: {clean_text[:50]}... | Sentiment: {sentiment}")
-            
-            # Add processed tweet to results list
-            scraped_data.append(tweet_data)
-            counter += 1  # Increment processed tweet counter
-            
-        except Exception as processing_error:
-            # Log errors but continue processing other tweets
-            print(f"[!] Error processing tweet {counter + 1}: {processing_error}")
-            continue
+            yield tweet_data
+            count += 1
+            if count >= max_tweets:
+                print(f"Reached maximum limit of {max_tweets} tweets")
+                return
+        
+        if reached_known:
+            print(f"Reached tweets already scraped after {count} new ones, stopping")
+            break
+        
+        # Judge a scroll by the tweets it yielded: new elements can be re-renders of seen tweets
+        if scroll_count > 0:
+            idle_scrolls = idle_scrolls + 1 if count == count_before else 0
+            if idle_scrolls >= IDLE_SCROLLS:
+                print(f"No new tweets after {idle_scrolls} scrolls, stopping")
+                break
+        if scroll_count == scrolls:
+            break
+        
+        # Scroll down to load more tweets (Twitter uses infinite scroll); returns as soon as they arrive
+        scroll_for_more(driver)
+        print(f"Scroll {scroll_count + 1} completed ({count} tweets so far)")
+
+def scrape_tweets(keyword, cookie_path="twitter_cookies.json", headless=True, max_tweets=20,
+                  classifier_workers=2, on_tweet=None, pool=None, incremental=False):
+    """
+    Main function to scrape tweets from Twitter/X based on keyword search.
+    
+    Args:
+        keyword (str): Search term to find tweets about (e.g., "climate change", "iPhone")
+        cookie_path (str): Path to saved Twitter cookies file for authentication
+        headless (bool): Whether to run Chrome in headless mode (invisible browser)
+        max_tweets (int): Maximum number of tweets to scrape per session
+        classifier_workers (int): Number of threads classifying tweets in parallel
+        on_tweet (callable): Called with each newly stored tweet dict as soon as it is written
+            (tweets that were already in the database are left out, so counting them is safe)
+        pool (DriverPool): Where to get the browser from (default: the shared pool for
+            cookie_path and headless)
+        incremental (bool): Only scrape tweets newer than the keyword's stored
+            high-water marks, stopping at the first known one. The marks are
+            advanced after every scrape either way. If max_tweets cuts an
+            incremental scrape short, the older part of the new tweets is
+            not picked up later.
+        
+    Returns:
+        list: List of dictionaries containing tweet data with sentiment analysis
+    """
+    # A warm, logged-in browser; it goes back to the pool afterwards instead of quitting
+    pool = pool or get_driver_pool(cookie_path, headless)
+    since = get_scrape_cursor(keyword) if incremental else None
+    if since:
+        print(f"Incremental scrape: only tweets newer than {since}")
+    with pool.session() as driver:
+        # Extract, classify and store as overlapping stages; known tweets never enter the pipeline
+        print("Starting tweet processing...")
+        pipeline = TweetPipeline(classifier_workers=classifier_workers, on_tweet=on_tweet, notify_updates=False)
+        scraped_data = pipeline.run(iter_tweets(driver, keyword, max_tweets, since=since))
+    
+    # Only stored tweets move the marks, and never past a failed one, so it is scraped again next time
+    try:
+        advance_scrape_cursor(keyword, scraped_data, failed=pipeline.failed)
+    except Exception as e:
+        print(f"[!] Could not save the scrape cursor for '{keyword}': {e}")
+    
+    for counter, tweet_data in enumerate(scraped_data):
+        print(f"[✓] Tweet {counter + 1}: {tweet_data['clean_text'][:50]}... | Sentiment: {tweet_data['sentiment']}")
+    print(f"Pipeline stats: {pipeline.stats()}")
+    print(f"Browser pool stats: {pool.stats()}")
+    
+    # Tiered backends report how much work reached the LLM
+    backend = get_backend()
+    if hasattr(backend, "stats"):
+        print(f"Sentiment backend stats: {backend.stats()}")
     
-    # Clean up: close the browser
-    driver.quit()
     print(f"[✅] Scraping session complete!")
     print(f"Successfully processed {len(scraped_data)} tweets for keyword: '{keyword}'")
     
     # Return the collected and processed tweet data
-    return scraped_data
\ No newline at end of file
+    return scraped_data
@@ -0,0 +1,164 @@
+# Background task execution for the Tk app
+# Tk widgets may only be touched from the main thread, and anything slow
+# (database queries, scraping, analytics) must not run there or the window
+# freezes. TaskExecutor splits the two:
+#
+#   - submit() runs a function on a small worker pool
+#   - its result (or exception) is handed back through a queue that the main
+#     thread drains every few milliseconds with root.after()
+#   - call_soon() lets any thread schedule a UI update the same way
+#
+# Submitting a task under a key that is already running cancels the older
+# one: it is dropped from the pool if it has not started yet, and its result
+# is discarded if it has, so a slow stale query never overwrites fresh data.
+
+# Import required libraries
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# How often the main thread checks for finished work (milliseconds)
+DEFAULT_POLL_INTERVAL_MS = 50
+
+# Callbacks run per poll, so a burst of results cannot stall the event loop
+MAX_CALLBACKS_PER_POLL = 200
+
+
+class TaskHandle:
+    """A submitted task; lets the caller (or the task itself) check for cancellation."""
+
+    def __init__(self, key=None):
+        self.key = key
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Drop the task if it has not started; otherwise ignore its result."""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class TaskExecutor:
+    """
+    Worker pool plus main-thread dispatch queue for a Tk root window.
+
+    Example:
+        tasks = TaskExecutor(root)
+        tasks.submit(load_rows, on_done=render_rows, key="results")
+        tasks.call_soon(status_var.set, "Done")   # From any thread
+    """
+
+    def __init__(self, root, max_workers=2, poll_interval_ms=DEFAULT_POLL_INTERVAL_MS):
+        """
+        Args:
+            root (tk.Tk): Root window whose event loop runs the callbacks
+            max_workers (int): Worker threads for submitted tasks
+            poll_interval_ms (int): How often the dispatch queue is drained
+        """
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._dispatch = queue.SimpleQueue()
+        self._running = {}  # key -> TaskHandle of the newest task submitted under that key
+        self._lock = threading.Lock()
+        self._closed = False
+        self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def call_soon(self, callback, *args):
+        """Run callback(*args) on the Tk main thread. Safe to call from any thread."""
+        self._dispatch.put((callback, args))
+
+    def submit(self, func, *args, on_done=None, on_error=None, key=None):
+        """
+        Run func(*args) on the worker pool.
+
+        Args:
+            func (callable): The slow work; must not touch Tk widgets
+            on_done (callable): Called on the main thread with func's return value
+            on_error (callable): Called on the main thread with the exception
+                (default: print it)
+            key (str): Tasks sharing a key supersede each other; the older one is cancelled
+
+        Returns:
+            TaskHandle: Handle for cancelling the task
+        """
+        handle = TaskHandle(key)
+        if key is not None:
+            with self._lock:
+                previous = self._running.get(key)
+                self._running[key] = handle
+            if previous is not None:
+                previous.cancel()
+
+        def run():
+            if handle.cancelled:
+                return
+            try:
+                result = func(*args)
+            except Exception as e:
+                if not handle.cancelled:
+                    self.call_soon(self._finish, handle, on_error or self._report_error, e)
+                return
+            if not handle.cancelled:
+                self.call_soon(self._finish, handle, on_done, result)
+
+        handle.future = self._pool.submit(run)
+        return handle
+
+    def cancel(self, key):
+        """Cancel the task currently registered under key, if any."""
+        with self._lock:
+            handle = self._running.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _finish(self, handle, callback, value):
+        # Runs on the main thread; the task may have been superseded since it was queued
+        if handle.cancelled:
+            return
+        if handle.key is not None:
+            with self._lock:
+                if self._running.get(handle.key) is handle:
+                    del self._running[handle.key]
+        if callback is not None:
+            callback(value)
+
+    def _report_error(self, error):
+        print(f"[!] Background task failed: {error}")
+
+    def _poll(self):
+        for _ in range(MAX_CALLBACKS_PER_POLL):
+            try:
+                callback, args = self._dispatch.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                # A failing UI callback must not stop the dispatch loop
+                print(f"[!] UI callback failed: {e}")
+        if not self._closed:
+            self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def shutdown(self):
+        """Stop polling and cancel queued tasks (running ones finish in the background)."""
+        self._closed = True
+        try:
+            self.root.after_cancel(self._poll_id)
+        except Exception:
+            pass
+        with self._lock:
+            handles = list(self._running.values())
+            self._running.clear()
+        for handle in handles:
+            handle.cancel()
+        try:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        except TypeError:
+            # cancel_futures needs Python 3.9+
+            self._pool.shutdown(wait=False)